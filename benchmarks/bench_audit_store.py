@@ -0,0 +1,73 @@
+"""감사 로그 저장소 조회 벤치마크
+
+기록 수십만~수백만 건을 저장한 뒤, 기간/작업/사용자 조건 조회와 페이지 조회,
+최근 기록 조회에 걸리는 시간을 측정합니다.
+
+    python -m benchmarks.bench_audit_store [기록 수]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from src.core.audit_store import AuditStore
+
+ACTIONS = ['block_vba', 'restore_vba', 'check_process', 'check_registry', 'policy_reload']
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main(count: int = 500000):
+    directory = tempfile.mkdtemp()
+    base_time = datetime(2024, 1, 1)
+    try:
+        store = AuditStore(directory)
+
+        def fill():
+            batch = []
+            for i in range(count):
+                # 드문 작업(policy_reload)은 1000건에 한 번
+                action = ACTIONS[4] if i % 1000 == 0 else ACTIONS[i % 4]
+                batch.append({
+                    'timestamp': (base_time + timedelta(seconds=i)).isoformat(),
+                    'action': action,
+                    'details': {'index': i},
+                    'user': f'user{i % 50}',
+                    'session_id': i % 8
+                })
+                if len(batch) == 1000:
+                    store.append_many(batch, durability='none')
+                    batch = []
+            store.append_many(batch)
+
+        timed(f'append {count} entries', fill)
+        middle = base_time + timedelta(seconds=count // 2)
+        timed('time range (10 min)', lambda: store.query(middle, middle + timedelta(minutes=10), limit=1000))
+        timed('rare action (all pages)', lambda: store.query(action='policy_reload', limit=count))
+        timed('action + user, first page', lambda: store.query(action='block_vba', user='user8', limit=100))
+
+        def paginate():
+            cursor, pages = None, 0
+            while pages < 100:
+                _, cursor = store.query(action='check_process', limit=100, cursor=cursor)
+                pages += 1
+                if cursor is None:
+                    break
+            return pages
+
+        timed('action, 100 pages of 100', paginate)
+        timed('tail 100', lambda: store.tail(100))
+        store.close()
+        timed('reopen (saved indexes)', lambda: AuditStore(directory).close())
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
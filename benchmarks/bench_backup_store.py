@@ -0,0 +1,52 @@
+"""레지스트리 백업 조회 벤치마크
+
+백업 N개가 쌓인 상태에서 최근 백업과 특정 시각 기준 백업을 찾는 시간을, 이전 방식
+(os.listdir 후 이름 정렬)과 BackupStore의 매니페스트 색인으로 비교합니다.
+
+    python -m benchmarks.bench_backup_store [백업 수]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from src.core.backup_store import BackupStore
+
+KEY = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security'
+
+
+def timed(name: str, func, repeat: int = 100):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<34} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def main(count: int = 5000):
+    directory = tempfile.mkdtemp()
+    try:
+        legacy = os.path.join(directory, 'legacy')
+        os.makedirs(legacy)
+        for i in range(count):
+            open(os.path.join(legacy, f'vba_settings_{20240101 + i:08d}_120000.reg'), 'w').close()
+        timed('listdir + sort (latest)', lambda: sorted(
+            name for name in os.listdir(legacy) if name.startswith('vba_settings_'))[-1])
+
+        store = BackupStore(os.path.join(directory, 'store'))
+        start = time.perf_counter()
+        for i in range(count):
+            # 두 가지 사전 이미지가 번갈아 나타나는 경우
+            store.put(f'[{KEY}]\n"VBAWarnings"=dword:0000000{i % 2 + 1}\n', [KEY], timestamp=i)
+        print(f"{f'put {count} backups':<34} {(time.perf_counter() - start) * 1000:10.1f} ms"
+              f"  ({len(os.listdir(store.objects_path))} objects)")
+        timed('load manifest', lambda: BackupStore(store.directory), repeat=5)
+        timed('latest', store.latest)
+        timed('as_of', lambda: store.as_of(count / 2))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
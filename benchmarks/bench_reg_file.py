@@ -0,0 +1,74 @@
+"""대용량 .reg 파일 읽기/쓰기 벤치마크
+
+Office 하위 트리와 비슷한 키 N개(키마다 여러 형식의 값 8개)를 .reg 파일로 쓰고, 키
+단위 스트리밍으로 다시 읽는 시간과 최대 메모리 사용량을 측정합니다. 메모리 레지스트리에서
+RegistryManager.export_registry/import_registry로 하위 트리 전체를 내보내고 가져오는
+시간도 함께 측정합니다.
+
+    python -m benchmarks.bench_reg_file [키 수]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from src.core.reg_file import RegSection, iter_reg_file, write_reg_file
+from src.core.registry import RegistryManager
+from src.core.registry_backend import (REG_BINARY, REG_DWORD, REG_EXPAND_SZ, REG_MULTI_SZ, REG_QWORD, REG_SZ,
+                                       MemoryRegistryBackend)
+
+OFFICE = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0'
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def sections(count: int):
+    for i in range(count):
+        yield RegSection(f'{OFFICE}\\Excel\\Addins\\Addin{i}', values={
+            '': (f'Addin {i}', REG_SZ),
+            'Path': (f'C:\\Program Files\\"Vendor"\\addin{i}.xlam', REG_SZ),
+            'Expand': (f'%APPDATA%\\Microsoft\\AddIns\\{i}', REG_EXPAND_SZ),
+            'LoadBehavior': (3, REG_DWORD),
+            'Stamp': (i << 32, REG_QWORD),
+            'Trusted': ([f'site{i}', 'intranet'], REG_MULTI_SZ),
+            'Blob': (bytes(range(64)), REG_BINARY),
+            'Comment': ('line1\r\nline2', REG_SZ)
+        })
+
+
+def main(count: int = 20000):
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'office.reg')
+        timed(f'write {count} keys', lambda: write_reg_file(path, sections(count)))
+        size = os.path.getsize(path)
+        print(f"{'file size':<34} {size / 1024 / 1024:10.1f} MB")
+
+        values = timed('stream parse', lambda: sum(len(section.values) for section in iter_reg_file(path)))
+        tracemalloc.start()
+        for _ in iter_reg_file(path):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{'values parsed':<34} {values:10d}")
+        print(f"{'peak memory while parsing':<34} {peak / 1024:10.1f} KB")
+
+        source = MemoryRegistryBackend()
+        manager = RegistryManager(source, backup_path=directory)
+        timed('import into memory registry', lambda: manager.import_registry(path))
+        export_path = os.path.join(directory, 'export.reg')
+        keys = timed('export Office subtree', lambda: manager.export_registry(OFFICE, export_path))
+        print(f"{'exported keys':<34} {keys:10d}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
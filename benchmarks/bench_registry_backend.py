@@ -0,0 +1,47 @@
+"""레지스트리 일괄 작업 벤치마크 (메모리 레지스트리)
+
+Office 보안 키 수천 개를 메모리 레지스트리에 만든 뒤, RegistryManager의 백업, 수정,
+상태 확인, 복원에 걸리는 시간을 측정합니다. Windows가 아닌 환경에서도 실행됩니다.
+
+    python -m benchmarks.bench_registry_backend [키 수]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from src.core.registry import RegistryManager
+from src.core.registry_backend import MemoryRegistryBackend
+
+APPS = ['Excel', 'Word', 'PowerPoint', 'Access', 'Outlook']
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main(count: int = 5000):
+    directory = tempfile.mkdtemp()
+    try:
+        key_paths = [f'HKEY_USERS\\S-1-5-21-{i // len(APPS)}\\Software\\Microsoft\\Office\\16.0\\'
+                     f'{APPS[i % len(APPS)]}\\Security' for i in range(count)]
+        backend = timed(f'populate {count} keys', lambda: MemoryRegistryBackend(
+            {key_path: {'VBAWarnings': 1, 'AccessVBOM': 1} for key_path in key_paths}))
+
+        manager = RegistryManager(backend, backup_path=directory)
+        manager.vba_keys = {key_path: {'VBAWarnings': 2, 'AccessVBOM': 0} for key_path in key_paths}
+
+        timed('check (not blocked)', manager.check_registry_status)
+        timed('backup', manager.backup_registry)
+        timed('modify', manager.modify_registry)
+        timed('check (blocked)', manager.check_registry_status)
+        timed('restore', manager.restore_registry)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
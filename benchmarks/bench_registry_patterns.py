@@ -0,0 +1,82 @@
+"""차단 레지스트리 패턴 매칭 벤치마크
+
+패턴 수천 개와 조회 수천 건으로, 호출마다 정규식을 만들던 이전 방식과
+RegistryPatternIndex를 비교합니다.
+
+    python -m benchmarks.bench_registry_patterns
+"""
+import random
+import re
+import time
+from src.core.registry_patterns import RegistryPatternIndex
+
+APPS = ['Excel', 'Word', 'PowerPoint', 'Access', 'Outlook', 'Publisher', 'Visio', 'Project']
+VERSIONS = ['12.0', '14.0', '15.0', '16.0']
+
+
+def legacy_match(key: str, pattern: str) -> bool:
+    """이전 SecurityManager._match_registry_pattern 구현"""
+    pattern = pattern.replace('\\', '\\\\')
+    pattern = pattern.replace('.', '\\.')
+    pattern = pattern.replace('*', '.*')
+    pattern = f'^{pattern}$'
+    return bool(re.match(pattern, key))
+
+
+def make_patterns(count: int, rng: random.Random):
+    patterns = [
+        'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\VBAWarnings',
+        'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\AccessVBOM'
+    ]
+    while len(patterns) < count:
+        vendor = f'Vendor{rng.randrange(count)}'
+        kind = rng.randrange(3)
+        if kind == 0:
+            patterns.append(f'HKEY_LOCAL_MACHINE\\Software\\{vendor}\\Product{rng.randrange(50)}\\Settings')
+        elif kind == 1:
+            patterns.append(f'HKEY_CURRENT_USER\\Software\\{vendor}\\*\\Value{rng.randrange(50)}')
+        else:
+            patterns.append(f'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\{vendor}\\*')
+    return patterns
+
+
+def make_keys(count: int, rng: random.Random):
+    keys = []
+    for _ in range(count):
+        app = rng.choice(APPS)
+        version = rng.choice(VERSIONS)
+        value = rng.choice(['VBAWarnings', 'AccessVBOM', 'BlockContentExecutionFromInternet'])
+        keys.append(f'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\{version}\\{app}\\Security\\{value}')
+    return keys
+
+
+def bench(name: str, func, keys):
+    start = time.perf_counter()
+    blocked = sum(1 for key in keys if func(key))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed * 1000:10.1f} ms  ({len(keys) / elapsed:12.0f} lookups/s, blocked {blocked})")
+    return blocked
+
+
+def main(pattern_count: int = 3000, key_count: int = 3000, legacy_key_count: int = 100):
+    rng = random.Random(0)
+    patterns = make_patterns(pattern_count, rng)
+    keys = make_keys(key_count, rng)
+    print(f"patterns: {len(patterns)}, lookups: {len(keys)} (legacy: {legacy_key_count})")
+
+    legacy = bench('legacy (per-call re)', lambda key: any(legacy_match(key, p) for p in patterns),
+                   keys[:legacy_key_count])
+
+    start = time.perf_counter()
+    index = RegistryPatternIndex(patterns)
+    print(f"{'index build':<28} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    indexed = bench('index (cold)', index.matches, keys[:legacy_key_count])
+    assert indexed == legacy, "결과 불일치"
+
+    index.match.cache_clear()
+    bench('index (cold, all keys)', index.matches, keys)
+    bench('index (cached)', index.matches, keys)
+
+
+if __name__ == '__main__':
+    main()
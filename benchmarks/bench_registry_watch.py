@@ -0,0 +1,54 @@
+"""레지스트리 감시 벤치마크: 폴링과 변경 알림 비교
+
+설치된 Office 보안 키 N개를 감시할 때, 1초 간격 폴링이 점검마다 읽는 키 수와 시간을,
+변경이 없는 동안의 알림 기반 감시(읽기 0회) 및 값 하나가 바뀐 뒤 알림까지 걸린 시간과
+비교합니다.
+
+    python -m benchmarks.bench_registry_watch [키 수]
+"""
+import sys
+import time
+from threading import Event
+from src.core.registry_backend import REG_DWORD, MemoryRegistryBackend
+from src.core.registry_pool import RegistryKeyPool
+from src.core.registry_watch import MemoryRegistryWatcher
+
+OFFICE = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office'
+
+
+def timed(name: str, func, repeat: int = 100):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<34} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def main(count: int = 300):
+    keys = [f'{OFFICE}\\{16 + i // 10}.0\\App{i % 10}\\Security' for i in range(count)]
+    backend = MemoryRegistryBackend({key: {'VBAWarnings': 2} for key in keys})
+    pool = RegistryKeyPool(backend, max_handles=count)
+    names = ['VBAWarnings', 'AccessVBOM']
+
+    timed(f'poll {count} keys (per check)', lambda: [pool.read_values(key, names) for key in keys])
+
+    received = Event()
+    watcher = MemoryRegistryWatcher(pool, names)
+    watcher.start(keys, lambda event: received.set())
+    try:
+        reads = watcher.reads
+        time.sleep(1.0)
+        print(f"{'watcher reads while idle (1 s)':<34} {watcher.reads - reads:10d}")
+        start = time.perf_counter()
+        with backend.create_key(keys[-1]) as key:
+            key.set_value('VBAWarnings', 4, REG_DWORD)
+        received.wait(5.0)
+        print(f"{'change -> event latency':<34} {(time.perf_counter() - start) * 1000:10.3f} ms"
+              f"  ({watcher.reads - reads} read)")
+    finally:
+        watcher.stop()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
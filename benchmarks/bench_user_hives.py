@@ -0,0 +1,47 @@
+"""사용자 hive 일괄 처리 벤치마크 (메모리 레지스트리)
+
+터미널 서버처럼 HKEY_USERS 아래에 사용자 hive 수백 개를 만든 뒤, UserHiveFanout의
+적용/확인/백업 시간을 작업 스레드 수별로 측정합니다. 메모리 레지스트리는 GIL을
+해제하지 않으므로 스레드 수에 따른 차이는 실제 레지스트리(winreg)에서 더 큽니다.
+
+    python -m benchmarks.bench_user_hives [사용자 수]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from src.core.registry_backend import MemoryRegistryBackend
+from src.core.user_hives import UserHiveFanout
+
+APPS = ['Excel', 'Word', 'PowerPoint', 'Access', 'Outlook']
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main(count: int = 300):
+    sids = [f'S-1-5-21-1000-2000-3000-{1000 + i}' for i in range(count)]
+    data = {f'HKEY_USERS\\{sid}\\Software\\Microsoft\\Office\\16.0\\{app}\\Security': {'VBAWarnings': 1}
+            for sid in sids for app in APPS}
+    for workers in (1, 16):
+        directory = tempfile.mkdtemp()
+        try:
+            backend = MemoryRegistryBackend(data)
+            fanout = UserHiveFanout(backend, backup_path=directory, max_workers=workers)
+            print(f"-- {count} users, {workers} workers")
+            timed('check (first run)', fanout.check_all)
+            timed('backup', fanout.backup_all)
+            summary = timed('apply', lambda: fanout.apply_all(backup=False))
+            timed('check', fanout.check_all)
+            print(f"{'slowest user':<34} {summary['timings']['max_user'] * 1000:10.1f} ms")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
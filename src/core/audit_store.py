@@ -0,0 +1,510 @@
+import bisect
+import heapq
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from threading import RLock
+from .logger import Logger
+from .log_rotation import COMPRESSED_SUFFIX, SegmentCompressor, is_compressed, open_segment, remove_quietly
+
+TimeValue = Union[None, float, int, str, datetime]
+
+
+def _to_epoch(value: TimeValue) -> Optional[float]:
+    """datetime, ISO 문자열, epoch 초를 epoch 초로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+class _SegmentIndex:
+    """세그먼트 하나의 색인
+
+    sparse에는 interval 건마다 [순번, 오프셋, 그 이전 기록의 최대 시각, 구간 최소 시각]을
+    기록하여, 시작 시각으로 건너뛸 위치와 종료 시각 이후 읽기를 멈출 위치를 찾습니다. actions는 작업별 기록 오프셋 목록,
+    users/sessions는 세그먼트 단위 건너뛰기에 사용합니다.
+    """
+
+    __slots__ = ('seq', 'path', 'count', 'size', 'min_ts', 'max_ts',
+                 'actions', 'users', 'sessions', 'sparse')
+
+    def __init__(self, seq: int, path: str):
+        self.seq = seq
+        self.path = path
+        self.count = 0
+        self.size = 0
+        self.min_ts: Optional[float] = None
+        self.max_ts: Optional[float] = None
+        self.actions: Dict[str, List[int]] = {}
+        self.users = set()
+        self.sessions = set()
+        self.sparse: List[List] = []
+
+    def add(self, entry: Dict, offset: int, length: int, interval: int):
+        ts = _to_epoch(entry.get('timestamp')) or 0.0
+        if self.count % interval == 0:
+            self.sparse.append([self.count, offset,
+                                self.max_ts if self.max_ts is not None else float('-inf'), ts])
+        else:
+            point = self.sparse[-1]
+            point[3] = min(point[3], ts)
+        self.actions.setdefault(entry.get('action') or '', []).append(offset)
+        self.users.add(entry.get('user'))
+        self.sessions.add(entry.get('session_id'))
+        self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        self.count += 1
+        self.size = offset + length
+
+    def may_match(self, start: Optional[float], end: Optional[float], actions: Optional[List[str]],
+                  user: Optional[str], session_id) -> bool:
+        if self.count == 0:
+            return False
+        if start is not None and self.max_ts < start:
+            return False
+        if end is not None and self.min_ts > end:
+            return False
+        if actions is not None and not any(action in self.actions for action in actions):
+            return False
+        if user is not None and user not in self.users:
+            return False
+        if session_id is not None and session_id not in self.sessions:
+            return False
+        return True
+
+    def action_offsets(self, actions: List[str], start: int, stop: int) -> Iterator[int]:
+        """start 이상 stop 미만 범위의 작업 기록 오프셋 (오름차순)"""
+        ranges = []
+        for action in actions:
+            offsets = self.actions.get(action)
+            if offsets:
+                # 오프셋 목록은 추가 순서대로 정렬되어 있음
+                ranges.append(offsets[bisect.bisect_left(offsets, start):bisect.bisect_left(offsets, stop)])
+        return heapq.merge(*ranges) if len(ranges) > 1 else iter(ranges[0] if ranges else ())
+
+    def seek_offset(self, start: float) -> int:
+        """이전 기록이 모두 start보다 이른 마지막 색인 지점의 오프셋"""
+        low, high = 0, len(self.sparse)
+        while low < high:
+            mid = (low + high) // 2
+            if self.sparse[mid][2] < start:
+                low = mid + 1
+            else:
+                high = mid
+        return self.sparse[low - 1][1] if low else 0
+
+    def stop_offset(self, end: float) -> int:
+        """이후 기록이 모두 end보다 늦은 첫 색인 지점의 오프셋 (없으면 세그먼트 크기)"""
+        stop = self.size
+        for _, offset, _, block_min in reversed(self.sparse):
+            if block_min <= end:
+                break
+            stop = offset
+        return stop
+
+    def tail_offset(self, remaining: int) -> int:
+        """마지막 remaining 건을 포함하는 가장 가까운 색인 지점의 오프셋"""
+        target = self.count - remaining
+        offset = 0
+        for ordinal, point_offset, _, _ in self.sparse:
+            if ordinal > target:
+                break
+            offset = point_offset
+        return offset
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'size': self.size,
+            'min_ts': self.min_ts,
+            'max_ts': self.max_ts,
+            'actions': self.actions,
+            'users': list(self.users),
+            'sessions': list(self.sessions),
+            'sparse': self.sparse
+        }
+
+    @classmethod
+    def from_dict(cls, seq: int, path: str, data: Dict) -> '_SegmentIndex':
+        index = cls(seq, path)
+        index.count = data['count']
+        index.size = data['size']
+        index.min_ts = data['min_ts']
+        index.max_ts = data['max_ts']
+        index.actions = data['actions']
+        index.users = set(data['users'])
+        index.sessions = set(data['sessions'])
+        index.sparse = data['sparse']
+        return index
+
+
+class AuditStore:
+    """색인된 감사 로그 저장소
+
+    기록은 세그먼트 파일(<prefix>.<seq>.jsonl)에 JSON Lines로 추가되고, 세그먼트가
+    max_segment_bytes를 넘거나 첫 기록 후 max_segment_age 초가 지나면 색인을
+    <prefix>.<seq>.idx에 저장하고 다음 세그먼트로 넘어갑니다(봉인). compress이면
+    봉인된 세그먼트를 백그라운드에서 .jsonl.gz로 압축하고, retention_days보다 오래된
+    세그먼트는 삭제합니다. 조회는 세그먼트 색인으로 관련 없는 세그먼트를 건너뛰고,
+    필요한 위치부터만 읽으므로 전체 기록을 메모리에 올리지 않습니다. 압축된
+    세그먼트도 같은 방식으로 조회됩니다.
+
+    페이지 조회 결과의 커서('<seq>:<offset>')를 다음 조회에 전달하면 이어서 조회합니다.
+    """
+
+    def __init__(self, directory: str, prefix: str = 'audit',
+                 max_segment_bytes: int = 10 * 1024 * 1024, index_interval: int = 256,
+                 max_segment_age: Optional[float] = None, compress: bool = False,
+                 retention_days: Optional[float] = None):
+        self.logger = Logger('audit_store')
+        self.directory = directory
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.index_interval = index_interval
+        self.max_segment_age = max_segment_age
+        self.compress = compress
+        self.retention_days = retention_days
+
+        self._lock = RLock()
+        self._file = None
+        self._compressor = SegmentCompressor('audit_compress')
+        self._segment_re = re.compile(rf'^{re.escape(prefix)}\.(\d+)\.jsonl(\.gz)?$')
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._segments: List[_SegmentIndex] = self._load_segments()
+        if not self._segments or is_compressed(self._segments[-1].path):
+            seq = self._segments[-1].seq + 1 if self._segments else 1
+            self._segments.append(_SegmentIndex(seq, self._segment_path(seq)))
+        with self._lock:
+            self._prune()
+            # 이전 실행에서 압축하지 못한 봉인 세그먼트 압축
+            for segment in self._segments[:-1]:
+                self._compress_later(segment)
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f'{self.prefix}.{seq:06d}.jsonl')
+
+    def _index_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f'{self.prefix}.{seq:06d}.idx')
+
+    def _load_segments(self) -> List[_SegmentIndex]:
+        found: Dict[int, str] = {}
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.tmp'):
+                # 중단된 압축/색인 저장의 임시 파일
+                remove_quietly(path)
+                continue
+            match = self._segment_re.match(name)
+            if not match:
+                continue
+            seq = int(match.group(1))
+            if seq in found:
+                # 압축 후 원본 삭제 전에 중단된 경우: 압축본 사용
+                plain = found[seq] if not is_compressed(found[seq]) else path
+                remove_quietly(plain)
+                path = plain + COMPRESSED_SUFFIX
+            found[seq] = path
+
+        segments = []
+        for position, seq in enumerate(sorted(found)):
+            path = found[seq]
+            is_active = position == len(found) - 1 and not is_compressed(path)
+            if is_active:
+                self._truncate_partial_tail(path)
+            index = None if is_active else self._read_index(seq, path)
+            if index is None:
+                index = self._build_index(seq, path)
+                if not is_active:
+                    self._write_index(index)
+            segments.append(index)
+        return segments
+
+    def _read_index(self, seq: int, path: str) -> Optional[_SegmentIndex]:
+        try:
+            with open(self._index_path(seq), 'r', encoding='utf-8') as f:
+                index = _SegmentIndex.from_dict(seq, path, json.load(f))
+            # 색인 저장 후 세그먼트가 바뀌었으면 다시 생성 (압축된 세그먼트는 변경되지 않음)
+            if not is_compressed(path) and index.size != os.path.getsize(path):
+                return None
+            return index
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_index(self, index: _SegmentIndex):
+        temp_path = self._index_path(index.seq) + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f)
+        os.replace(temp_path, self._index_path(index.seq))
+
+    def _build_index(self, seq: int, path: str) -> _SegmentIndex:
+        index = _SegmentIndex(seq, path)
+        for offset, length, entry in self._scan(index, 0):
+            index.add(entry, offset, length, self.index_interval)
+        if not is_compressed(path):
+            # 손상되어 건너뛴 줄도 세그먼트 크기에 포함
+            index.size = os.path.getsize(path)
+        return index
+
+    def _truncate_partial_tail(self, path: str):
+        """쓰기 도중 중단되어 줄바꿈 없이 끝난 마지막 줄 제거"""
+        with open(path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            valid_size = 0
+            pos = size
+            while pos > 0:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                index = f.read(pos - start).rfind(b'\n')
+                if index >= 0:
+                    valid_size = start + index + 1
+                    break
+                pos = start
+            f.truncate(valid_size)
+            self.logger.warning(f"감사 로그 세그먼트 손상 복구: {path} ({size - valid_size} bytes 제거)")
+
+    def _open(self, segment: _SegmentIndex):
+        path = segment.path
+        try:
+            return open_segment(path)
+        except FileNotFoundError:
+            # 여는 사이에 압축되어 경로가 바뀐 세그먼트
+            if segment.path != path:
+                return open_segment(segment.path)
+            raise
+
+    def _scan(self, segment: _SegmentIndex, offset: int,
+              size: Optional[int] = None) -> Iterator[Tuple[int, int, Dict]]:
+        """offset부터 (오프셋, 길이, 기록)을 순서대로 읽음"""
+        with self._open(segment) as f:
+            f.seek(offset)
+            for line in f:
+                if size is not None and offset >= size:
+                    break
+                length = len(line)
+                if line.endswith(b'\n'):
+                    try:
+                        yield offset, length, json.loads(line)
+                    except ValueError:
+                        self.logger.warning(f"손상된 감사 로그 기록 건너뜀: {segment.path}@{offset}")
+                offset += length
+
+    def _read_at(self, segment: _SegmentIndex, offsets: Iterable[int]) -> Iterator[Tuple[int, int, Dict]]:
+        # 압축된 세그먼트도 오프셋이 증가하는 순서이므로 앞으로만 탐색
+        with self._open(segment) as f:
+            for offset in offsets:
+                f.seek(offset)
+                line = f.readline()
+                try:
+                    yield offset, len(line), json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"손상된 감사 로그 기록 건너뜀: {segment.path}@{offset}")
+
+    def append_many(self, entries: List[Dict], durability: str = 'flush'):
+        """기록들을 한 번의 write로 추가 (durability: none, flush, fsync)"""
+        if not entries:
+            return
+        with self._lock:
+            active = self._segments[-1]
+            if (self.max_segment_age and active.count and active.min_ts
+                    and time.time() - active.min_ts >= self.max_segment_age):
+                self._seal_active()
+                active = self._segments[-1]
+            if self._file is None:
+                self._file = open(active.path, 'ab')
+            lines = []
+            for entry in entries:
+                line = json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n'
+                lines.append(line)
+                active.add(entry, active.size, len(line), self.index_interval)
+            self._file.write(b''.join(lines))
+            if durability != 'none':
+                self._file.flush()
+            if durability == 'fsync':
+                os.fsync(self._file.fileno())
+            if active.size >= self.max_segment_bytes:
+                self._seal_active()
+
+    def _seal_active(self):
+        """현재 세그먼트의 색인을 저장하고 새 세그먼트 시작"""
+        active = self._segments[-1]
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._write_index(active)
+        seq = active.seq + 1
+        self._segments.append(_SegmentIndex(seq, self._segment_path(seq)))
+        self._prune()
+        self._compress_later(active)
+
+    def _compress_later(self, segment: _SegmentIndex):
+        if not self.compress or is_compressed(segment.path):
+            return
+
+        def on_done(path: str, compressed: str):
+            with self._lock:
+                if segment in self._segments:
+                    segment.path = compressed
+                else:
+                    # 압축 중 삭제된 세그먼트
+                    remove_quietly(compressed)
+
+        self._compressor.submit(segment.path, on_done)
+
+    def _prune(self, now: Optional[float] = None):
+        """보존 기간이 지난 봉인 세그먼트 삭제"""
+        if not self.retention_days:
+            return
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        expired = [segment for segment in self._segments[:-1]
+                   if segment.count == 0 or segment.max_ts < cutoff]
+        for segment in expired:
+            self._segments.remove(segment)
+            self._remove_segment_files(segment)
+        if expired:
+            self.logger.info(f"보존 기간이 지난 감사 로그 세그먼트 {len(expired)}개 삭제")
+
+    def _remove_segment_files(self, segment: _SegmentIndex):
+        plain = self._segment_path(segment.seq)
+        for path in (plain, plain + COMPRESSED_SUFFIX, self._index_path(segment.seq)):
+            if os.path.exists(path):
+                remove_quietly(path)
+
+    def apply_retention(self, now: Optional[float] = None):
+        """보존 기간이 지난 세그먼트 정리"""
+        with self._lock:
+            self._prune(now)
+
+    def wait_for_compression(self):
+        """진행 중인 백그라운드 압축이 끝날 때까지 대기"""
+        self._compressor.shutdown(wait=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(segment.count for segment in self._segments)
+
+    def query(self, start: TimeValue = None, end: TimeValue = None,
+              action: Union[None, str, List[str]] = None, user: Optional[str] = None,
+              session_id=None, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """조건에 맞는 기록을 오래된 순으로 limit 건까지 조회
+
+        (기록 목록, 다음 페이지 커서)를 반환하며, 더 이상 기록이 없으면 커서는 None입니다.
+        """
+        start_ts, end_ts = _to_epoch(start), _to_epoch(end)
+        actions = [action] if isinstance(action, str) else (list(action) if action is not None else None)
+        cursor_seq, cursor_offset = self._parse_cursor(cursor)
+
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            # 조회 중 추가되는 기록은 현재 크기까지만 읽음
+            segments = [(segment, segment.size) for segment in self._segments if segment.seq >= cursor_seq]
+
+        results = []
+        for segment, size in segments:
+            if not segment.may_match(start_ts, end_ts, actions, user, session_id):
+                continue
+            offset = cursor_offset if segment.seq == cursor_seq else 0
+            if start_ts is not None:
+                offset = max(offset, segment.seek_offset(start_ts))
+            if end_ts is not None:
+                size = min(size, segment.stop_offset(end_ts))
+            try:
+                if actions is not None:
+                    records = self._read_at(segment, segment.action_offsets(actions, offset, size))
+                else:
+                    records = self._scan(segment, offset, size)
+                for record_offset, length, entry in records:
+                    if not self._entry_matches(entry, start_ts, end_ts, user, session_id):
+                        continue
+                    results.append(entry)
+                    if len(results) >= limit:
+                        return results, f'{segment.seq}:{record_offset + length}'
+            except FileNotFoundError:
+                # 조회 도중 삭제된 세그먼트
+                continue
+        return results, None
+
+    @staticmethod
+    def _entry_matches(entry: Dict, start: Optional[float], end: Optional[float],
+                       user: Optional[str], session_id) -> bool:
+        if start is not None or end is not None:
+            ts = _to_epoch(entry.get('timestamp')) or 0.0
+            if start is not None and ts < start:
+                return False
+            if end is not None and ts > end:
+                return False
+        if user is not None and entry.get('user') != user:
+            return False
+        if session_id is not None and entry.get('session_id') != session_id:
+            return False
+        return True
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+        if not cursor:
+            return 0, 0
+        try:
+            seq, offset = cursor.split(':')
+            return int(seq), int(offset)
+        except ValueError:
+            raise ValueError(f"잘못된 감사 로그 커서: {cursor}")
+
+    def tail(self, limit: int = 100) -> List[Dict]:
+        """가장 최근 기록 limit 건 (오래된 순)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            segments = [(segment, segment.size, segment.count) for segment in self._segments]
+
+        chunks = []
+        remaining = limit
+        for segment, size, count in reversed(segments):
+            if remaining <= 0:
+                break
+            if count == 0:
+                continue
+            offset = segment.tail_offset(remaining) if count > remaining else 0
+            try:
+                recent = deque((entry for _, _, entry in self._scan(segment, offset, size)),
+                               maxlen=remaining)
+            except FileNotFoundError:
+                continue
+            chunks.append(list(recent))
+            remaining -= len(recent)
+
+        results = []
+        for chunk in reversed(chunks):
+            results.extend(chunk)
+        return results
+
+    def clear(self):
+        """모든 기록 삭제"""
+        self.wait_for_compression()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            for segment in self._segments:
+                self._remove_segment_files(segment)
+            self._segments = [_SegmentIndex(1, self._segment_path(1))]
+
+    def close(self):
+        self.wait_for_compression()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,192 @@
+import atexit
+import queue
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from threading import Condition, Lock, Thread
+from .logger import Logger
+from .audit_store import AuditStore
+
+# 내구성 수준: none(버퍼에만 기록), flush(OS에 전달), fsync(디스크까지 기록)
+DURABILITY_LEVELS = ('none', 'flush', 'fsync')
+
+_STOP = object()
+
+# 시작된 기록기 (프로세스 종료 시 한 번에 정리, 닫히거나 수거되면 빠짐)
+_open_writers: 'weakref.WeakSet' = weakref.WeakSet()
+
+
+def _close_all():
+    for writer in list(_open_writers):
+        writer.close()
+
+
+atexit.register(_close_all)
+
+
+class AuditLogWriter:
+    """감사 로그 그룹 커밋 기록기
+
+    호출자는 제한된 크기의 큐에 기록을 넣고 바로 반환합니다. 백그라운드 스레드는
+    첫 기록을 받은 뒤 commit_interval 동안 함께 도착한 기록을 batch_size 건까지
+    모아, 한 번의 write(와 durability에 따른 flush/fsync)로 저장소에 반영합니다.
+    큐가 가득 차면 기록을 버리고 dropped로 집계합니다. close()는 큐에 남은 기록을
+    모두 기록한 뒤 종료합니다.
+
+    최근 기록은 ring_size 크기의 링 버퍼(recent)에 보관됩니다. 백그라운드 스레드는
+    첫 submit() 때 시작되며(auto_start=False면 start()를 직접 호출), 닫지 않은
+    기록기는 모듈 공통 atexit 훅이 종료 시 정리합니다.
+    """
+
+    def __init__(self, store: AuditStore, durability: str = 'flush', max_queue: int = 10000,
+                 batch_size: int = 256, commit_interval: float = 0.05, ring_size: int = 1000,
+                 auto_start: bool = True):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"알 수 없는 내구성 수준: {durability} (가능한 값: {', '.join(DURABILITY_LEVELS)})")
+        self.logger = Logger('audit_writer')
+        self.store = store
+        self.durability = durability
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.recent: Deque[Dict] = deque(maxlen=ring_size)
+        self.auto_start = auto_start
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_queue)
+        self._lock = Lock()
+        self._committed = Condition(self._lock)
+        self._thread: Optional[Thread] = None
+        self._closed = False
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._closed = False
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+            _open_writers.add(self)
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, entry: Dict) -> bool:
+        """기록을 큐에 추가 (대기하지 않음, 큐가 가득 찼거나 닫힌 뒤면 False)"""
+        if self._closed:
+            # 닫힌 뒤에는 저장소를 다시 열지 않도록 기록을 버림
+            with self._lock:
+                self.dropped += 1
+            return False
+        if self.auto_start and self._thread is None:
+            self.start()
+        with self._lock:
+            self.recent.append(entry)
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 1000 == 0:
+                    self.logger.warning(f"감사 로그 큐가 가득 참: 누적 {self.dropped}건 누락")
+                return False
+            self.submitted += 1
+            return True
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """지금까지 큐에 들어간 기록이 모두 파일에 반영될 때까지 대기 (닫힌 뒤에는 아무것도 하지 않음)"""
+        if self._closed:
+            return True
+        if not self.running:
+            self._drain()
+        with self._lock:
+            target = self.submitted
+            return self._committed.wait_for(lambda: self.written >= target, timeout)
+
+    def close(self, timeout: float = 5.0):
+        """남은 기록을 모두 기록하고 백그라운드 스레드 종료"""
+        self._closed = True
+        _open_writers.discard(self)
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout=timeout)
+        self._thread = None
+        # 스레드 없이 남은 기록 정리
+        self._drain()
+        self.store.close()
+
+    def clear(self):
+        """저장소와 링 버퍼의 기록 삭제"""
+        self.flush()
+        with self._lock:
+            self.recent.clear()
+        self.store.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'queued': self._queue.qsize()
+            }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            stop = self._collect(batch)
+            self._commit(batch)
+            if stop:
+                break
+
+    def _collect(self, batch: List[Dict]) -> bool:
+        """commit_interval 동안 도착한 기록을 batch_size까지 모음 (종료 요청이면 True)"""
+        deadline = time.monotonic() + self.commit_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        if batch:
+            self._commit(batch)
+
+    def _commit(self, batch: List[Dict]):
+        failed = 0
+        try:
+            self.store.append_many(batch, self.durability)
+        except Exception as e:
+            failed = len(batch)
+            self.logger.error(f"감사 로그 저장 중 오류 발생: {e}")
+        with self._lock:
+            # 실패한 기록도 처리 완료로 집계하여 flush()가 멈추지 않게 함
+            self.written += len(batch)
+            self.failed += failed
+            self.batches += 1
+            self._committed.notify_all()
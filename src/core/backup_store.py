@@ -0,0 +1,219 @@
+import bisect
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+from threading import Lock
+from .logger import Logger
+
+MANIFEST_NAME = 'manifest.jsonl'
+OBJECTS_DIR = 'objects'
+
+# 이전 버전의 백업 파일 이름 (vba_settings_YYYYMMDD_HHMMSS.reg)
+LEGACY_PATTERN = re.compile(r'^vba_settings_(\d{8}_\d{6})\.reg$')
+
+TimeValue = Union[float, int, datetime]
+
+
+class BackupEntry:
+    """매니페스트 항목 하나 (백업 시각과 내용 해시, 포함된 키, 이전한 백업 파일 이름)"""
+
+    __slots__ = ('id', 'timestamp', 'keys', 'legacy')
+
+    def __init__(self, backup_id: str, timestamp: float, keys: List[str], legacy: Optional[str] = None):
+        self.id = backup_id
+        self.timestamp = timestamp
+        self.keys = keys
+        self.legacy = legacy
+
+    def to_dict(self) -> Dict:
+        data = {'id': self.id, 'ts': self.timestamp, 'keys': self.keys}
+        if self.legacy is not None:
+            data['legacy'] = self.legacy
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BackupEntry':
+        return cls(data['id'], float(data['ts']), list(data.get('keys', [])), data.get('legacy'))
+
+    def __repr__(self) -> str:
+        return f"BackupEntry({self.id[:12]!r}, {datetime.fromtimestamp(self.timestamp).isoformat()})"
+
+
+class BackupStore:
+    """내용 주소 기반 레지스트리 백업 저장소
+
+    백업 내용은 SHA-256 해시 이름으로 objects\\<해시>.reg에 한 번만 저장하고, 백업
+    시각과 포함된 키는 manifest.jsonl에 한 줄씩 추가합니다. 직전 백업과 내용이 같으면
+    아무것도 기록하지 않습니다. 매니페스트는 시작할 때 한 번 읽어 시각 순으로 메모리에
+    두므로, 최근 백업은 O(1), 특정 시각 기준 백업은 이진 탐색으로 찾습니다. prune()은
+    오래된 항목을 지우고(최근 백업은 항상 유지) 더 이상 참조되지 않는 내용 파일을
+    삭제합니다.
+
+    이전 버전의 vba_settings_*.reg 파일은 차단 전 레지스트리 상태의 유일한 기록이므로
+    원본 파일을 그대로 두고 한 번만 가져오며, 가져온 항목은 prune()에서 삭제하지 않습니다.
+    """
+
+    def __init__(self, directory: str, encoding: str = 'utf-16'):
+        self.logger = Logger('backup_store')
+        self.directory = directory
+        self.encoding = encoding
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.objects_path = os.path.join(directory, OBJECTS_DIR)
+        self._lock = Lock()
+        self._entries: List[BackupEntry] = []
+        self._timestamps: List[float] = []
+        # 내용 해시 -> 참조하는 매니페스트 항목 수
+        self._refs: Dict[str, int] = {}
+        os.makedirs(self.objects_path, exist_ok=True)
+        self._load()
+        self._migrate_legacy()
+
+    def object_path(self, backup_id: str) -> str:
+        return os.path.join(self.objects_path, f'{backup_id}.reg')
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    self._index(BackupEntry.from_dict(json.loads(line)))
+                except (ValueError, KeyError, TypeError) as e:
+                    self.logger.warning(f"손상된 백업 매니페스트 항목 무시: {line_number}행 - {e}")
+
+    def _index(self, entry: BackupEntry):
+        position = bisect.bisect_right(self._timestamps, entry.timestamp)
+        self._timestamps.insert(position, entry.timestamp)
+        self._entries.insert(position, entry)
+        self._refs[entry.id] = self._refs.get(entry.id, 0) + 1
+
+    def _write_object(self, backup_id: str, data: bytes):
+        path = self.object_path(backup_id)
+        if os.path.exists(path):
+            return
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def put(self, content: str, keys: Iterable[str], timestamp: Optional[float] = None,
+            legacy: Optional[str] = None) -> BackupEntry:
+        """백업 내용 저장 (직전 백업과 같으면 그 항목을 그대로 반환)
+
+        legacy는 가져온 이전 버전 백업 파일 이름으로, 지정하면 항상 새 항목을 기록합니다.
+        """
+        data = content.encode(self.encoding)
+        backup_id = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            latest = self._entries[-1] if self._entries else None
+            if timestamp is None:
+                # 시계 해상도가 낮아도 새 백업이 항상 마지막 항목이 되도록
+                timestamp = time.time()
+                if latest is not None and timestamp <= latest.timestamp:
+                    timestamp = latest.timestamp + 1e-6
+            if (legacy is None and latest is not None and latest.id == backup_id
+                    and timestamp >= latest.timestamp):
+                return latest
+            self._write_object(backup_id, data)
+            entry = BackupEntry(backup_id, timestamp, sorted(keys), legacy)
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry.to_dict(), ensure_ascii=False, separators=(',', ':')) + '\n')
+            self._index(entry)
+        return entry
+
+    def latest(self) -> Optional[BackupEntry]:
+        """가장 최근 백업"""
+        with self._lock:
+            return self._entries[-1] if self._entries else None
+
+    def as_of(self, when: TimeValue) -> Optional[BackupEntry]:
+        """when 시각 이전(포함)의 마지막 백업"""
+        timestamp = when.timestamp() if isinstance(when, datetime) else float(when)
+        with self._lock:
+            position = bisect.bisect_right(self._timestamps, timestamp)
+            return self._entries[position - 1] if position else None
+
+    def entries(self) -> List[BackupEntry]:
+        """모든 백업 (오래된 순)"""
+        with self._lock:
+            return list(self._entries)
+
+    def read(self, entry: BackupEntry) -> str:
+        with open(self.object_path(entry.id), 'r', encoding=self.encoding) as f:
+            return f.read()
+
+    def prune(self, max_age_days: Optional[float] = None, max_entries: Optional[int] = None,
+              now: Optional[float] = None) -> int:
+        """보존 기간/개수를 넘은 백업 삭제 (삭제한 항목 수 반환)
+
+        최근 백업과 이전 버전에서 가져온 백업은 항상 유지합니다.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if len(self._entries) <= 1:
+                return 0
+            # 시각 순으로 정렬되어 있으므로 앞에서부터 삭제할 개수만 구하면 됨
+            remove = 0
+            if max_age_days is not None:
+                remove = bisect.bisect_left(self._timestamps, now - max_age_days * 86400)
+            if max_entries is not None:
+                remove = max(remove, len(self._entries) - max(max_entries, 1))
+            remove = min(remove, len(self._entries) - 1)
+            if remove <= 0:
+                return 0
+
+            removed = [entry for entry in self._entries[:remove] if entry.legacy is None]
+            if not removed:
+                return 0
+            kept = [entry for entry in self._entries[:remove] if entry.legacy is not None] + self._entries[remove:]
+            temp_path = self.manifest_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry.to_dict(), ensure_ascii=False, separators=(',', ':')) + '\n'
+                             for entry in kept)
+            os.replace(temp_path, self.manifest_path)
+            self._entries = kept
+            self._timestamps = [entry.timestamp for entry in kept]
+
+            orphans = []
+            for entry in removed:
+                self._refs[entry.id] -= 1
+                if self._refs[entry.id] == 0:
+                    del self._refs[entry.id]
+                    orphans.append(entry.id)
+        for backup_id in orphans:
+            try:
+                os.remove(self.object_path(backup_id))
+            except OSError as e:
+                self.logger.warning(f"백업 내용 파일 삭제 실패: {backup_id} - {e}")
+        self.logger.info(f"오래된 백업 {len(removed)}건 정리 (내용 파일 {len(orphans)}개 삭제)")
+        return len(removed)
+
+    def _migrate_legacy(self):
+        """이전 버전의 vba_settings_*.reg 파일을 저장소로 가져오기 (원본 파일은 그대로 유지)"""
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if LEGACY_PATTERN.match(name))
+        except OSError:
+            return
+        imported = {entry.legacy for entry in self._entries if entry.legacy is not None}
+        names = [name for name in names if name not in imported]
+        migrated = 0
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                timestamp = datetime.strptime(LEGACY_PATTERN.match(name).group(1), '%Y%m%d_%H%M%S').timestamp()
+                with open(path, 'r', encoding=self.encoding) as f:
+                    content = f.read()
+                keys = [line.strip()[1:-1] for line in content.splitlines()
+                        if line.strip().startswith('[') and line.strip().endswith(']')]
+                self.put(content, keys, timestamp, legacy=name)
+                migrated += 1
+            except Exception as e:
+                self.logger.error(f"이전 백업 파일 이전 실패: {name} - {e}")
+        if migrated:
+            self.logger.info(f"이전 백업 파일 {migrated}개를 백업 저장소로 가져왔습니다.")
@@ -2,25 +2,87 @@ import logging
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from threading import Thread, Event
-import winreg
-import psutil
 from .logger import Logger, measure_time
+from .scheduler import ProbeScheduler
+from .journal import ChangeJournal
+from .log_rotation import rotation_options
+from .policy import get_security_policy
+from .process_snapshot import ProcessSnapshotProvider, get_process_snapshot_provider
+from .process_rules import ProcessMatcher, get_process_matcher
+from .registry_pool import RegistryKeyPool, get_registry_pool
+from .office_keys import OfficeKeyIndex, get_office_key_index
+from .registry_watch import RegistryChangeEvent, RegistryWatcher, create_registry_watcher, diff_key_state
+
+# 점검 간격 (초): 변경이 없으면 최대 간격까지 늘어남
+DEFAULT_REGISTRY_INTERVAL = 1.0
+DEFAULT_PROCESS_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 10.0
 
 class ChangeTracker:
-    def __init__(self):
+    def __init__(self, registry_interval: float = DEFAULT_REGISTRY_INTERVAL,
+                 process_interval: float = DEFAULT_PROCESS_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 process_provider: Optional[ProcessSnapshotProvider] = None,
+                 matcher: Optional[ProcessMatcher] = None,
+                 registry_pool: Optional[RegistryKeyPool] = None,
+                 key_index: Optional[OfficeKeyIndex] = None,
+                 registry_watcher: Optional[RegistryWatcher] = None, use_notifications: bool = True):
         self.logger = Logger('change_tracker')
-        self.changes: List[Dict] = []
+        self.process_provider = process_provider or get_process_snapshot_provider()
+        # 감시 키는 매번 다시 열지 않고 공유 핸들 풀에서 빌려서 조회
+        self.registry_pool = registry_pool or get_registry_pool()
+        # 감시 대상 보안 키는 설치된 Office 버전/응용 프로그램 색인을 따름
+        if key_index is None:
+            key_index = OfficeKeyIndex(registry_pool) if registry_pool is not None else get_office_key_index()
+        self.key_index = key_index
+        self._matcher = matcher
         self.tracking = False
         self.stop_event = Event()
         self.track_thread: Optional[Thread] = None
+
+        # VBA 관련 레지스트리 키 및 프로세스 감시 대상
+        self.watched_values = ['VBAWarnings', 'AccessVBOM']
+
+        # 변경 알림을 쓸 수 있으면 감시 키를 폴링하지 않음 (없으면 폴링으로 대체)
+        if registry_watcher is None and use_notifications:
+            registry_watcher = create_registry_watcher(self.registry_pool, self.watched_values)
+        self.registry_watcher = registry_watcher
+
+        # 마지막으로 확인한 상태 (None: 아직 기준 상태 없음)
+        self._registry_state: Optional[Dict[str, Optional[Dict[str, object]]]] = None
+        self._process_state: Optional[Dict[Tuple[int, float], str]] = None
+
+        # 프로브별 간격으로 점검 (백오프 적용)
+        self.scheduler = ProbeScheduler(self.stop_event, 'change_tracker')
+        self.scheduler.add_probe('registry', self._check_registry_changes,
+                                 registry_interval, max(max_interval, registry_interval))
+        self.scheduler.add_probe('process', self._check_process_changes,
+                                 process_interval, max(max_interval, process_interval))
         
         # 로그 파일 경로 설정
         self.log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
         os.makedirs(self.log_dir, exist_ok=True)
         self.log_file = os.path.join(self.log_dir, 'system_changes.json')
 
+        # 변경 사항은 추가 전용 저널(JSON Lines 세그먼트)에 기록
+        # 로테이션, 압축, 보존 기간은 보안 정책의 audit_settings를 따름
+        self.journal = ChangeJournal(os.path.join(self.log_dir, 'system_changes'), 'system_changes',
+                                     **rotation_options(get_security_policy().audit_settings))
+        self._migrate_legacy_log()
+        self.scheduler.add_probe('journal', self.journal.flush_if_due, self.journal.flush_interval)
+
+    @property
+    def watched_keys(self) -> List[str]:
+        """감시 대상 보안 키 전체 경로 목록"""
+        return self.key_index.security_keys()
+
+    @property
+    def matcher(self) -> ProcessMatcher:
+        """현재 프로세스 매처 (정책이 다시 로드되면 새 매처)"""
+        return self._matcher or get_process_matcher()
+
     @measure_time
     def start_tracking(self) -> bool:
         """변경 사항 추적 시작"""
@@ -30,6 +92,10 @@ class ChangeTracker:
 
         try:
             self.stop_event.clear()
+            if (self.registry_watcher is not None
+                    and self.registry_watcher.start(self.watched_keys, self._on_registry_event)):
+                self.logger.info(f"레지스트리 변경 알림 사용: {self.registry_watcher.name}")
+            self.scheduler.wake()
             self.track_thread = Thread(target=self._track_changes)
             self.track_thread.daemon = True
             self.track_thread.start()
@@ -51,8 +117,10 @@ class ChangeTracker:
             self.stop_event.set()
             if self.track_thread:
                 self.track_thread.join(timeout=5.0)
+            if self.registry_watcher is not None:
+                self.registry_watcher.stop()
             self.tracking = False
-            self._save_changes()
+            self.journal.flush()
             self.logger.info("시스템 변경 사항 추적이 중지되었습니다.")
             return True
         except Exception as e:
@@ -61,97 +129,165 @@ class ChangeTracker:
 
     def _track_changes(self):
         """변경 사항 추적 메인 루프"""
-        while not self.stop_event.is_set():
-            try:
-                self._check_registry_changes()
-                self._check_process_changes()
-            except Exception as e:
-                self.logger.error(f"변경 사항 추적 중 오류 발생: {e}")
+        try:
+            self.scheduler.run()
+        except Exception as e:
+            self.logger.error(f"변경 사항 추적 중 오류 발생: {e}")
+
+    def get_probe_stats(self) -> Dict[str, Dict]:
+        """프로브별 실행 시간 통계 반환"""
+        return self.scheduler.get_stats()
 
-    def _check_registry_changes(self):
-        """레지스트리 변경 사항 확인"""
+    def _check_registry_changes(self) -> bool:
+        """레지스트리 변경 사항 확인 (상태 전이 기록 여부 반환)
+
+        변경 알림을 받는 중에는 값을 읽지 않고 감시 키 목록(설치된 Office 버전)만 맞춥니다.
+        """
         try:
-            # VBA 관련 레지스트리 키 모니터링
-            vba_keys = [
-                r'Software\Microsoft\Office\16.0\Excel\Security',
-                r'Software\Microsoft\Office\16.0\Word\Security',
-                r'Software\Microsoft\Office\16.0\PowerPoint\Security'
-            ]
-
-            for key_path in vba_keys:
-                try:
-                    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_READ) as key:
-                        try:
-                            value, _ = winreg.QueryValueEx(key, 'VBAWarnings')
-                            self._add_change('registry', {
-                                'key': key_path,
-                                'value': 'VBAWarnings',
-                                'data': value,
-                                'timestamp': datetime.now().isoformat()
-                            })
-                        except WindowsError:
-                            pass
-                except WindowsError:
-                    continue
+            if self.registry_watcher is not None and self.registry_watcher.running:
+                self.registry_watcher.set_keys(self.watched_keys)
+                # 알림을 멈추고 폴링으로 돌아가면 기준 상태부터 다시 읽음
+                self._registry_state = None
+                return False
+            return self._diff_registry_state(self._read_registry_state())
         except Exception as e:
             self.logger.error(f"레지스트리 변경 확인 실패: {e}")
+            return False
+
+    def _read_registry_state(self) -> Dict[str, Optional[Dict[str, object]]]:
+        """감시 대상 키의 현재 값 조회 (키가 없으면 None)"""
+        state = {}
+        for key_path in self.watched_keys:
+            try:
+                values = self.registry_pool.read_values(key_path, self.watched_values)
+                state[key_path] = {name: value for name, (value, _) in values.items()}
+            except OSError:
+                state[key_path] = None
+        return state
+
+    def _diff_registry_state(self, state: Dict[str, Optional[Dict[str, object]]]) -> bool:
+        """마지막 상태와 비교하여 key_created/key_deleted/value_changed 이벤트 기록"""
+        previous = self._registry_state
+        self._registry_state = state
+        if previous is None:
+            # 첫 조회는 기준 상태로만 사용
+            return False
 
-    def _check_process_changes(self):
-        """프로세스 변경 사항 확인"""
+        changed = False
+        timestamp = datetime.now().isoformat()
+        for key_path, values in state.items():
+            for event, value_name, old, new in diff_key_state(previous.get(key_path), values, self.watched_values):
+                self._record_registry_change(event, key_path, value_name, old, new, timestamp)
+                changed = True
+        return changed
+
+    def _on_registry_event(self, event: RegistryChangeEvent):
+        """레지스트리 변경 알림 기록"""
+        self._record_registry_change(event.event, event.key, event.value, event.old, event.new,
+                                     datetime.fromtimestamp(event.detected_at).isoformat())
+
+    def _record_registry_change(self, event: str, key_path: str, value_name: Optional[str],
+                                old, new, timestamp: str):
+        data = {'key': key_path}
+        if event == 'value_changed':
+            data['value'] = value_name
+        data.update({'old': old, 'new': new, 'timestamp': timestamp})
+        self._add_change('registry', event, data)
+
+    def _check_process_changes(self) -> bool:
+        """프로세스 변경 사항 확인 (상태 전이 기록 여부 반환)"""
         try:
-            target_processes = ['EXCEL.EXE', 'WINWORD.EXE', 'POWERPNT.EXE']
-            for proc in psutil.process_iter(['pid', 'name', 'create_time']):
-                try:
-                    if proc.info['name'].upper() in target_processes:
-                        self._add_change('process', {
-                            'name': proc.info['name'],
-                            'pid': proc.info['pid'],
-                            'start_time': datetime.fromtimestamp(proc.info['create_time']).isoformat(),
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            return self._diff_process_state(self._read_process_state())
         except Exception as e:
             self.logger.error(f"프로세스 변경 확인 실패: {e}")
+            return False
+
+    def _read_process_state(self) -> Dict[Tuple[int, float], str]:
+        """감시 대상 프로세스의 (pid, create_time) -> 이름"""
+        snapshot = self.process_provider.snapshot()
+        return {info.key: info.name for info in self.matcher.filter(snapshot, snapshot)}
 
-    def _add_change(self, change_type: str, data: Dict):
+    def _diff_process_state(self, state: Dict[Tuple[int, float], str]) -> bool:
+        """마지막 상태와 비교하여 process_started/process_exited 이벤트 기록"""
+        previous = self._process_state
+        self._process_state = state
+        if previous is None:
+            return False
+
+        changed = False
+        timestamp = datetime.now().isoformat()
+        for (pid, create_time), name in state.items():
+            if (pid, create_time) not in previous:
+                self._add_change('process', 'process_started', {
+                    'name': name, 'pid': pid,
+                    'start_time': datetime.fromtimestamp(create_time).isoformat(),
+                    'old': None, 'new': 'running', 'timestamp': timestamp
+                })
+                changed = True
+        for (pid, create_time), name in previous.items():
+            if (pid, create_time) not in state:
+                self._add_change('process', 'process_exited', {
+                    'name': name, 'pid': pid,
+                    'start_time': datetime.fromtimestamp(create_time).isoformat(),
+                    'old': 'running', 'new': None, 'timestamp': timestamp
+                })
+                changed = True
+        return changed
+
+    def _add_change(self, change_type: str, event: str, data: Dict):
         """변경 사항 추가"""
         change = {
             'type': change_type,
+            'event': event,
             'data': data
         }
-        self.changes.append(change)
-        self._save_changes()
+        self.journal.append(change)
 
-    def _save_changes(self):
-        """변경 사항을 파일에 저장"""
+    def _migrate_legacy_log(self):
+        """이전 버전의 system_changes.json을 저널로 이전"""
+        if not os.path.exists(self.log_file):
+            return
         try:
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                json.dump(self.changes, f, indent=2, ensure_ascii=False)
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                legacy_changes = json.load(f)
+            for change in legacy_changes:
+                self.journal.append(change)
+            self.journal.flush()
+            os.remove(self.log_file)
+            self.logger.info(f"이전 변경 기록 {len(legacy_changes)}건을 저널로 이전했습니다.")
         except Exception as e:
-            self.logger.error(f"변경 사항 저장 실패: {e}")
+            self.logger.error(f"이전 변경 기록 이전 실패: {e}")
+
+    def iter_changes(self) -> Iterator[Dict]:
+        """저장된 변경 사항을 순서대로 스트리밍"""
+        return self.journal.iter_records()
 
     @measure_time
     def get_changes(self) -> List[Dict]:
         """저장된 변경 사항 반환"""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            return list(self.iter_changes())
         except Exception as e:
             self.logger.error(f"변경 사항 로드 실패: {e}")
             return []
 
+    @measure_time
+    def compact_changes(self, max_records: Optional[int] = None) -> bool:
+        """저널 세그먼트를 하나로 압축 (max_records 지정 시 최신 기록만 유지)"""
+        try:
+            self.journal.compact(max_records=max_records)
+            return True
+        except Exception as e:
+            self.logger.error(f"변경 사항 압축 실패: {e}")
+            return False
+
     @measure_time
     def clear_changes(self) -> bool:
         """변경 사항 기록 초기화"""
         try:
-            self.changes = []
-            if os.path.exists(self.log_file):
-                os.remove(self.log_file)
+            self.journal.clear()
             self.logger.info("변경 사항 기록이 초기화되었습니다.")
             return True
         except Exception as e:
             self.logger.error(f"변경 사항 초기화 실패: {e}")
-            return False 
\ No newline at end of file
+            return False
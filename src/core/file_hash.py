@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from threading import Lock
+from .logger import Logger
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(ROOT_DIR, 'cache', 'file_hashes.json')
+DEFAULT_TRUSTED_PATH = os.path.join(ROOT_DIR, 'config', 'trusted_hashes.json')
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str, algorithm: str = 'sha256', chunk_size: int = CHUNK_SIZE) -> str:
+    """파일을 고정 크기 버퍼로 나누어 읽으며 해시 계산
+
+    버퍼 하나를 재사용하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def _file_signature(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    """(크기, 수정 시각, 장치, 파일 ID) - 하나라도 바뀌면 다시 해시"""
+    return (stat.st_size, stat.st_mtime_ns, stat.st_dev, stat.st_ino)
+
+
+class FileHashCache:
+    """파일 해시 영구 캐시
+
+    (경로, 크기, 수정 시각, 파일 ID)가 그대로인 파일은 다시 읽지 않고 저장된
+    해시를 사용합니다. 캐시는 save() 때 JSON 파일로 원자적으로 저장됩니다.
+    """
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH, algorithm: str = 'sha256'):
+        self.logger = Logger('file_hash')
+        self.cache_path = cache_path
+        self.algorithm = algorithm
+        self.hash_count = 0
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self._lock = Lock()
+        self._load()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('algorithm') == self.algorithm:
+                self._entries = data.get('entries', {})
+        except Exception as e:
+            self.logger.error(f"해시 캐시 로드 실패: {e}")
+
+    def get_hash(self, path: str) -> Optional[str]:
+        """파일 해시 (변경되지 않았으면 캐시 사용, 파일이 없으면 None)"""
+        key = self._key(path)
+        try:
+            signature = list(_file_signature(os.stat(path)))
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['signature'] == signature:
+                return entry['digest']
+
+        digest = hash_file(path, self.algorithm)
+        with self._lock:
+            self.hash_count += 1
+            self._entries[key] = {'signature': signature, 'digest': digest}
+            self._dirty = True
+        return digest
+
+    def invalidate(self, path: str):
+        with self._lock:
+            if self._entries.pop(self._key(path), None) is not None:
+                self._dirty = True
+
+    def save(self) -> bool:
+        """변경된 캐시를 파일에 저장"""
+        if not self.cache_path:
+            return True
+        with self._lock:
+            if not self._dirty:
+                return True
+            data = {'algorithm': self.algorithm, 'entries': dict(self._entries)}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = self.cache_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.cache_path)
+            return True
+        except Exception as e:
+            self.logger.error(f"해시 캐시 저장 실패: {e}")
+            return False
+
+
+class TrustedHashStore:
+    """신뢰할 수 있는 실행 파일 해시 목록
+
+    파일 이름(대문자)별로 허용된 해시 목록을 JSON 파일에 보관합니다.
+    Office 업데이트마다 해시가 바뀌므로 한 이름에 여러 해시를 둘 수 있습니다.
+
+        {"EXCEL.EXE": ["<sha256 16진수>", ...], "WINWORD.EXE": [...]}
+
+    기본 파일(config/trusted_hashes.json)은 빈 목록으로 배포됩니다. 파일이 없으면 경고를
+    남기고 빈 목록으로 동작하므로, process_security.require_trusted_hash를 켜면 모든
+    파일이 신뢰할 수 없는 것으로 처리됩니다.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_TRUSTED_PATH):
+        self.logger = Logger('file_hash')
+        self.path = path
+        self._hashes: Dict[str, set] = {}
+        self._lock = Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        if not os.path.exists(self.path):
+            self.logger.warning(f"신뢰 해시 목록 파일이 없어 빈 목록을 사용합니다: {self.path}")
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for name, digests in data.items():
+                self._hashes[name.upper()] = {digest.lower() for digest in digests}
+        except Exception as e:
+            self.logger.error(f"신뢰 해시 목록 로드 실패: {e}")
+
+    def has_entry(self, file_path: str) -> bool:
+        with self._lock:
+            return os.path.basename(file_path).upper() in self._hashes
+
+    def is_trusted(self, file_path: str, digest: str) -> bool:
+        with self._lock:
+            return digest.lower() in self._hashes.get(os.path.basename(file_path).upper(), ())
+
+    def trust(self, file_path: str, digest: str):
+        with self._lock:
+            self._hashes.setdefault(os.path.basename(file_path).upper(), set()).add(digest.lower())
+
+    def save(self) -> bool:
+        if not self.path:
+            return True
+        try:
+            with self._lock:
+                data = {name: sorted(digests) for name, digests in sorted(self._hashes.items())}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+            os.replace(temp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.error(f"신뢰 해시 목록 저장 실패: {e}")
+            return False
+
+
+class FileHashVerifier:
+    """캐시된 해시를 신뢰 해시 목록과 비교하여 실행 파일 검증
+
+    require_trusted가 False이면 신뢰 목록에 이름이 없는 파일은 통과시키고,
+    목록에 이름이 있으면 해시가 일치해야 합니다.
+    """
+
+    def __init__(self, cache: Optional[FileHashCache] = None,
+                 trusted: Optional[TrustedHashStore] = None,
+                 require_trusted: bool = False, max_workers: int = 4):
+        self.logger = Logger('file_hash')
+        self.cache = cache or FileHashCache()
+        self.trusted = trusted or TrustedHashStore()
+        self.require_trusted = require_trusted
+        self.max_workers = max_workers
+
+    def verify(self, file_path: str) -> bool:
+        digest = self.cache.get_hash(file_path)
+        if digest is None:
+            self.logger.warning(f"파일을 찾을 수 없음: {file_path}")
+            return False
+        if self.trusted.is_trusted(file_path, digest):
+            return True
+        if self.trusted.has_entry(file_path) or self.require_trusted:
+            self.logger.warning(f"신뢰할 수 없는 파일 해시: {file_path} ({digest})")
+            return False
+        return True
+
+    def verify_many(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """여러 파일을 스레드 풀에서 함께 검증 (해시 계산 중에는 GIL이 해제됨)"""
+        paths: List[str] = list(dict.fromkeys(file_paths))
+        if not paths:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+            results = dict(zip(paths, executor.map(self._verify_safe, paths)))
+        self.cache.save()
+        return results
+
+    def _verify_safe(self, file_path: str) -> bool:
+        try:
+            return self.verify(file_path)
+        except Exception as e:
+            self.logger.error(f"파일 해시 검증 중 오류 발생: {file_path} - {e}")
+            return False
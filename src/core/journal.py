@@ -0,0 +1,331 @@
+import json
+import os
+import re
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional
+from threading import RLock
+from .logger import Logger
+from .log_rotation import COMPRESSED_SUFFIX, SegmentCompressor, is_compressed, open_segment, remove_quietly
+
+# 압축(compaction) 결과 세그먼트의 첫 줄에 기록되는 헤더 키
+COMPACTION_HEADER = '_journal_compacted'
+
+
+class ChangeJournal:
+    """추가 전용(JSON Lines) 변경 기록 저널
+
+    기록은 세그먼트 파일(<prefix>.<seq>.jsonl)에 한 줄씩 추가되며, 메모리 버퍼에
+    모았다가 batch_size 건 또는 flush_interval 초마다 한 번에 write + fsync 합니다.
+    세그먼트가 max_segment_bytes를 넘거나 열린 지 max_segment_age 초가 지나면 다음
+    세그먼트로 넘어갑니다. compress이면 지난 세그먼트를 백그라운드에서 .jsonl.gz로
+    압축하고, retention_days보다 오래 수정되지 않은 세그먼트는 삭제합니다.
+    압축된 세그먼트도 iter_records로 그대로 조회됩니다.
+
+    시작 시 마지막 세그먼트의 잘린 줄(쓰기 도중 비정상 종료)을 잘라내고,
+    중단된 압축 작업의 잔여 세그먼트를 정리합니다.
+    """
+
+    def __init__(self, directory: str, prefix: str = 'journal',
+                 max_segment_bytes: int = 5 * 1024 * 1024,
+                 batch_size: int = 64, flush_interval: float = 1.0,
+                 fsync: bool = True, max_segment_age: Optional[float] = None,
+                 compress: bool = False, retention_days: Optional[float] = None):
+        self.logger = Logger('journal')
+        self.directory = directory
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_segment_age = max_segment_age
+        self.compress = compress
+        self.retention_days = retention_days
+
+        self._lock = RLock()
+        self._compressor = SegmentCompressor('journal_compress')
+        self._segment_opened = 0.0
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._segment_re = re.compile(rf'^{re.escape(prefix)}\.(\d+)\.jsonl(\.gz)?$')
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover()
+        segments = self._segments()
+        self._seq = segments[-1][0] if segments else 1
+        if segments and is_compressed(segments[-1][1]):
+            # 마지막 세그먼트가 이미 압축되었으면 새 세그먼트에 추가
+            self._seq += 1
+        self._file = None
+        with self._lock:
+            self._apply_retention()
+            for seq, path in self._segments():
+                if seq < self._seq:
+                    self._compress_later(path)
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f'{self.prefix}.{seq:06d}.jsonl')
+
+    def _segments(self) -> List[tuple]:
+        """(seq, path) 목록을 순서대로 반환 (압축본과 원본이 함께 있으면 압축본)"""
+        found = {}
+        for name in os.listdir(self.directory):
+            match = self._segment_re.match(name)
+            if match:
+                seq = int(match.group(1))
+                if seq not in found or match.group(2):
+                    found[seq] = os.path.join(self.directory, name)
+        return sorted(found.items())
+
+    def _recover(self):
+        """비정상 종료 후 저널 상태 복구"""
+        # 중단된 압축 임시 파일 제거
+        tmp_path = os.path.join(self.directory, f'{self.prefix}.compact.tmp')
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(self.prefix) and name.endswith(COMPRESSED_SUFFIX + '.tmp'):
+                # 중단된 압축의 임시 파일
+                os.remove(path)
+            elif self._segment_re.match(name) and name.endswith(COMPRESSED_SUFFIX):
+                # 압축 후 원본 삭제 전에 중단된 경우
+                plain = path[:-len(COMPRESSED_SUFFIX)]
+                if os.path.exists(plain):
+                    remove_quietly(plain)
+
+        segments = self._segments()
+
+        # 압축 세그먼트보다 앞선 세그먼트는 이미 압축본에 포함되어 있으므로 제거
+        for index in range(len(segments) - 1, -1, -1):
+            if self._is_compacted(segments[index][1]):
+                for _, path in segments[:index]:
+                    os.remove(path)
+                    self.logger.warning(f"압축 완료 전 남은 세그먼트 정리: {path}")
+                segments = segments[index:]
+                break
+
+        if segments and not is_compressed(segments[-1][1]):
+            self._truncate_partial_tail(segments[-1][1])
+
+    def _is_compacted(self, path: str) -> bool:
+        try:
+            with open_segment(path, 'r') as f:
+                first = f.readline()
+            return first.startswith('{') and COMPACTION_HEADER in json.loads(first)
+        except (OSError, ValueError):
+            return False
+
+    @staticmethod
+    def _rfind_newline(f, end: int) -> int:
+        """end 이전의 마지막 줄바꿈 위치 (없으면 -1)"""
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 4096)
+            f.seek(start)
+            index = f.read(pos - start).rfind(b'\n')
+            if index >= 0:
+                return start + index
+            pos = start
+        return -1
+
+    def _truncate_partial_tail(self, path: str):
+        """마지막 세그먼트 끝의 불완전하거나 손상된 줄을 잘라냄"""
+        with open(path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+
+            f.seek(size - 1)
+            if f.read(1) != b'\n':
+                # 줄바꿈 없이 끝난 줄은 쓰기 도중 중단된 것
+                valid_size = self._rfind_newline(f, size) + 1
+            else:
+                # 마지막 줄이 완전하더라도 JSON이 깨졌으면 잘라냄
+                line_start = self._rfind_newline(f, size - 1) + 1
+                f.seek(line_start)
+                try:
+                    json.loads(f.read(size - 1 - line_start).decode('utf-8'))
+                    valid_size = size
+                except ValueError:
+                    valid_size = line_start
+
+            if valid_size != size:
+                f.truncate(valid_size)
+                self.logger.warning(f"저널 세그먼트 손상 복구: {path} ({size - valid_size} bytes 제거)")
+
+    def _open_segment(self):
+        if self._file is None:
+            path = self._segment_path(self._seq)
+            self._segment_opened = os.path.getmtime(path) if os.path.exists(path) else time.time()
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def _rotate_if_needed(self):
+        if self._file is None:
+            return
+        expired = (self.max_segment_age is not None
+                   and time.time() - self._segment_opened >= self.max_segment_age)
+        if self._file.tell() >= self.max_segment_bytes or expired:
+            self._file.close()
+            self._file = None
+            sealed = self._segment_path(self._seq)
+            self._seq += 1
+            self._apply_retention()
+            self._compress_later(sealed)
+
+    def _compress_later(self, path: str):
+        if self.compress and not is_compressed(path):
+            self._compressor.submit(path, lambda original, compressed: None)
+
+    def _apply_retention(self, now: Optional[float] = None):
+        """retention_days보다 오래 수정되지 않은 지난 세그먼트 삭제"""
+        if not self.retention_days:
+            return
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        removed = 0
+        for seq, path in self._segments():
+            if seq >= self._seq:
+                break
+            try:
+                if os.path.getmtime(path) < cutoff and remove_quietly(path):
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            self.logger.info(f"보존 기간이 지난 저널 세그먼트 {removed}개 삭제")
+
+    def apply_retention(self, now: Optional[float] = None):
+        with self._lock:
+            self._apply_retention(now)
+
+    def wait_for_compression(self):
+        """진행 중인 백그라운드 압축이 끝날 때까지 대기"""
+        self._compressor.shutdown(wait=True)
+
+    def append(self, record: Dict):
+        """기록 추가 (배치 조건을 만족하면 디스크에 반영)"""
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if (len(self._buffer) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush_if_due(self) -> bool:
+        """flush_interval이 지난 버퍼를 디스크에 반영"""
+        with self._lock:
+            if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+                return True
+            return False
+
+    def flush(self):
+        """버퍼의 기록을 한 번의 write와 fsync로 반영"""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            self._open_segment()
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._buffer.clear()
+            self._rotate_if_needed()
+
+    def iter_records(self) -> Iterator[Dict]:
+        """모든 세그먼트의 기록을 순서대로 스트리밍"""
+        with self._lock:
+            self.flush()
+            segments = self._segments()
+        for _, path in segments:
+            try:
+                f = open_segment(path, 'r')
+            except FileNotFoundError:
+                # 목록 조회 후 압축된 세그먼트
+                try:
+                    f = open_segment(path + COMPRESSED_SUFFIX, 'r')
+                except FileNotFoundError:
+                    # 읽는 도중 압축 등으로 제거된 세그먼트
+                    continue
+            with f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        self.logger.warning(f"손상된 저널 기록 건너뜀: {path}")
+                        continue
+                    if isinstance(record, dict) and COMPACTION_HEADER in record:
+                        continue
+                    yield record
+
+    def compact(self, keep: Optional[Callable[[Dict], bool]] = None,
+                max_records: Optional[int] = None) -> int:
+        """모든 세그먼트를 하나로 합침
+
+        keep 조건을 만족하는 기록만 남기고, max_records가 주어지면 최신 기록만 유지합니다.
+        임시 파일에 쓰고 fsync 후 마지막 세그먼트를 원자적으로 교체하므로,
+        도중에 중단되어도 다음 시작 시 복구됩니다. 남은 기록 수를 반환합니다.
+        """
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            # 압축 중인 세그먼트가 교체 후 다시 나타나지 않도록 대기
+            self.wait_for_compression()
+
+            segments = self._segments()
+            if not segments:
+                return 0
+
+            records = (r for r in self.iter_records() if keep is None or keep(r))
+            if max_records is not None:
+                records = iter(deque(records, maxlen=max_records))
+
+            tmp_path = os.path.join(self.directory, f'{self.prefix}.compact.tmp')
+            count = 0
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({COMPACTION_HEADER: True, 'timestamp': time.time()}) + '\n')
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    count += 1
+                f.flush()
+                os.fsync(f.fileno())
+
+            last_seq, last_path = segments[-1]
+            compacted_path = self._segment_path(last_seq)
+            os.replace(tmp_path, compacted_path)
+            if last_path != compacted_path:
+                os.remove(last_path)
+            for _, path in segments[:-1]:
+                os.remove(path)
+
+            # 이후 기록은 새 세그먼트에 추가
+            self._seq = last_seq + 1
+            self._compress_later(compacted_path)
+            self.logger.info(f"저널 압축 완료: 세그먼트 {len(segments)}개 -> 1개, 기록 {count}건")
+            return count
+
+    def clear(self):
+        """모든 기록 삭제"""
+        with self._lock:
+            self.wait_for_compression()
+            self._buffer.clear()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            for _, path in self._segments():
+                os.remove(path)
+            self._seq = 1
+
+    def close(self):
+        self.wait_for_compression()
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
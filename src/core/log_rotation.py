@@ -0,0 +1,106 @@
+import gzip
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from .logger import Logger
+
+COMPRESSED_SUFFIX = '.gz'
+
+# security_policy.json의 audit_settings 기본값
+DEFAULT_AUDIT_SETTINGS = {
+    "log_retention_days": 30,
+    "log_rotation_size_mb": 10,
+    "log_rotation_interval_hours": 24,
+    "log_compression": True
+}
+
+
+def rotation_options(audit_settings: Optional[Dict] = None) -> Dict:
+    """audit_settings를 세그먼트 저장소 인자(max_segment_bytes 등)로 변환"""
+    settings = dict(DEFAULT_AUDIT_SETTINGS)
+    settings.update(audit_settings or {})
+    retention_days = settings.get("log_retention_days")
+    interval_hours = settings.get("log_rotation_interval_hours")
+    return {
+        'max_segment_bytes': int(settings["log_rotation_size_mb"] * 1024 * 1024),
+        'max_segment_age': interval_hours * 3600 if interval_hours else None,
+        'compress': bool(settings.get("log_compression")),
+        'retention_days': retention_days or None
+    }
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_SUFFIX)
+
+
+def open_segment(path: str, mode: str = 'rb'):
+    """세그먼트 파일 열기 (압축된 세그먼트는 압축을 풀면서 읽음)"""
+    if is_compressed(path):
+        return gzip.open(path, mode if 'b' in mode else mode + 't',
+                         encoding=None if 'b' in mode else 'utf-8')
+    if 'b' in mode:
+        return open(path, mode)
+    return open(path, mode, encoding='utf-8')
+
+
+def compress_file(path: str, remove_original: bool = True) -> str:
+    """파일을 gzip으로 압축 (수정 시각 유지) 후 압축 파일 경로 반환
+
+    임시 파일에 쓰고 fsync 후 이름을 바꾸므로 중간에 중단되어도 원본은 남습니다.
+    원본 삭제에 실패(다른 곳에서 읽는 중)해도 압축 파일은 유효합니다.
+    """
+    target = path + COMPRESSED_SUFFIX
+    temp_path = target + '.tmp'
+    with open(path, 'rb') as src, gzip.open(temp_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    with open(temp_path, 'rb+') as f:
+        os.fsync(f.fileno())
+    stat = os.stat(path)
+    os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(temp_path, target)
+    if remove_original:
+        remove_quietly(path)
+    return target
+
+
+def remove_quietly(path: str) -> bool:
+    """파일 삭제 (없거나 사용 중이면 False)"""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+class SegmentCompressor:
+    """봉인된 세그먼트를 백그라운드 스레드 하나에서 순서대로 압축
+
+    압축이 끝나면 on_done(원본 경로, 압축 경로)으로 세그먼트 경로를 바꿀 기회를 준 뒤
+    원본을 삭제하므로, 읽는 쪽은 항상 존재하는 파일을 찾을 수 있습니다.
+    """
+
+    def __init__(self, name: str = 'log_rotation'):
+        self.logger = Logger('log_rotation')
+        self._name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, path: str, on_done: Callable[[str, str], None]) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self._name)
+        return self._executor.submit(self._compress, path, on_done)
+
+    def _compress(self, path: str, on_done: Callable[[str, str], None]):
+        try:
+            compressed = compress_file(path, remove_original=False)
+            on_done(path, compressed)
+            remove_quietly(path)
+            return compressed
+        except Exception as e:
+            self.logger.error(f"세그먼트 압축 실패: {path} - {e}")
+            return None
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
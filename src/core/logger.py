@@ -21,11 +21,11 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.INFO)
         
-        # 파일 핸들러 설정
-        file_handler = logging.FileHandler(
-            os.path.join(log_dir, f"{name}.log"),
-            encoding='utf-8'
-        )
+        # 파일 핸들러 설정 (같은 이름의 Logger를 여러 개 만들어도 핸들러는 하나만)
+        log_path = os.path.abspath(os.path.join(log_dir, f"{name}.log"))
+        if any(getattr(handler, 'baseFilename', None) == log_path for handler in self.logger.handlers):
+            return
+        file_handler = logging.FileHandler(log_path, encoding='utf-8')
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(formatter)
         
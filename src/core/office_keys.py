@@ -0,0 +1,172 @@
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from threading import Lock
+from .logger import Logger
+from .registry_pool import RegistryKeyPool, get_registry_pool
+
+# VBA 보안 설정(VBAWarnings, AccessVBOM)을 사용하는 Office 응용 프로그램
+OFFICE_APPLICATIONS = ('Excel', 'Word', 'PowerPoint', 'Access', 'Outlook')
+
+# 설치된 버전을 찾지 못했을 때 사용하는 기본 대상 (Office 2016 이후)
+DEFAULT_OFFICE_VERSIONS = ('16.0',)
+DEFAULT_OFFICE_APPLICATIONS = ('Excel', 'Word', 'PowerPoint')
+
+OFFICE_ROOT = 'Software\\Microsoft\\Office'
+
+_VERSION_PATTERN = re.compile(r'^\d+\.\d+$')
+
+
+def _version_order(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in version.split('.'))
+
+
+class OfficeApplicationKey:
+    """설치된 Office 응용 프로그램 하나의 보안 키"""
+
+    __slots__ = ('hive', 'version', 'application', 'security_key')
+
+    def __init__(self, hive: str, version: str, application: str):
+        self.hive = hive
+        self.version = version
+        self.application = application
+        self.security_key = f"{hive}\\{OFFICE_ROOT}\\{version}\\{application}\\Security"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, OfficeApplicationKey) and self.security_key == other.security_key
+
+    def __hash__(self) -> int:
+        return hash(self.security_key)
+
+    def __repr__(self) -> str:
+        return f"OfficeApplicationKey({self.security_key!r})"
+
+
+class OfficeKeyIndex:
+    """설치된 Office 버전/응용 프로그램 보안 키 색인
+
+    hive마다 Software\\Microsoft\\Office 아래의 버전 키(16.0 등)와 그 아래의 응용
+    프로그램 키를 한 번만 나열해 둡니다. 이후에는 나열 기준 키(Office 키와 각 버전
+    키)의 마지막 수정 시각만 check_interval 초마다 확인하고, 바뀌었을 때만 다시
+    나열하여 generation을 올립니다. 설치된 버전을 찾지 못하면 기본 대상(16.0의
+    Excel, Word, PowerPoint)을 사용합니다.
+    """
+
+    def __init__(self, pool: Optional[RegistryKeyPool] = None,
+                 hives: Sequence[str] = ('HKEY_CURRENT_USER',),
+                 applications: Sequence[str] = OFFICE_APPLICATIONS, check_interval: float = 5.0):
+        self.logger = Logger('office_keys')
+        self.pool = pool or get_registry_pool()
+        self.hives = tuple(hives)
+        self._applications = {name.upper(): name for name in applications}
+        self.check_interval = check_interval
+        self.generation = 0
+        self.enumeration_count = 0
+        self._lock = Lock()
+        self._fingerprint: Optional[Tuple] = None
+        self._entries: List[OfficeApplicationKey] = []
+        self._version_keys: List[str] = []
+        self._last_check = 0.0
+
+    def _subkeys(self, key_path: str) -> Optional[Tuple[List[str], int]]:
+        """(하위 키 이름 목록, 마지막 수정 시각), 키가 없으면 None"""
+        try:
+            with self.pool.acquire(key_path) as key:
+                return key.subkeys(), key.query_info()[2]
+        except OSError:
+            return None
+
+    def _modified(self, key_path: str) -> Optional[int]:
+        try:
+            with self.pool.acquire(key_path) as key:
+                return key.query_info()[2]
+        except OSError:
+            return None
+
+    def _current_fingerprint(self) -> Tuple:
+        """나열 기준 키(Office 키와 알려진 버전 키)의 마지막 수정 시각"""
+        stamps = []
+        for hive in self.hives:
+            root = f"{hive}\\{OFFICE_ROOT}"
+            stamps.append((root, self._modified(root)))
+        for version_key in self._version_keys:
+            stamps.append((version_key, self._modified(version_key)))
+        return tuple(stamps)
+
+    def _enumerate(self) -> Tuple[List[OfficeApplicationKey], Tuple]:
+        entries = []
+        stamps = []
+        version_stamps = []
+        for hive in self.hives:
+            root = f"{hive}\\{OFFICE_ROOT}"
+            listing = self._subkeys(root)
+            stamps.append((root, listing[1] if listing else None))
+            if listing is None:
+                continue
+            for version in sorted((v for v in listing[0] if _VERSION_PATTERN.match(v)), key=_version_order):
+                version_key = f"{root}\\{version}"
+                apps = self._subkeys(version_key)
+                version_stamps.append((version_key, apps[1] if apps else None))
+                if apps is None:
+                    continue
+                # 저장소의 나열 순서와 관계없이 응용 프로그램 목록 순서로 정렬
+                found = {application.upper() for application in apps[0]}
+                entries.extend(OfficeApplicationKey(hive, version, name)
+                               for upper, name in self._applications.items() if upper in found)
+        self._version_keys = [version_key for version_key, _ in version_stamps]
+        return entries, tuple(stamps + version_stamps)
+
+    def refresh(self, force: bool = False) -> bool:
+        """나열 기준 키가 바뀌었으면 다시 나열 (색인이 바뀌었으면 True)"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            if not force and self._fingerprint is not None and self._current_fingerprint() == self._fingerprint:
+                return False
+            entries, fingerprint = self._enumerate()
+            self.enumeration_count += 1
+            if not entries:
+                entries = [OfficeApplicationKey(hive, version, application)
+                           for hive in self.hives for version in DEFAULT_OFFICE_VERSIONS
+                           for application in DEFAULT_OFFICE_APPLICATIONS]
+            self._fingerprint = fingerprint
+            if entries == self._entries:
+                return False
+            self._entries = entries
+            self.generation += 1
+        self.logger.info(
+            f"Office 보안 키 색인 갱신: {', '.join(sorted({e.version for e in entries}, key=_version_order))} 버전, "
+            f"{len(entries)}개 응용 프로그램"
+        )
+        return True
+
+    def _ensure_current(self):
+        if self._fingerprint is None or time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+
+    def entries(self) -> List[OfficeApplicationKey]:
+        """설치된 응용 프로그램 보안 키 목록"""
+        self._ensure_current()
+        return list(self._entries)
+
+    def security_keys(self) -> List[str]:
+        return [entry.security_key for entry in self.entries()]
+
+    def versions(self) -> List[str]:
+        return sorted({entry.version for entry in self.entries()}, key=_version_order)
+
+    def value_map(self, values: Dict[str, object]) -> Dict[str, Dict[str, object]]:
+        """보안 키마다 같은 값을 지정한 {키 경로: {값 이름: 값}}"""
+        return {key_path: dict(values) for key_path in self.security_keys()}
+
+
+_default_index: Optional[OfficeKeyIndex] = None
+_default_index_lock = Lock()
+
+
+def get_office_key_index() -> OfficeKeyIndex:
+    """모든 컴포넌트가 공유하는 Office 보안 키 색인"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = OfficeKeyIndex()
+        return _default_index
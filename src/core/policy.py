@@ -0,0 +1,297 @@
+import copy
+import json
+import os
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional
+from threading import Lock
+from .logger import Logger
+from .audit_writer import DURABILITY_LEVELS
+from .process_rules import DEFAULT_PROCESS_RULES, ProcessMatcher
+from .registry_patterns import RegistryPatternIndex
+
+POLICY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                           'config', 'security_policy.json')
+
+# security_policy.json이 없거나 항목이 빠졌을 때 사용하는 기본 정책
+DEFAULT_POLICY = {
+    "require_admin": True,
+    "block_remote_access": True,
+    "audit_changes": True,
+    "max_failed_attempts": 3,
+    "session_timeout": 3600,  # 1시간
+    "allowed_processes": [
+        "EXCEL.EXE",
+        "WINWORD.EXE",
+        "POWERPNT.EXE"
+    ],
+    "process_rules": DEFAULT_PROCESS_RULES,
+    "blocked_registry_keys": [
+        "HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\VBAWarnings",
+        "HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\AccessVBOM"
+    ],
+    "security_levels": {},
+    "audit_settings": {},
+    "process_security": {},
+    "registry_security": {}
+}
+
+class PolicyValidationError(ValueError):
+    """보안 정책 검증 실패 (errors: 항목별 오류 메시지 목록)"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("보안 정책 검증 실패: " + "; ".join(errors))
+        self.errors = errors
+
+
+def _freeze(value):
+    """중첩된 dict/list를 읽기 전용 구조로 변환"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class SecurityPolicy:
+    """검증 및 컴파일이 끝난 읽기 전용 보안 정책
+
+    프로세스 이름은 대문자 집합으로, 차단 레지스트리 패턴과 프로세스 규칙은 매처로
+    한 번만 만들어 둡니다. 생성 후에는 속성을 바꿀 수 없으며, 정책이 바뀌면 새
+    객체로 통째로 교체됩니다. 이전 코드와의 호환을 위해 policy["키"]로 원본 값을
+    읽을 수 있습니다.
+    """
+
+    __slots__ = ('require_admin', 'block_remote_access', 'audit_changes', 'max_failed_attempts',
+                 'session_timeout', 'allowed_processes', 'blocked_registry_keys', 'registry_patterns',
+                 'process_matcher', 'audit_settings', 'process_security', 'registry_security',
+                 'security_levels', 'require_trusted_hash', 'raw', 'source_path', 'mtime', 'version')
+
+    def __init__(self, data: Dict, source_path: Optional[str] = None, mtime: float = 0.0,
+                 version: int = 0):
+        merged = copy.deepcopy(DEFAULT_POLICY)
+        merged.update(data)
+        errors = self._validate(merged)
+
+        values = {}
+        try:
+            values['registry_patterns'] = RegistryPatternIndex(merged["blocked_registry_keys"])
+        except Exception as e:
+            errors.append(f"blocked_registry_keys: {e}")
+        try:
+            values['process_matcher'] = ProcessMatcher(merged["process_rules"] or DEFAULT_PROCESS_RULES)
+        except Exception as e:
+            errors.append(f"process_rules: {e}")
+        if errors:
+            raise PolicyValidationError(errors)
+
+        values.update(
+            require_admin=merged["require_admin"],
+            block_remote_access=merged["block_remote_access"],
+            audit_changes=merged["audit_changes"],
+            max_failed_attempts=merged["max_failed_attempts"],
+            session_timeout=merged["session_timeout"],
+            allowed_processes=frozenset(name.upper() for name in merged["allowed_processes"]),
+            blocked_registry_keys=tuple(merged["blocked_registry_keys"]),
+            audit_settings=_freeze(merged["audit_settings"]),
+            process_security=_freeze(merged["process_security"]),
+            registry_security=_freeze(merged["registry_security"]),
+            security_levels=_freeze(merged["security_levels"]),
+            require_trusted_hash=bool(merged["process_security"].get("require_trusted_hash", False)),
+            raw=_freeze(merged),
+            source_path=source_path,
+            mtime=mtime,
+            version=version
+        )
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _validate(policy: Dict) -> List[str]:
+        errors = []
+        for key in ("require_admin", "block_remote_access", "audit_changes"):
+            if not isinstance(policy[key], bool):
+                errors.append(f"{key}: true/false 값이어야 합니다")
+        for key in ("max_failed_attempts", "session_timeout"):
+            value = policy[key]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                errors.append(f"{key}: 0 이상의 정수여야 합니다")
+        for key in ("allowed_processes", "blocked_registry_keys"):
+            value = policy[key]
+            if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+                errors.append(f"{key}: 문자열 목록이어야 합니다")
+        if not isinstance(policy["process_rules"], list) or not all(
+                isinstance(rule, dict) for rule in policy["process_rules"]):
+            errors.append("process_rules: 규칙 객체 목록이어야 합니다")
+        for key in ("security_levels", "audit_settings", "process_security", "registry_security"):
+            if not isinstance(policy[key], dict):
+                errors.append(f"{key}: 객체여야 합니다")
+        if errors:
+            return errors
+
+        audit = policy["audit_settings"]
+        for key in ("log_retention_days", "log_rotation_size_mb", "log_rotation_interval_hours",
+                    "memory_entries"):
+            value = audit.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                      or value < 0):
+                errors.append(f"audit_settings.{key}: 0 이상의 숫자여야 합니다")
+        if audit.get("log_rotation_size_mb") == 0:
+            errors.append("audit_settings.log_rotation_size_mb: 0보다 커야 합니다")
+        if audit.get("durability", "flush") not in DURABILITY_LEVELS:
+            errors.append(f"audit_settings.durability: {', '.join(DURABILITY_LEVELS)} 중 하나여야 합니다")
+
+        registry = policy["registry_security"]
+        for key in ("backup_retention_days", "max_backups"):
+            value = registry.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                      or value < 0):
+                errors.append(f"registry_security.{key}: 0 이상의 숫자여야 합니다")
+        return errors
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SecurityPolicy는 변경할 수 없습니다")
+
+    def __delattr__(self, name):
+        raise AttributeError("SecurityPolicy는 변경할 수 없습니다")
+
+    def __getitem__(self, key: str):
+        return self.raw[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.raw
+
+    def get(self, key: str, default=None):
+        return self.raw.get(key, default)
+
+    def to_dict(self) -> Dict:
+        """원본 정책 값을 일반 dict로 복사"""
+        return _thaw(self.raw)
+
+
+class PolicyStore:
+    """보안 정책 파일 로더 (수정 시각이 바뀌면 다시 로드)
+
+    current는 check_interval 초마다 최대 한 번 파일 수정 시각을 확인하고, 바뀌었으면
+    새 정책을 검증 후 한 번에 교체합니다. 검증에 실패한 파일은 거부하고 기존 정책을
+    유지하며, 같은 파일을 다시 시도하지 않습니다. 교체될 때마다 구독자에게 새 정책을
+    전달합니다.
+    """
+
+    def __init__(self, path: str = POLICY_PATH, check_interval: float = 1.0):
+        self.logger = Logger('policy')
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error: Optional[PolicyValidationError] = None
+        self._lock = Lock()
+        self._subscribers: List[Callable[[SecurityPolicy], None]] = []
+        self._last_check = 0.0
+        self._rejected_mtime: Optional[float] = None
+        self._policy = self._initial_policy()
+
+    def _initial_policy(self) -> SecurityPolicy:
+        try:
+            policy = self._load()
+            if policy is not None:
+                return policy
+        except PolicyValidationError as e:
+            self.last_error = e
+            self.logger.error(f"{e} - 기본 정책을 사용합니다.")
+        except Exception as e:
+            self.logger.error(f"보안 정책 로드 실패: {e} - 기본 정책을 사용합니다.")
+        self._last_check = time.monotonic()
+        return SecurityPolicy({})
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _load(self, version: int = 1) -> Optional[SecurityPolicy]:
+        mtime = self._mtime()
+        self._last_check = time.monotonic()
+        if mtime is None:
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise PolicyValidationError([f"JSON 구문 오류: {e}"])
+        if not isinstance(data, dict):
+            raise PolicyValidationError(["최상위 값은 객체여야 합니다"])
+        return SecurityPolicy(data, self.path, mtime, version)
+
+    @property
+    def current(self) -> SecurityPolicy:
+        """현재 정책 (파일이 바뀌었으면 다시 로드)"""
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.reload()
+        return self._policy
+
+    def reload(self, force: bool = False) -> bool:
+        """파일이 바뀌었으면 다시 로드 (교체되었으면 True)"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            mtime = self._mtime()
+            if mtime is None:
+                return False
+            if not force and (mtime == self._policy.mtime or mtime == self._rejected_mtime):
+                return False
+            try:
+                policy = self._load(self._policy.version + 1)
+            except PolicyValidationError as e:
+                self.last_error = e
+                self._rejected_mtime = mtime
+                self.logger.error(f"{e} - 기존 정책을 유지합니다.")
+                return False
+            except Exception as e:
+                self.logger.error(f"보안 정책 다시 로드 실패: {e}")
+                return False
+            self._policy = policy
+            self._rejected_mtime = None
+            self.last_error = None
+            subscribers = list(self._subscribers)
+        self.logger.info(f"보안 정책을 다시 로드했습니다 (버전 {policy.version})")
+        for callback in subscribers:
+            try:
+                callback(policy)
+            except Exception as e:
+                self.logger.error(f"정책 변경 구독자 처리 중 오류 발생: {e}")
+        return True
+
+    def subscribe(self, callback: Callable[[SecurityPolicy], None]):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[SecurityPolicy], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+_default_store: Optional[PolicyStore] = None
+_default_store_lock = Lock()
+
+
+def get_policy_store() -> PolicyStore:
+    """모든 컴포넌트가 공유하는 보안 정책 로더"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PolicyStore()
+        return _default_store
+
+
+def get_security_policy() -> SecurityPolicy:
+    """공유 보안 정책의 현재 버전"""
+    return get_policy_store().current
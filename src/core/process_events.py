@@ -0,0 +1,180 @@
+import os
+import sys
+import time
+from typing import Callable, Optional, Set
+from threading import Event, Thread
+import psutil
+from .logger import Logger
+from .process_snapshot import ProcessInfo
+
+try:
+    import pythoncom
+    import win32com.client
+except ImportError:
+    pythoncom = None
+    win32com = None
+
+
+class ProcessStartEvent:
+    """프로세스 시작 알림"""
+
+    __slots__ = ('info', 'detected_at', 'source')
+
+    def __init__(self, info: ProcessInfo, detected_at: float, source: str):
+        self.info = info
+        self.detected_at = detected_at
+        self.source = source
+
+    @property
+    def latency(self) -> float:
+        """프로세스 생성부터 감지까지 걸린 시간 (초)"""
+        if not self.info.create_time:
+            return 0.0
+        return max(0.0, self.detected_at - self.info.create_time)
+
+
+class ProcessEventSource:
+    """프로세스 시작 이벤트 소스 인터페이스
+
+    start()에 전달된 callback은 소스의 감시 스레드에서 호출됩니다.
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self.logger = Logger('process_events')
+        self._callback: Optional[Callable[[ProcessStartEvent], None]] = None
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return False
+
+    def start(self, callback: Callable[[ProcessStartEvent], None]) -> bool:
+        if self._thread and self._thread.is_alive():
+            return False
+        self._callback = callback
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run_safe, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run_safe(self):
+        try:
+            self._run()
+        except Exception as e:
+            self.logger.error(f"프로세스 이벤트 소스 오류 ({self.name}): {e}")
+
+    def _run(self):
+        raise NotImplementedError
+
+    def _emit(self, pid: int, name: str, create_time: Optional[float] = None, ppid: int = 0):
+        detected_at = time.time()
+        if create_time is None:
+            try:
+                create_time = psutil.Process(pid).create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                create_time = 0.0
+        event = ProcessStartEvent(ProcessInfo(pid, name, create_time, ppid), detected_at, self.name)
+        try:
+            self._callback(event)
+        except Exception as e:
+            self.logger.error(f"프로세스 이벤트 처리 중 오류 발생: {e}")
+
+
+class WmiProcessEventSource(ProcessEventSource):
+    """Windows: WMI Win32_ProcessStartTrace 알림 (관리자 권한 필요)"""
+
+    name = 'wmi'
+
+    def __init__(self, poll_timeout_ms: int = 500):
+        super().__init__()
+        self.poll_timeout_ms = poll_timeout_ms
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform == 'win32' and pythoncom is not None
+
+    def _run(self):
+        pythoncom.CoInitialize()
+        try:
+            wmi = win32com.client.GetObject('winmgmts:')
+            watcher = wmi.ExecNotificationQuery('SELECT * FROM Win32_ProcessStartTrace')
+            while not self._stop_event.is_set():
+                try:
+                    event = watcher.NextEvent(self.poll_timeout_ms)
+                except pythoncom.com_error:
+                    # 제한 시간 안에 이벤트 없음 (wbemErrTimedOut)
+                    continue
+                self._emit(int(event.ProcessID), str(event.ProcessName), ppid=int(event.ParentProcessID))
+        finally:
+            pythoncom.CoUninitialize()
+
+
+class ProcDirEventSource(ProcessEventSource):
+    """Linux: /proc 디렉터리 항목 비교로 새 프로세스 감지
+
+    매 주기 /proc 목록만 읽고, 새로 나타난 PID에 대해서만 stat을 읽으므로
+    기존 프로세스 수와 무관하게 가볍습니다.
+    """
+
+    name = 'procfs'
+
+    def __init__(self, interval: float = 0.1, proc_root: str = '/proc'):
+        super().__init__()
+        self.interval = interval
+        self.proc_root = proc_root
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self._boot_time = psutil.boot_time()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform.startswith('linux') and os.path.isdir('/proc')
+
+    def _list_pids(self) -> Set[int]:
+        return {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+
+    def _read_stat(self, pid: int):
+        """(이름, 상위 PID, 생성 시각) - 이미 종료되었거나 내용이 잘렸으면 None"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'stat'), 'rb') as f:
+                data = f.read().decode('utf-8', 'replace')
+            # comm 필드에 공백/괄호가 포함될 수 있으므로 마지막 ')' 기준으로 분리
+            name = data[data.index('(') + 1:data.rindex(')')]
+            fields = data[data.rindex(')') + 2:].split()
+            ppid = int(fields[1])
+            create_time = self._boot_time + int(fields[19]) / self._clock_ticks
+        except (OSError, ValueError, IndexError):
+            # 읽는 도중 종료되면 비어 있거나 잘린 내용이 올 수 있음
+            return None
+        return name, ppid, create_time
+
+    def _run(self):
+        known = self._list_pids()
+        while not self._stop_event.wait(self.interval):
+            current = self._list_pids()
+            for pid in sorted(current - known):
+                stat = self._read_stat(pid)
+                if stat is not None:
+                    name, ppid, create_time = stat
+                    self._emit(pid, name, create_time, ppid)
+            known = current
+
+
+def create_process_event_source() -> Optional[ProcessEventSource]:
+    """운영체제 알림 기반 이벤트 소스 (사용할 수 없으면 None: 폴링으로 대체)"""
+    for source_class in (WmiProcessEventSource, ProcDirEventSource):
+        if source_class.is_available():
+            return source_class()
+    return None
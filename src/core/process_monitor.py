@@ -1,24 +1,74 @@
 import psutil
 import logging
 import time
-from typing import List, Dict, Optional
-from threading import Thread, Event
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+from threading import Thread, Event, Lock
 from .logger import Logger
+from .process_terminator import ProcessTerminator
+from .respawn_detector import RespawnDetector
+from .scheduler import ProbeStats
+from .process_events import ProcessEventSource, ProcessStartEvent, create_process_event_source
+from .process_rules import ProcessMatcher, ProcessRule, get_process_matcher
+from .process_snapshot import (ProcessDiff, ProcessInfo, ProcessKey, ProcessSnapshot, ProcessSnapshotProvider,
+                               get_process_snapshot_provider)
+
+# 시작 알림으로 처리한 프로세스 기록 (폴링 경로의 중복 집계 방지)
+HANDLED_EVENT_LIMIT = 4096
+# 알림과 스냅샷의 생성 시각 차이 허용 범위 (초)
+HANDLED_CREATE_TIME_TOLERANCE = 1.0
 
 class ProcessMonitor:
-    def __init__(self):
+    def __init__(self, process_provider: Optional[ProcessSnapshotProvider] = None,
+                 event_source: Optional[ProcessEventSource] = None, use_events: bool = True,
+                 matcher: Optional[ProcessMatcher] = None):
         self.logger = Logger('process_monitor')
-        self.target_processes = {
-            'EXCEL.EXE': 'Microsoft Excel',
-            'WINWORD.EXE': 'Microsoft Word',
-            'POWERPNT.EXE': 'Microsoft PowerPoint',
-            'MSACCESS.EXE': 'Microsoft Access',
-            'OUTLOOK.EXE': 'Microsoft Outlook'
-        }
+        self.process_provider = process_provider or get_process_snapshot_provider()
+        # 대상 프로세스 규칙 (지정하지 않으면 공유 보안 정책의 process_rules를 따름)
+        self._matcher = matcher
+
+        # 프로세스 시작 알림 (사용할 수 없으면 폴링만 사용)
+        if event_source is None and use_events:
+            event_source = create_process_event_source()
+        self.event_source = event_source
         self.monitoring = False
         self.stop_event = Event()
         self.monitor_thread: Optional[Thread] = None
 
+        # 분류가 끝난 대상 프로세스 테이블 ((pid, create_time) -> (ProcessInfo, 일치한 규칙))
+        # 스냅샷 변경 사항으로 새로 나타난 프로세스만 분류하고 종료된 항목은 제거
+        self._target_table: Dict[ProcessKey, Tuple[ProcessInfo, ProcessRule]] = {}
+        self._table_lock = Lock()
+        self._table_attached = False
+        # 테이블 분류에 사용한 매처와 마지막으로 반영한 스냅샷 세대
+        self._table_matcher: Optional[ProcessMatcher] = None
+        self._table_generation = 0
+        # 대상 프로세스 테이블이 바뀔 때마다 증가 (대상이 아닌 프로세스의 변경은 무시)
+        self.target_generation = 0
+        self.classified_count = 0
+
+        # 대상 프로세스를 한 번에 종료 (3초 대기 후 강제 종료)
+        self.terminator = ProcessTerminator(timeout=3.0, logger=self.logger)
+
+        # 반복 실행 감지 시 짧은 간격으로 집중 감시
+        self.respawn_detector = RespawnDetector(logger=self.logger)
+        self.poll_interval = 1.0
+        self.storm_poll_interval = 0.2
+        # 시작 알림을 받는 동안에는 놓친 프로세스를 찾는 보조 점검만 수행
+        self.fallback_poll_interval = 10.0
+
+        # 감지 경로별 프로세스 생성 → 감지 지연 시간 통계
+        self.detection_stats: Dict[str, ProbeStats] = {}
+        self._stats_lock = Lock()
+        self._replaying = False
+        # 시작 알림으로 이미 집계한 프로세스 (pid -> 생성 시각)
+        self._handled_events: 'OrderedDict[int, float]' = OrderedDict()
+
+    @property
+    def matcher(self) -> ProcessMatcher:
+        """현재 프로세스 매처 (정책이 다시 로드되면 새 매처)"""
+        return self._matcher or get_process_matcher()
+
     def start_monitoring(self) -> bool:
         """프로세스 모니터링 시작"""
         if self.monitoring:
@@ -27,6 +77,9 @@ class ProcessMonitor:
 
         try:
             self.stop_event.clear()
+            self._attach_table()
+            if self.event_source is not None and self.event_source.start(self._on_process_event):
+                self.logger.info(f"프로세스 시작 알림 사용: {self.event_source.name}")
             self.monitor_thread = Thread(target=self._monitor_processes)
             self.monitor_thread.daemon = True
             self.monitor_thread.start()
@@ -45,8 +98,11 @@ class ProcessMonitor:
 
         try:
             self.stop_event.set()
+            if self.event_source is not None:
+                self.event_source.stop()
             if self.monitor_thread:
                 self.monitor_thread.join(timeout=5.0)
+            self._detach_table()
             self.monitoring = False
             self.logger.info("프로세스 모니터링이 중지되었습니다.")
             return True
@@ -59,62 +115,210 @@ class ProcessMonitor:
         while not self.stop_event.is_set():
             try:
                 self._check_and_terminate_processes()
-                time.sleep(1)  # 1초 간격으로 체크
+                self.respawn_detector.tick()
+                self.stop_event.wait(self._current_interval())
             except Exception as e:
                 self.logger.error(f"모니터링 중 오류 발생: {e}")
-                time.sleep(5)  # 오류 발생 시 5초 대기
+                self.stop_event.wait(5)  # 오류 발생 시 5초 대기
+
+    def _current_interval(self) -> float:
+        """반복 실행 중인 프로세스가 있으면 집중 감시 간격 사용"""
+        if self.respawn_detector.active_storms():
+            return self.storm_poll_interval
+        if self.event_source is not None and self.event_source.running:
+            return self.fallback_poll_interval
+        return self.poll_interval
+
+    def _attach_table(self):
+        """스냅샷 변경 사항 구독 시작 (현재 프로세스로 테이블 초기화)"""
+        with self._table_lock:
+            if self._table_attached:
+                return
+            self._table_attached = True
+            self._table_matcher = self.matcher
+        # 이미 실행 중이던 프로세스는 감지 지연 통계에서 제외
+        self._replaying = True
+        try:
+            self.process_provider.subscribe(self._on_process_diff, replay=True)
+        finally:
+            self._replaying = False
+
+    def _detach_table(self):
+        self.process_provider.unsubscribe(self._on_process_diff)
+        with self._table_lock:
+            self._table_attached = False
+            self._table_matcher = None
+            self._target_table.clear()
+            self.target_generation += 1
+
+    def _on_process_diff(self, diff: ProcessDiff):
+        """새로 나타난 프로세스만 분류하고 종료된 프로세스는 테이블에서 제거"""
+        with self._table_lock:
+            matcher = self._table_matcher or self.matcher
+            self._table_generation = diff.generation
+            changed = False
+            for info in diff.exited:
+                if self._target_table.pop(info.key, None) is not None:
+                    changed = True
+            for info in diff.started:
+                self.classified_count += 1
+                rule = matcher.match(info, diff.snapshot)
+                if rule is not None:
+                    self._target_table[info.key] = (info, rule)
+                    changed = True
+                    # 시작 알림으로 이미 집계한 프로세스는 테이블에만 추가 (종료 실패 시 폴링에서 다시 종료)
+                    if self._take_handled_event(info):
+                        continue
+                    matcher.record_hit(rule)
+                    if not self._replaying:
+                        self._record_detection('polling', time.time() - info.create_time)
+            if changed:
+                self.target_generation += 1
+
+    def _sync_rules(self, snapshot: ProcessSnapshot):
+        """정책이 다시 로드되어 매처가 바뀌었으면 현재 프로세스를 새 규칙으로 다시 분류"""
+        matcher = self.matcher
+        with self._table_lock:
+            if matcher is self._table_matcher:
+                return
+            # 더 최신 변경 사항이 이미 반영되었으면 다음 점검에서 다시 시도
+            if snapshot.generation < self._table_generation:
+                return
+            table = {}
+            for info in snapshot:
+                rule = matcher.match(info, snapshot)
+                if rule is not None:
+                    table[info.key] = (info, rule)
+            self._target_table = table
+            self._table_matcher = matcher
+            self._table_generation = snapshot.generation
+            self.target_generation += 1
+        self.logger.info(f"프로세스 규칙이 변경되어 대상 프로세스를 다시 분류했습니다 ({len(table)}개)")
+
+    def _on_process_event(self, event: ProcessStartEvent):
+        """시작 알림을 받은 대상 프로세스를 즉시 종료"""
+        info = event.info
+        # 아래 스냅샷 조회가 갱신을 일으켜 폴링 경로가 먼저 집계하지 않도록 미리 기록
+        with self._table_lock:
+            self._handled_events[info.pid] = info.create_time
+            self._handled_events.move_to_end(info.pid)
+            while len(self._handled_events) > HANDLED_EVENT_LIMIT:
+                self._handled_events.popitem(last=False)
+        rule = self.matcher.match(info, self.process_provider.snapshot())
+        if rule is None:
+            with self._table_lock:
+                if self._handled_events.get(info.pid) == info.create_time:
+                    del self._handled_events[info.pid]
+            return
+        self.matcher.record_hit(rule)
+        self._record_detection(event.source, event.latency)
+        self.terminate_process_trees([info])
+
+    def _take_handled_event(self, info: ProcessInfo) -> bool:
+        """시작 알림으로 이미 집계한 프로세스이면 기록을 지우고 True (_table_lock 안에서 호출)"""
+        create_time = self._handled_events.get(info.pid)
+        if create_time is None or abs(create_time - info.create_time) > HANDLED_CREATE_TIME_TOLERANCE:
+            return False
+        del self._handled_events[info.pid]
+        return True
+
+    def _record_detection(self, source: str, latency: float):
+        with self._stats_lock:
+            self.detection_stats.setdefault(source, ProbeStats()).record(max(0.0, latency), True)
+
+    def get_detection_stats(self) -> Dict[str, Dict]:
+        """감지 경로별 프로세스 생성 → 감지 지연 시간 통계 (초)"""
+        with self._stats_lock:
+            return {source: stats.as_dict() for source, stats in self.detection_stats.items()}
 
     def _check_and_terminate_processes(self):
         """VBA 관련 프로세스 확인 및 종료"""
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if proc.info['name'].upper() in self.target_processes:
-                    self._terminate_process(proc)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        self._attach_table()
+        # 스냅샷 갱신 시 변경 사항이 _on_process_diff로 전달됨
+        # 반복 실행 중에는 공유 갱신 주기보다 짧은 간격으로 다시 조회
+        max_age = None
+        if self.respawn_detector.active_storms():
+            max_age = min(self.storm_poll_interval, self.process_provider.refresh_interval)
+        snapshot = self.process_provider.snapshot(max_age=max_age)
+        self._sync_rules(snapshot)
+        with self._table_lock:
+            targets = [info for info, _ in self._target_table.values()]
+        if targets:
+            self.terminate_process_trees(targets)
 
-    def _terminate_process(self, process: psutil.Process):
-        """프로세스 종료"""
-        try:
-            process_name = process.info['name']
-            process.terminate()
-            process.wait(timeout=3)  # 3초 대기
-            self.logger.info(f"{self.target_processes[process_name.upper()]} 프로세스가 종료되었습니다.")
-        except psutil.TimeoutExpired:
-            try:
-                process.kill()  # 강제 종료
-                self.logger.warning(f"{self.target_processes[process_name.upper()]} 프로세스가 강제 종료되었습니다.")
-            except psutil.NoSuchProcess:
-                pass
-        except Exception as e:
-            self.logger.error(f"프로세스 종료 실패: {e}")
+    def terminate_process_trees(self, targets: List[ProcessInfo]) -> Dict:
+        """대상 프로세스와 모든 하위 프로세스를 함께 종료
+
+        하위 프로세스는 스냅샷 한 번으로 수집하고, 반복 실행 중인 실행 파일은
+        개별 로그 대신 RespawnDetector의 요약 로그만 남깁니다.
+        """
+        snapshot = self.process_provider.snapshot()
+        processes = []
+        root_of: Dict[int, ProcessInfo] = {}
+        for info in targets:
+            for member in [info] + snapshot.descendants([info]):
+                if member.pid in root_of:
+                    continue
+                proc = self.process_provider.get_process(member)
+                if proc is None:
+                    continue
+                if member is info:
+                    rule = self.matcher.match(info, snapshot)
+                    label = rule.display_name if rule is not None else info.name
+                else:
+                    label = f"{member.name} (상위: {info.name})"
+                processes.append((proc, label))
+                root_of[member.pid] = info
+
+        quiet = bool(self.respawn_detector.active_storms())
+        result = self.terminator.terminate(processes, quiet=quiet)
+
+        storms = set()
+        for pid, _ in result['terminated'] + result['killed']:
+            root = root_of.get(pid)
+            if root is not None and root.pid == pid:
+                parent = snapshot.parent(root)
+                if self.respawn_detector.record_kill(root.name, parent.name if parent else None):
+                    storms.add(root.pid)
+
+        # 반복 실행 중인 트리는 개별 로그 생략 (요약 로그로 대체)
+        for pid, name in result['terminated']:
+            if root_of.get(pid) is None or root_of[pid].pid not in storms:
+                self.logger.info(f"{name} 프로세스가 종료되었습니다. (PID: {pid})")
+        for pid, name in result['killed']:
+            if root_of.get(pid) is None or root_of[pid].pid not in storms:
+                self.logger.warning(f"{name} 프로세스가 강제 종료되었습니다. (PID: {pid})")
+        return result
+
+    def terminate_processes(self, processes: List[Tuple[psutil.Process, str]]) -> Dict:
+        """프로세스 일괄 종료 (신호 전송 → 함께 대기 → 남은 프로세스 강제 종료)"""
+        result = self.terminator.terminate(processes)
+        for pid, name in result['terminated']:
+            self.logger.info(f"{name} 프로세스가 종료되었습니다. (PID: {pid})")
+        for pid, name in result['killed']:
+            self.logger.warning(f"{name} 프로세스가 강제 종료되었습니다. (PID: {pid})")
+        return result
 
     def get_running_processes(self) -> List[Dict[str, str]]:
         """현재 실행 중인 VBA 관련 프로세스 목록 반환"""
         running_processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'create_time']):
-            try:
-                if proc.info['name'].upper() in self.target_processes:
-                    running_processes.append({
-                        'name': self.target_processes[proc.info['name'].upper()],
-                        'pid': proc.info['pid'],
-                        'start_time': time.strftime('%Y-%m-%d %H:%M:%S', 
-                                                  time.localtime(proc.info['create_time']))
-                    })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        snapshot = self.process_provider.snapshot()
+        for info in snapshot:
+            rule = self.matcher.match(info, snapshot)
+            if rule is None:
                 continue
+            running_processes.append({
+                'name': rule.display_name,
+                'pid': info.pid,
+                'start_time': time.strftime('%Y-%m-%d %H:%M:%S', 
+                                          time.localtime(info.create_time))
+            })
         return running_processes
 
     def is_process_running(self, process_name: str) -> bool:
         """특정 프로세스가 실행 중인지 확인"""
         process_name = process_name.upper()
-        if process_name not in self.target_processes:
+        if not self.matcher.has_name(process_name):
             return False
 
-        for proc in psutil.process_iter(['name']):
-            try:
-                if proc.info['name'].upper() == process_name:
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        return False 
\ No newline at end of file
+        return bool(self.process_provider.snapshot().find([process_name])) 
\ No newline at end of file
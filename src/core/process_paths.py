@@ -0,0 +1,162 @@
+import os
+import sys
+from typing import Dict, List, Optional, Set
+from threading import Lock
+import psutil
+from .logger import Logger
+from .process_snapshot import (ProcessDiff, ProcessInfo, ProcessKey, ProcessSnapshotProvider,
+                               get_process_snapshot_provider)
+
+try:
+    import win32api
+    import win32con
+    import win32process
+except ImportError:
+    win32api = None
+    win32con = None
+    win32process = None
+
+# 재사용된 PID를 구분하기 위한 생성 시각 비교 허용 오차 (초)
+CREATE_TIME_TOLERANCE = 0.01
+
+
+class ExePathResolver:
+    """프로세스 실행 파일 경로 조회 인터페이스"""
+
+    def resolve(self, info: ProcessInfo) -> Optional[str]:
+        raise NotImplementedError
+
+
+class PsutilExePathResolver(ExePathResolver):
+    """psutil 기반 실행 파일 경로 조회 (Linux 등)"""
+
+    def resolve(self, info: ProcessInfo) -> Optional[str]:
+        try:
+            proc = psutil.Process(info.pid)
+            # 재사용된 PID의 경로를 반환하지 않도록 생성 시각 확인
+            if info.create_time and abs(proc.create_time() - info.create_time) > CREATE_TIME_TOLERANCE:
+                return None
+            return proc.exe() or None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+
+class Win32ExePathResolver(ExePathResolver):
+    """Windows: 해당 프로세스 핸들 하나만 열어 이미지 경로 조회"""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform == 'win32' and win32process is not None
+
+    def resolve(self, info: ProcessInfo) -> Optional[str]:
+        try:
+            handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ,
+                                          False, info.pid)
+        except Exception:
+            return None
+        try:
+            # 재사용된 PID의 경로를 반환하지 않도록 생성 시각 확인
+            if info.create_time:
+                created = win32process.GetProcessTimes(handle)['CreationTime']
+                created = created.timestamp() if hasattr(created, 'timestamp') else float(created)
+                if abs(created - info.create_time) > CREATE_TIME_TOLERANCE:
+                    return None
+            return win32process.GetModuleFileNameEx(handle, 0) or None
+        except Exception:
+            return None
+        finally:
+            win32api.CloseHandle(handle)
+
+
+class FakeExePathResolver(ExePathResolver):
+    """테스트용 PID별 경로 사전"""
+
+    def __init__(self, paths: Optional[Dict[int, str]] = None):
+        self.paths = dict(paths or {})
+        self.resolve_count = 0
+
+    def resolve(self, info: ProcessInfo) -> Optional[str]:
+        self.resolve_count += 1
+        return self.paths.get(info.pid)
+
+
+def create_exe_path_resolver() -> ExePathResolver:
+    if Win32ExePathResolver.is_available():
+        return Win32ExePathResolver()
+    return PsutilExePathResolver()
+
+
+_UNRESOLVED = object()
+
+
+class ProcessPathIndex:
+    """PID → 실행 파일 경로 색인
+
+    프로세스 스냅샷 변경 사항을 구독하여 시작/종료된 프로세스만 반영하고,
+    이름(대문자) → 프로세스 역색인을 함께 유지합니다. 경로는 처음 조회할 때
+    프로세스당 한 번만 확인하여 (pid, create_time)별로 보관합니다.
+    """
+
+    def __init__(self, process_provider: Optional[ProcessSnapshotProvider] = None,
+                 resolver: Optional[ExePathResolver] = None):
+        self.logger = Logger('process_paths')
+        self.process_provider = process_provider or get_process_snapshot_provider()
+        self.resolver = resolver or create_exe_path_resolver()
+        self._lock = Lock()
+        self._by_pid: Dict[int, ProcessInfo] = {}
+        self._by_name: Dict[str, Dict[ProcessKey, ProcessInfo]] = {}
+        self._paths: Dict[ProcessKey, object] = {}
+        self.process_provider.subscribe(self._on_process_diff, replay=True)
+
+    def close(self):
+        self.process_provider.unsubscribe(self._on_process_diff)
+        with self._lock:
+            self._by_pid.clear()
+            self._by_name.clear()
+            self._paths.clear()
+
+    def _on_process_diff(self, diff: ProcessDiff):
+        with self._lock:
+            for info in diff.exited:
+                if self._by_pid.get(info.pid) is info:
+                    del self._by_pid[info.pid]
+                processes = self._by_name.get(info.upper_name)
+                if processes is not None:
+                    processes.pop(info.key, None)
+                    if not processes:
+                        del self._by_name[info.upper_name]
+                self._paths.pop(info.key, None)
+            for info in diff.started:
+                self._by_pid[info.pid] = info
+                self._by_name.setdefault(info.upper_name, {})[info.key] = info
+
+    def _path_of(self, info: ProcessInfo) -> Optional[str]:
+        with self._lock:
+            path = self._paths.get(info.key, _UNRESOLVED)
+        if path is not _UNRESOLVED:
+            return path
+        path = self.resolver.resolve(info)
+        with self._lock:
+            # 조회 중 종료된 프로세스는 보관하지 않음
+            if self._by_pid.get(info.pid) is info:
+                self._paths[info.key] = path
+        return path
+
+    def get_path(self, pid: int) -> Optional[str]:
+        """PID의 실행 파일 경로 (없거나 조회할 수 없으면 None)"""
+        self.process_provider.snapshot()
+        with self._lock:
+            info = self._by_pid.get(pid)
+        return self._path_of(info) if info is not None else None
+
+    def get_paths(self, process_name: str) -> Set[str]:
+        """이름이 일치하는 실행 중인 프로세스들의 실행 파일 경로 집합"""
+        self.process_provider.snapshot()
+        with self._lock:
+            processes: List[ProcessInfo] = list(self._by_name.get(process_name.upper(), {}).values())
+        paths = set()
+        for info in processes:
+            path = self._path_of(info)
+            if path:
+                paths.add(os.path.normpath(path))
+        return paths
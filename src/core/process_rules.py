@@ -0,0 +1,189 @@
+import fnmatch
+import re
+from typing import Dict, Iterable, List, Optional
+from threading import Lock
+import psutil
+from .process_paths import CREATE_TIME_TOLERANCE
+from .process_snapshot import ProcessInfo, ProcessSnapshot
+
+# security_policy.json에 process_rules가 없을 때 사용하는 기본 규칙
+DEFAULT_PROCESS_RULES = [
+    {"name": "excel", "display_name": "Microsoft Excel", "process_name": "EXCEL.EXE"},
+    {"name": "word", "display_name": "Microsoft Word", "process_name": "WINWORD.EXE"},
+    {"name": "powerpoint", "display_name": "Microsoft PowerPoint", "process_name": "POWERPNT.EXE"},
+    {"name": "access", "display_name": "Microsoft Access", "process_name": "MSACCESS.EXE"},
+    {"name": "outlook", "display_name": "Microsoft Outlook", "process_name": "OUTLOOK.EXE"}
+]
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class ProcessRule:
+    """컴파일된 프로세스 매칭 규칙
+
+    지정된 조건(process_name, parent_name, exe_path, cmdline_contains)을 모두
+    만족해야 일치합니다. 이름 목록은 대문자 집합으로, exe 경로 와일드카드는
+    정규식으로 한 번만 변환합니다.
+    """
+
+    __slots__ = ('name', 'display_name', 'process_names', 'parent_names',
+                 'exe_pattern', 'cmdline_fragments', 'hits')
+
+    def __init__(self, rule: Dict):
+        self.process_names = frozenset(name.upper() for name in _as_list(rule.get('process_name')))
+        self.parent_names = frozenset(name.upper() for name in _as_list(rule.get('parent_name')))
+        exe_paths = _as_list(rule.get('exe_path'))
+        self.exe_pattern = None
+        if exe_paths:
+            # 경로 구분자는 '/'로 통일하여 비교
+            pattern = '|'.join(fnmatch.translate(path.replace('\\', '/')) for path in exe_paths)
+            self.exe_pattern = re.compile(pattern, re.IGNORECASE)
+        self.cmdline_fragments = tuple(fragment.lower() for fragment in _as_list(rule.get('cmdline_contains')))
+        if not (self.process_names or self.parent_names or self.exe_pattern or self.cmdline_fragments):
+            raise ValueError(f"프로세스 규칙에 조건이 없습니다: {rule}")
+
+        first_name = next(iter(sorted(self.process_names)), '')
+        self.name = rule.get('name') or first_name or 'rule'
+        self.display_name = rule.get('display_name') or first_name or self.name
+        self.hits = 0
+
+    @property
+    def needs_process_access(self) -> bool:
+        return self.exe_pattern is not None or bool(self.cmdline_fragments)
+
+
+class _LazyProcessAttrs:
+    """비용이 큰 속성(exe, cmdline)을 처음 필요할 때 한 번만 조회"""
+
+    __slots__ = ('pid', 'create_time', '_proc', '_exe', '_cmdline')
+
+    _MISSING = object()
+
+    def __init__(self, pid: int, create_time: float = 0.0):
+        self.pid = pid
+        self.create_time = create_time
+        self._proc = None
+        self._exe = self._MISSING
+        self._cmdline = self._MISSING
+
+    def _process(self) -> psutil.Process:
+        if self._proc is None:
+            proc = psutil.Process(self.pid)
+            # 재사용된 PID의 속성으로 다른 프로세스의 규칙이 일치하지 않도록 생성 시각 확인
+            if self.create_time and abs(proc.create_time() - self.create_time) > CREATE_TIME_TOLERANCE:
+                raise psutil.NoSuchProcess(self.pid)
+            self._proc = proc
+        return self._proc
+
+    @property
+    def exe(self) -> Optional[str]:
+        if self._exe is self._MISSING:
+            try:
+                self._exe = self._process().exe()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._exe = None
+        return self._exe
+
+    @property
+    def cmdline(self) -> Optional[str]:
+        if self._cmdline is self._MISSING:
+            try:
+                self._cmdline = ' '.join(self._process().cmdline()).lower()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._cmdline = None
+        return self._cmdline
+
+
+class ProcessMatcher:
+    """규칙 집합을 하나로 컴파일한 프로세스 매처
+
+    이름 조건이 있는 규칙은 대문자 이름 사전으로 색인하여, 대부분의 프로세스는
+    사전 조회 한 번으로 제외됩니다. 상위 프로세스 이름(스냅샷 안에서 조회)을
+    먼저 확인하고, exe 경로와 명령줄은 그 후보 규칙에 필요할 때만 조회합니다.
+    """
+
+    def __init__(self, rules: Iterable[Dict]):
+        self.rules: List[ProcessRule] = [ProcessRule(rule) for rule in rules]
+        self._by_name: Dict[str, List[ProcessRule]] = {}
+        self._unindexed: List[ProcessRule] = []
+        for rule in self.rules:
+            if rule.process_names:
+                for name in rule.process_names:
+                    self._by_name.setdefault(name, []).append(rule)
+            else:
+                self._unindexed.append(rule)
+        self._hits_lock = Lock()
+
+    @property
+    def process_names(self) -> frozenset:
+        """이름 조건에 등장하는 모든 프로세스 이름 (대문자)"""
+        return frozenset(self._by_name)
+
+    def has_name(self, process_name: str) -> bool:
+        return process_name.upper() in self._by_name
+
+    def match(self, info: ProcessInfo, snapshot: Optional[ProcessSnapshot] = None) -> Optional[ProcessRule]:
+        """처음으로 일치하는 규칙 (없으면 None)"""
+        candidates = self._by_name.get(info.upper_name)
+        if candidates is None:
+            if not self._unindexed:
+                return None
+            candidates = self._unindexed
+        elif self._unindexed:
+            candidates = candidates + self._unindexed
+
+        attrs = None
+        for rule in candidates:
+            if rule.process_names and info.upper_name not in rule.process_names:
+                continue
+            if rule.parent_names:
+                parent = snapshot.parent(info) if snapshot is not None else None
+                if parent is None or parent.upper_name not in rule.parent_names:
+                    continue
+            if rule.needs_process_access:
+                if attrs is None:
+                    attrs = _LazyProcessAttrs(info.pid, info.create_time)
+                if rule.exe_pattern is not None:
+                    exe = attrs.exe
+                    if exe is None or not rule.exe_pattern.match(exe.replace('\\', '/')):
+                        continue
+                if rule.cmdline_fragments:
+                    cmdline = attrs.cmdline
+                    if cmdline is None or not all(f in cmdline for f in rule.cmdline_fragments):
+                        continue
+            return rule
+        return None
+
+    def record_hit(self, rule: ProcessRule):
+        """규칙 일치 횟수 기록 (새로 분류된 프로세스마다 한 번)"""
+        with self._hits_lock:
+            rule.hits += 1
+
+    def filter(self, processes: Iterable[ProcessInfo],
+               snapshot: Optional[ProcessSnapshot] = None) -> List[ProcessInfo]:
+        """규칙과 일치하는 프로세스 목록"""
+        return [info for info in processes if self.match(info, snapshot) is not None]
+
+    def get_hit_counts(self) -> Dict[str, int]:
+        """규칙별 일치 횟수"""
+        with self._hits_lock:
+            return {rule.name: rule.hits for rule in self.rules}
+
+
+def load_process_rules(policy: Optional[Dict] = None) -> ProcessMatcher:
+    """보안 정책의 process_rules로 매처 생성 (policy가 없으면 공유 정책의 매처)"""
+    if policy is None:
+        return get_process_matcher()
+    return ProcessMatcher(policy.get('process_rules') or DEFAULT_PROCESS_RULES)
+
+
+def get_process_matcher() -> ProcessMatcher:
+    """모든 컴포넌트가 공유하는 프로세스 매처 (정책이 다시 로드되면 새 매처)"""
+    from .policy import get_security_policy
+    return get_security_policy().process_matcher
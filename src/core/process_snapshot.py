@@ -0,0 +1,311 @@
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from threading import Event, Lock, RLock, Thread
+import psutil
+from .logger import Logger
+
+# (pid, create_time): PID 재사용과 구분되는 프로세스 식별자
+ProcessKey = Tuple[int, float]
+
+
+class ProcessInfo:
+    """프로세스 스냅샷 항목"""
+
+    __slots__ = ('pid', 'name', 'create_time', 'ppid', '_upper_name')
+
+    def __init__(self, pid: int, name: str, create_time: float, ppid: int = 0):
+        self.pid = pid
+        self.name = name or ''
+        self.create_time = create_time or 0.0
+        self.ppid = ppid or 0
+        self._upper_name: Optional[str] = None
+
+    @property
+    def key(self) -> ProcessKey:
+        return (self.pid, self.create_time)
+
+    @property
+    def upper_name(self) -> str:
+        """대문자 이름 (프로세스당 한 번만 계산)"""
+        if self._upper_name is None:
+            self._upper_name = self.name.upper()
+        return self._upper_name
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ProcessInfo) and self.key == other.key and self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"ProcessInfo(pid={self.pid}, name={self.name!r}, create_time={self.create_time})"
+
+
+class ProcessDiff:
+    """두 스냅샷 사이의 변경 사항"""
+
+    __slots__ = ('generation', 'started', 'exited', 'snapshot')
+
+    def __init__(self, generation: int, started: List[ProcessInfo], exited: List[ProcessInfo],
+                 snapshot: Optional['ProcessSnapshot'] = None):
+        self.generation = generation
+        self.started = started
+        self.exited = exited
+        self.snapshot = snapshot
+
+    def __bool__(self) -> bool:
+        return bool(self.started or self.exited)
+
+
+class ProcessSnapshot:
+    """특정 시점의 프로세스 테이블 (읽기 전용으로 사용)"""
+
+    __slots__ = ('generation', 'timestamp', 'processes', '_children', '_by_pid')
+
+    def __init__(self, generation: int, timestamp: float, processes: Dict[ProcessKey, ProcessInfo]):
+        self.generation = generation
+        self.timestamp = timestamp
+        self.processes = processes
+        self._children: Optional[Dict[int, List[ProcessInfo]]] = None
+        self._by_pid: Optional[Dict[int, ProcessInfo]] = None
+
+    def __iter__(self):
+        return iter(self.processes.values())
+
+    def __len__(self) -> int:
+        return len(self.processes)
+
+    def find(self, names: Iterable[str]) -> List[ProcessInfo]:
+        """이름(대소문자 무시)이 일치하는 프로세스 목록"""
+        names = {name.upper() for name in names}
+        return [info for info in self.processes.values() if info.upper_name in names]
+
+    def get(self, pid: int) -> Optional[ProcessInfo]:
+        """PID로 프로세스 조회 (인덱스는 처음 조회 시 한 번만 생성)"""
+        if self._by_pid is None:
+            self._by_pid = {info.pid: info for info in self.processes.values()}
+        return self._by_pid.get(pid)
+
+    def parent(self, info: ProcessInfo) -> Optional[ProcessInfo]:
+        """상위 프로세스 (PID가 재사용된 경우 None)"""
+        parent = self.get(info.ppid) if info.ppid else None
+        if parent is None or parent.pid == info.pid or parent.create_time > info.create_time:
+            return None
+        return parent
+
+    def descendants(self, roots: Iterable[ProcessInfo]) -> List[ProcessInfo]:
+        """roots의 모든 하위 프로세스 (스냅샷 한 번으로 전체 트리 수집)"""
+        if self._children is None:
+            children: Dict[int, List[ProcessInfo]] = {}
+            for info in self.processes.values():
+                children.setdefault(info.ppid, []).append(info)
+            self._children = children
+
+        stack = list(roots)
+        seen = {info.key for info in stack}
+        result = []
+        while stack:
+            parent = stack.pop()
+            for child in self._children.get(parent.pid, ()):
+                # 부모보다 먼저 생성된 프로세스는 재사용된 PID를 가리키는 것
+                if child.key in seen or child.create_time < parent.create_time:
+                    continue
+                seen.add(child.key)
+                result.append(child)
+                stack.append(child)
+        return result
+
+
+class ProcessSource:
+    """프로세스 테이블 조회 인터페이스"""
+
+    def scan(self) -> Dict[ProcessKey, ProcessInfo]:
+        raise NotImplementedError
+
+
+class PsutilProcessSource(ProcessSource):
+    """psutil 기반 프로세스 테이블 조회"""
+
+    def scan(self) -> Dict[ProcessKey, ProcessInfo]:
+        processes = {}
+        for proc in psutil.process_iter(['pid', 'name', 'create_time', 'ppid']):
+            try:
+                info = proc.info
+                entry = ProcessInfo(info['pid'], info['name'], info['create_time'], info['ppid'])
+                processes[entry.key] = entry
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return processes
+
+
+class FakeProcessSource(ProcessSource):
+    """테스트용 가상 프로세스 테이블"""
+
+    def __init__(self, processes: Optional[Iterable[ProcessInfo]] = None):
+        self._lock = Lock()
+        self._processes: Dict[ProcessKey, ProcessInfo] = {}
+        self.scan_count = 0
+        for info in processes or []:
+            self._processes[info.key] = info
+
+    def add(self, pid: int, name: str, create_time: Optional[float] = None, ppid: int = 0) -> ProcessInfo:
+        info = ProcessInfo(pid, name, time.time() if create_time is None else create_time, ppid)
+        with self._lock:
+            self._processes[info.key] = info
+        return info
+
+    def remove(self, pid: int):
+        with self._lock:
+            for key in [key for key in self._processes if key[0] == pid]:
+                del self._processes[key]
+
+    def set_processes(self, processes: Iterable[ProcessInfo]):
+        with self._lock:
+            self._processes = {info.key: info for info in processes}
+
+    def scan(self) -> Dict[ProcessKey, ProcessInfo]:
+        with self._lock:
+            self.scan_count += 1
+            return dict(self._processes)
+
+
+class ProcessSnapshotProvider:
+    """컴포넌트들이 공유하는 프로세스 스냅샷 서비스
+
+    refresh_interval 이내의 조회는 마지막 스냅샷을 재사용하므로, 여러 컴포넌트가
+    동시에 조회해도 프로세스 테이블은 주기당 한 번만 조회됩니다. 테이블이 바뀔 때마다
+    generation이 증가하고, 구독자는 변경 사항(ProcessDiff)을 전달받습니다.
+    """
+
+    def __init__(self, source: Optional[ProcessSource] = None, refresh_interval: float = 1.0):
+        self.logger = Logger('process_snapshot')
+        self.source = source or PsutilProcessSource()
+        self.refresh_interval = refresh_interval
+        self.scan_count = 0
+
+        # 구독자 호출까지 잠금 안에서 수행하여 변경 사항 전달 순서를 보장
+        self._lock = RLock()
+        self._snapshot = ProcessSnapshot(0, 0.0, {})
+        self._scanned = False
+        self._subscribers: List[Callable[[ProcessDiff], None]] = []
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+
+    @property
+    def snapshot_age(self) -> float:
+        """마지막 조회 후 지난 시간 (초, 아직 조회 전이면 inf)"""
+        if not self._scanned:
+            return float('inf')
+        return time.monotonic() - self._snapshot.timestamp
+
+    def subscribe(self, callback: Callable[[ProcessDiff], None], replay: bool = False):
+        """변경 사항 구독
+
+        replay가 True이면 현재 스냅샷의 모든 프로세스를 시작된 것으로 먼저 전달하여,
+        구독자가 별도 조회 없이 초기 상태를 구성할 수 있게 합니다.
+        """
+        with self._lock:
+            if callback in self._subscribers:
+                return
+            self._subscribers.append(callback)
+            if replay and self._snapshot.processes:
+                callback(ProcessDiff(self._snapshot.generation, list(self._snapshot.processes.values()), [],
+                                     self._snapshot))
+
+    def unsubscribe(self, callback: Callable[[ProcessDiff], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def snapshot(self, max_age: Optional[float] = None) -> ProcessSnapshot:
+        """max_age(기본 refresh_interval)보다 오래된 경우에만 다시 조회"""
+        max_age = self.refresh_interval if max_age is None else max_age
+        self._refresh(max_age)
+        return self._snapshot
+
+    def refresh(self) -> ProcessDiff:
+        """프로세스 테이블을 다시 조회하고 구독자에게 변경 사항 전달"""
+        return self._refresh(None)
+
+    def _refresh(self, max_age: Optional[float]) -> ProcessDiff:
+        with self._lock:
+            if (max_age is not None and self._scanned
+                    and time.monotonic() - self._snapshot.timestamp <= max_age):
+                # 다른 스레드가 이미 갱신한 스냅샷 재사용
+                return ProcessDiff(self._snapshot.generation, [], [])
+            processes = self.source.scan()
+            self.scan_count += 1
+            previous = self._snapshot.processes
+            started = []
+            for key, info in processes.items():
+                known = previous.get(key)
+                if known is None:
+                    started.append(info)
+                else:
+                    # 이전 항목을 재사용하여 계산해 둔 값(대문자 이름 등)을 유지
+                    processes[key] = known
+            exited = [info for key, info in previous.items() if key not in processes]
+
+            generation = self._snapshot.generation + (1 if started or exited or not self._scanned else 0)
+            self._snapshot = ProcessSnapshot(generation, time.monotonic(), processes)
+            self._scanned = True
+            diff = ProcessDiff(generation, started, exited, self._snapshot)
+
+            if diff:
+                for callback in list(self._subscribers):
+                    try:
+                        callback(diff)
+                    except Exception as e:
+                        self.logger.error(f"스냅샷 구독자 처리 중 오류 발생: {e}")
+            return diff
+
+    def start(self) -> bool:
+        """refresh_interval 주기로 백그라운드 갱신 시작"""
+        if self._thread and self._thread.is_alive():
+            return False
+        self._stop_event.clear()
+        self._thread = Thread(target=self._refresh_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                if time.monotonic() - self._snapshot.timestamp >= self.refresh_interval:
+                    self.refresh()
+            except Exception as e:
+                self.logger.error(f"프로세스 스냅샷 갱신 중 오류 발생: {e}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def get_process(self, info: ProcessInfo) -> Optional[psutil.Process]:
+        """스냅샷 항목에 해당하는 psutil.Process (PID가 재사용되었으면 None)"""
+        try:
+            proc = psutil.Process(info.pid)
+            if info.create_time and abs(proc.create_time() - info.create_time) > 0.01:
+                return None
+            return proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+
+_default_provider: Optional[ProcessSnapshotProvider] = None
+_default_provider_lock = Lock()
+
+
+def get_process_snapshot_provider() -> ProcessSnapshotProvider:
+    """기본 공유 프로세스 스냅샷 서비스"""
+    global _default_provider
+    with _default_provider_lock:
+        if _default_provider is None:
+            _default_provider = ProcessSnapshotProvider()
+        return _default_provider
@@ -0,0 +1,85 @@
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import psutil
+from .logger import Logger
+
+
+class ProcessTerminator:
+    """여러 프로세스를 한 번에 종료
+
+    모든 프로세스에 종료 신호를 보낸 뒤 psutil.wait_procs로 함께 기다리고,
+    timeout 안에 끝나지 않은 프로세스만 kill()로 강제 종료합니다.
+    프로세스 수와 관계없이 전체 대기 시간은 최대 timeout + kill_timeout 입니다.
+    """
+
+    def __init__(self, timeout: float = 3.0, kill_timeout: float = 1.0,
+                 logger: Optional[Logger] = None):
+        self.timeout = timeout
+        self.kill_timeout = kill_timeout
+        self.logger = logger or Logger('process_terminator')
+
+    def terminate(self, targets: Sequence[Tuple[psutil.Process, str]],
+                  graceful: bool = True, quiet: bool = False) -> Dict:
+        """(프로세스, 표시 이름) 목록을 종료하고 단계별 결과 반환
+
+        graceful이 False이면 terminate() 단계 없이 바로 kill()합니다.
+        quiet이면 일괄 종료 요약을 debug 수준으로만 기록합니다.
+        """
+        result = {
+            'terminated': [],
+            'killed': [],
+            'failed': [],
+            'timings': {}
+        }
+        if not targets:
+            return result
+
+        labels = {proc.pid: label for proc, label in targets}
+        procs = [proc for proc, _ in targets]
+
+        # 1단계: 모든 프로세스에 신호 전송
+        start = time.perf_counter()
+        signalled = self._signal(procs, 'kill' if not graceful else 'terminate', labels, result)
+        result['timings']['signal'] = time.perf_counter() - start
+
+        # 2단계: 함께 대기
+        start = time.perf_counter()
+        gone, alive = psutil.wait_procs(signalled, timeout=self.timeout if graceful else self.kill_timeout)
+        result['timings']['wait'] = time.perf_counter() - start
+        (result['terminated'] if graceful else result['killed']).extend(
+            (proc.pid, labels[proc.pid]) for proc in gone)
+
+        # 3단계: 남은 프로세스 강제 종료
+        if alive and graceful:
+            start = time.perf_counter()
+            killed = self._signal(alive, 'kill', labels, result)
+            gone, alive = psutil.wait_procs(killed, timeout=self.kill_timeout)
+            result['timings']['kill'] = time.perf_counter() - start
+            result['killed'].extend((proc.pid, labels[proc.pid]) for proc in gone)
+
+        for proc in alive:
+            result['failed'].append((proc.pid, labels[proc.pid]))
+            self.logger.error(f"프로세스 종료 실패: {labels[proc.pid]} (PID: {proc.pid}) - 시간 초과")
+
+        timings = ', '.join(f"{stage} {duration:.3f}s" for stage, duration in result['timings'].items())
+        log = self.logger.debug if quiet else self.logger.info
+        log(
+            f"프로세스 일괄 종료: 대상 {len(procs)}개, 정상 종료 {len(result['terminated'])}개, "
+            f"강제 종료 {len(result['killed'])}개, 실패 {len(result['failed'])}개 ({timings})"
+        )
+        return result
+
+    def _signal(self, procs: List[psutil.Process], method: str, labels: Dict[int, str],
+                result: Dict) -> List[psutil.Process]:
+        """신호 전송에 성공한 프로세스 목록 반환 (이미 종료된 프로세스는 종료 처리)"""
+        signalled = []
+        for proc in procs:
+            try:
+                getattr(proc, method)()
+                signalled.append(proc)
+            except psutil.NoSuchProcess:
+                result['terminated'].append((proc.pid, labels[proc.pid]))
+            except Exception as e:
+                result['failed'].append((proc.pid, labels[proc.pid]))
+                self.logger.error(f"프로세스 종료 실패: {labels[proc.pid]} (PID: {proc.pid}) - {e}")
+        return signalled
@@ -0,0 +1,392 @@
+import codecs
+import re
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple, Union
+from .registry_backend import (REG_BINARY, REG_DWORD, REG_EXPAND_SZ, REG_MULTI_SZ, REG_QWORD, REG_SZ,
+                               value_type_of)
+
+REGEDIT5_HEADER = 'Windows Registry Editor Version 5.00'
+REGEDIT4_HEADER = 'REGEDIT4'
+
+# 한 줄 최대 길이 (regedit와 같이 hex 값은 80자 안에서 줄바꿈)
+LINE_WIDTH = 80
+
+_HEX_TYPE = re.compile(r'hex(?:\(([0-9a-fA-F]+)\))?:', re.IGNORECASE)
+
+
+class RegFileError(ValueError):
+    """.reg 파일 형식 오류 (line_number: 논리적 줄이 시작하는 줄 번호)"""
+
+    def __init__(self, message: str, line_number: int = 0):
+        super().__init__(f"{line_number}행: {message}" if line_number else message)
+        self.line_number = line_number
+
+
+class _Deleted:
+    """값 삭제 표시 ("이름"=-)"""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'DELETED'
+
+
+DELETED = _Deleted()
+
+RegValue = Union[Tuple[object, int], _Deleted]
+
+
+class RegSection:
+    """.reg 파일의 키 하나 ([키] 또는 [-키])와 그 아래 값들
+
+    values는 {값 이름: (값, 값 형식) 또는 DELETED}이며, 기본값(@)의 이름은 ''입니다.
+    """
+
+    __slots__ = ('key', 'delete', 'values')
+
+    def __init__(self, key: str, delete: bool = False, values: Optional[Dict[str, RegValue]] = None):
+        self.key = key
+        self.delete = delete
+        self.values: Dict[str, RegValue] = values if values is not None else {}
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, RegSection) and (self.key, self.delete, self.values)
+                == (other.key, other.delete, other.values))
+
+    def __repr__(self) -> str:
+        return f"RegSection({'-' if self.delete else ''}{self.key!r}, {len(self.values)} values)"
+
+
+# --- 값 인코딩 -------------------------------------------------------------
+
+def _encode_string(text: str) -> bytes:
+    return (text + '\0').encode('utf-16-le')
+
+
+def _decode_string(data: bytes) -> Optional[str]:
+    """NUL로 끝나는 UTF-16LE 문자열 (형식이 맞지 않으면 None)"""
+    if len(data) % 2 or not data.endswith(b'\0\0'):
+        return None
+    try:
+        text = data.decode('utf-16-le')
+    except UnicodeDecodeError:
+        return None
+    text = text[:-1]
+    return None if '\0' in text else text
+
+
+def _decode_multi_string(data: bytes) -> Optional[list]:
+    if data == b'\0\0':
+        return []
+    if len(data) % 2 or not data.endswith(b'\0\0\0\0'):
+        return None
+    try:
+        text = data.decode('utf-16-le')
+    except UnicodeDecodeError:
+        return None
+    return text[:-2].split('\0')
+
+
+def _empty_value(value_type: int):
+    """winreg가 데이터 없는 값에 돌려주는 None 대신 쓸 빈 값"""
+    return '' if value_type in (REG_SZ, REG_EXPAND_SZ) else b''
+
+
+def encode_value(value, value_type: int) -> bytes:
+    """레지스트리 값을 hex(...) 표기에 쓰는 원시 바이트로 변환"""
+    if value is None:
+        value = _empty_value(value_type)
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        return _encode_string(value)
+    if value_type == REG_MULTI_SZ:
+        return b'\0\0' if not value else ('\0'.join(value) + '\0\0').encode('utf-16-le')
+    if value_type == REG_DWORD:
+        return int(value).to_bytes(4, 'little')
+    if value_type == REG_QWORD:
+        return int(value).to_bytes(8, 'little')
+    raise TypeError(f"값 형식 {value_type}에 bytes가 아닌 값을 쓸 수 없습니다: {value!r}")
+
+
+def decode_value(data: bytes, value_type: int):
+    """hex(...) 원시 바이트를 winreg와 같은 파이썬 값으로 변환
+
+    형식에 맞지 않는 데이터(끝 NUL이 없는 문자열 등)는 손실 없이 bytes로 둡니다.
+    """
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        text = _decode_string(data)
+        return data if text is None else text
+    if value_type == REG_MULTI_SZ:
+        items = _decode_multi_string(data)
+        return data if items is None else items
+    if value_type == REG_DWORD and len(data) == 4:
+        return int.from_bytes(data, 'little')
+    if value_type == REG_QWORD and len(data) == 8:
+        return int.from_bytes(data, 'little')
+    return data
+
+
+# --- 읽기 ------------------------------------------------------------------
+
+def _parse_quoted(text: str, pos: int, line_number: int) -> Tuple[str, int]:
+    """pos의 따옴표 문자열을 읽어 (내용, 닫는 따옴표 다음 위치) 반환 (\\\\, \\" 처리)"""
+    if text[pos:pos + 1] != '"':
+        raise RegFileError("따옴표로 시작해야 합니다", line_number)
+    parts = []
+    pos += 1
+    start = pos
+    while True:
+        end = text.find('"', pos)
+        escape = text.find('\\', pos)
+        if end < 0:
+            raise RegFileError("닫는 따옴표가 없습니다", line_number)
+        if 0 <= escape < end:
+            parts.append(text[start:escape])
+            parts.append(text[escape + 1:escape + 2])
+            pos = start = escape + 2
+            continue
+        parts.append(text[start:end])
+        return ''.join(parts), end + 1
+
+
+def _parse_hex_bytes(text: str, line_number: int) -> bytes:
+    text = text.replace(' ', '').replace('\t', '').rstrip(',')
+    if not text:
+        return b''
+    try:
+        # regedit는 항상 두 자리로 쓰므로 대부분 fromhex 한 번으로 변환
+        return bytes.fromhex(text.replace(',', ' '))
+    except ValueError:
+        pass
+    try:
+        return bytes(int(part, 16) for part in text.split(','))
+    except ValueError:
+        raise RegFileError(f"잘못된 hex 값: {text[:40]}", line_number) from None
+
+
+def _parse_data(data: str, line_number: int) -> RegValue:
+    data = data.strip()
+    if data == '-':
+        return DELETED
+    if data.startswith('"'):
+        value, end = _parse_quoted(data, 0, line_number)
+        if data[end:].strip():
+            raise RegFileError("문자열 뒤에 다른 내용이 있습니다", line_number)
+        return value, REG_SZ
+    lower = data.lower()
+    if lower.startswith('dword:'):
+        try:
+            return int(data[6:], 16), REG_DWORD
+        except ValueError:
+            raise RegFileError(f"잘못된 dword 값: {data}", line_number) from None
+    if lower.startswith('qword:'):
+        try:
+            return int(data[6:], 16), REG_QWORD
+        except ValueError:
+            raise RegFileError(f"잘못된 qword 값: {data}", line_number) from None
+    match = _HEX_TYPE.match(data)
+    if match:
+        value_type = int(match.group(1), 16) if match.group(1) else REG_BINARY
+        raw = _parse_hex_bytes(data[match.end():], line_number)
+        return decode_value(raw, value_type), value_type
+    raise RegFileError(f"알 수 없는 값 형식: {data[:40]}", line_number)
+
+
+def _logical_lines(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    """\\로 이어지는 줄을 합친 (시작 줄 번호, 논리적 줄)"""
+    parts = []
+    start = 0
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip('\r\n')
+        if not parts:
+            start = line_number
+            line = line.lstrip('\ufeff')
+        else:
+            line = line.lstrip()
+        if line.endswith('\\') and not line.lstrip().startswith(('[', ';')):
+            parts.append(line[:-1])
+            continue
+        parts.append(line)
+        yield start, ''.join(parts)
+        parts = []
+    if parts:
+        yield start, ''.join(parts)
+
+
+def _open_text(source: str) -> TextIO:
+    """BOM으로 인코딩 판단 (UTF-16 BOM이 있으면 REGEDIT5, 없으면 UTF-8/ANSI)"""
+    with open(source, 'rb') as f:
+        head = f.read(4)
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return open(source, 'r', encoding='utf-16', newline='')
+    if head.startswith(codecs.BOM_UTF8):
+        return open(source, 'r', encoding='utf-8-sig', newline='')
+    return open(source, 'r', encoding='utf-8', errors='surrogateescape', newline='')
+
+
+def iter_reg_file(source: Union[str, TextIO],
+                  on_error: Optional[Callable[[RegFileError], None]] = None) -> Iterator[RegSection]:
+    """.reg 파일을 키 단위로 읽기
+
+    파일 전체를 메모리에 올리지 않고 키 하나([키]와 그 값들)씩 만들어 돌려주므로,
+    메모리 사용량은 가장 큰 키 하나의 크기로 제한됩니다. on_error를 지정하면 형식이
+    잘못된 줄을 건너뛰고 오류를 전달하며, 지정하지 않으면 RegFileError가 발생합니다.
+    """
+    stream = _open_text(source) if isinstance(source, str) else source
+    try:
+        section: Optional[RegSection] = None
+        for line_number, line in _logical_lines(stream):
+            text = line.strip()
+            if not text or text.startswith(';'):
+                continue
+            try:
+                if text.startswith('['):
+                    if not text.endswith(']'):
+                        raise RegFileError("키 줄은 ]로 끝나야 합니다", line_number)
+                    if section is not None:
+                        yield section
+                    key = text[1:-1]
+                    section = RegSection(key[1:], delete=True) if key.startswith('-') else RegSection(key)
+                    continue
+                if text in (REGEDIT5_HEADER, REGEDIT4_HEADER):
+                    continue
+                if section is None or section.delete:
+                    raise RegFileError("값이 키 밖에 있습니다", line_number)
+                if text.startswith('@'):
+                    name, end = '', 1
+                else:
+                    name, end = _parse_quoted(text, 0, line_number)
+                rest = text[end:].lstrip()
+                if not rest.startswith('='):
+                    raise RegFileError("= 가 없습니다", line_number)
+                section.values[name] = _parse_data(rest[1:], line_number)
+            except RegFileError as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+        if section is not None:
+            yield section
+    finally:
+        if isinstance(source, str):
+            stream.close()
+
+
+# --- 쓰기 ------------------------------------------------------------------
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _hex_lines(prefix: str, data: bytes) -> str:
+    """regedit와 같이 80자 안에서 ',\\'로 줄바꿈한 hex 표기"""
+    if not data:
+        return prefix
+    # 바이트마다 'xx,' 세 글자, 이어지는 줄은 두 칸 들여쓰기, 줄 끝의 \ 한 글자
+    text = data.hex(',')
+    count = max(1, (LINE_WIDTH - 1 - len(prefix)) // 3)
+    per_line = (LINE_WIDTH - 3) // 3
+    lines = []
+    position = 0
+    while position + count < len(data):
+        lines.append(prefix + text[position * 3:(position + count) * 3] + '\\')
+        position += count
+        count = per_line
+        prefix = '  '
+    lines.append(prefix + text[position * 3:])
+    return '\r\n'.join(lines)
+
+
+def format_value(name: str, value, value_type: Optional[int] = None) -> str:
+    """값 하나의 .reg 표기 ("이름"=... , 기본값은 @=...)"""
+    head = '@' if name == '' else _quote(name)
+    if value is DELETED:
+        return f'{head}=-'
+    if value_type is None:
+        value_type = value_type_of(value)
+    if value is None:
+        # 빈 REG_BINARY/REG_NONE 등은 winreg가 None으로 돌려줌
+        value = _empty_value(value_type)
+    if isinstance(value, (bytes, bytearray)):
+        pass
+    elif value_type == REG_SZ and '\0' not in value and '\r' not in value and '\n' not in value:
+        return f'{head}={_quote(value)}'
+    elif value_type == REG_DWORD and 0 <= value <= 0xFFFFFFFF:
+        return f'{head}=dword:{value:08x}'
+    data = encode_value(value, value_type)
+    tag = 'hex' if value_type == REG_BINARY else f'hex({value_type:x})'
+    return _hex_lines(f'{head}={tag}:', data)
+
+
+class RegFileWriter:
+    """.reg 파일 스트리밍 쓰기 (regedit와 같은 REGEDIT5 형식)
+
+    키와 값을 받는 대로 바로 기록하므로 내보내는 크기와 관계없이 메모리 사용량이
+    일정합니다. 줄바꿈은 CRLF이며, 파일 경로로 열면 BOM이 있는 UTF-16으로 저장합니다.
+    """
+
+    def __init__(self, stream: TextIO, header: bool = True):
+        self.stream = stream
+        self._owns_stream = False
+        self._in_key = False
+        if header:
+            self.stream.write(REGEDIT5_HEADER + '\r\n')
+
+    @classmethod
+    def open(cls, path: str, encoding: str = 'utf-16') -> 'RegFileWriter':
+        writer = cls(open(path, 'w', encoding=encoding, newline=''))
+        writer._owns_stream = True
+        return writer
+
+    def begin_key(self, key_path: str):
+        self.stream.write(f'\r\n[{key_path}]\r\n')
+        self._in_key = True
+
+    def delete_key(self, key_path: str):
+        self.stream.write(f'\r\n[-{key_path}]\r\n')
+        self._in_key = False
+
+    def write_value(self, name: str, value, value_type: Optional[int] = None):
+        if not self._in_key:
+            raise RegFileError("값을 쓰기 전에 begin_key를 호출해야 합니다")
+        self.stream.write(format_value(name, value, value_type) + '\r\n')
+
+    def write_separator(self):
+        """빈 줄 구분자 기록 (regedit와 같이 파일 끝에 빈 줄을 둠)"""
+        self.stream.write('\r\n')
+
+    def delete_value(self, name: str):
+        self.write_value(name, DELETED)
+
+    def write_section(self, section: RegSection):
+        if section.delete:
+            self.delete_key(section.key)
+            return
+        self.begin_key(section.key)
+        for name, value in section.values.items():
+            if value is DELETED:
+                self.delete_value(name)
+            else:
+                self.write_value(name, *value)
+
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+    def __enter__(self) -> 'RegFileWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_reg_file(path: str, sections: Iterable[RegSection], encoding: str = 'utf-16') -> int:
+    """키 목록을 .reg 파일로 저장 (기록한 키 수 반환)"""
+    count = 0
+    with RegFileWriter.open(path, encoding) as writer:
+        for section in sections:
+            writer.write_section(section)
+            count += 1
+        writer.write_separator()
+    return count
@@ -1,115 +1,92 @@
-import winreg
+import io
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Iterable
 import os
 from datetime import datetime
 import re
+import time
 from .logger import Logger, measure_time
+from .policy import get_security_policy
+from .registry_backend import REG_DWORD, RegistryBackend
+from .registry_pool import RegistryKeyPool, get_registry_pool
+from .office_keys import OfficeKeyIndex, get_office_key_index
+from .backup_store import BackupStore, TimeValue
+from .reg_file import DELETED, RegFileError, RegFileWriter, RegSection, iter_reg_file
+
+# 보안 키마다 기록하는 VBA 차단 값
+VBA_BLOCK_VALUES = {
+    'VBAWarnings': 2,  # 2: 모든 매크로 비활성화
+    'AccessVBOM': 0    # 0: VBA 프로젝트 액세스 비활성화
+}
 
 class RegistryManager:
-    def __init__(self):
+    def __init__(self, backend: Optional[RegistryBackend] = None, backup_path: Optional[str] = None,
+                 hive: str = 'HKEY_CURRENT_USER', pool: Optional[RegistryKeyPool] = None):
         self.logger = Logger('registry')
-        # VBA 관련 레지스트리 키
-        self.vba_keys = {
-            'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security': {
-                'VBAWarnings': 2,  # 2: 모든 매크로 비활성화
-                'AccessVBOM': 0    # 0: VBA 프로젝트 액세스 비활성화
-            },
-            'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Word\\Security': {
-                'VBAWarnings': 2,
-                'AccessVBOM': 0
-            },
-            'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\PowerPoint\\Security': {
-                'VBAWarnings': 2,
-                'AccessVBOM': 0
-            }
-        }
-        self.backup_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backups')
+        # 실제 레지스트리(winreg), 메모리, 오프라인 hive 중 하나
+        # 저장소나 풀을 지정하지 않으면 ChangeTracker 등과 키 핸들 풀을 공유
+        shared = backend is None and pool is None
+        if pool is None:
+            pool = RegistryKeyPool(backend) if backend is not None else get_registry_pool()
+        self.pool = pool
+        self.backend = self.pool.backend
+        # 대상 사용자 hive (HKEY_CURRENT_USER 또는 HKEY_USERS\<SID>)
+        self.hive = hive
+        # VBA 관련 레지스트리 키는 설치된 Office 버전/응용 프로그램 색인에서 구성
+        if shared and hive == 'HKEY_CURRENT_USER':
+            self.key_index = get_office_key_index()
+        else:
+            self.key_index = OfficeKeyIndex(self.pool, hives=(hive,))
+        self._vba_keys: Optional[Dict[str, Dict[str, int]]] = None
+        self._vba_keys_generation = -1
+        self._vba_keys_override: Optional[Dict[str, Dict[str, int]]] = None
+        self.backup_path = backup_path or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backups')
         os.makedirs(self.backup_path, exist_ok=True)
+        # 같은 사전 이미지는 한 번만 저장하는 내용 주소 기반 백업 저장소
+        self.backup_store = BackupStore(self.backup_path)
 
-    def _get_hive_and_path(self, key_path: str) -> Tuple[int, str]:
-        """
-        레지스트리 키 경로에서 hive와 나머지 경로를 분리
-        """
-        hive_map = {
-            'HKEY_CURRENT_USER': winreg.HKEY_CURRENT_USER,
-            'HKEY_LOCAL_MACHINE': winreg.HKEY_LOCAL_MACHINE,
-            'HKEY_CLASSES_ROOT': winreg.HKEY_CLASSES_ROOT,
-            'HKEY_USERS': winreg.HKEY_USERS
-        }
-        
-        parts = key_path.split('\\', 1)
-        if len(parts) != 2:
-            raise ValueError(f"Invalid registry path: {key_path}")
-            
-        hive_name, path = parts
-        if hive_name not in hive_map:
-            raise ValueError(f"Unknown registry hive: {hive_name}")
-            
-        return hive_map[hive_name], path
-
-    def _parse_reg_file(self, reg_file: str) -> Dict[str, Dict[str, int]]:
-        """
-        .reg 파일을 파싱하여 레지스트리 값 추출
-        """
-        registry_data = {}
-        current_key = None
-        
-        with open(reg_file, 'r', encoding='utf-16') as f:
-            for line in f:
-                line = line.strip()
-                
-                # 키 경로 파싱
-                if line.startswith('[') and line.endswith(']'):
-                    current_key = line[1:-1]
-                    registry_data[current_key] = {}
-                    continue
-                
-                # 값 파싱
-                if current_key and '=' in line:
-                    try:
-                        name, value = line.split('=', 1)
-                        name = name.strip('"')
-                        
-                        # dword 값 파싱
-                        if value.startswith('dword:'):
-                            hex_value = value[6:]
-                            registry_data[current_key][name] = int(hex_value, 16)
-                    except ValueError as e:
-                        self.logger.warning(f"Failed to parse line: {line}, Error: {str(e)}")
-                        continue
-        
-        return registry_data
+    @property
+    def vba_keys(self) -> Dict[str, Dict[str, int]]:
+        """{보안 키 경로: {값 이름: 차단 값}} (색인이 바뀔 때만 다시 구성)"""
+        if self._vba_keys_override is not None:
+            return self._vba_keys_override
+        entries = self.key_index.entries()
+        if self._vba_keys is None or self._vba_keys_generation != self.key_index.generation:
+            self._vba_keys = {entry.security_key: dict(VBA_BLOCK_VALUES) for entry in entries}
+            self._vba_keys_generation = self.key_index.generation
+        return self._vba_keys
+
+    @vba_keys.setter
+    def vba_keys(self, value: Optional[Dict[str, Dict[str, int]]]):
+        """대상 키를 직접 지정 (None이면 다시 색인 사용)"""
+        self._vba_keys_override = value
 
     @measure_time
     def backup_registry(self):
-        """현재 레지스트리 설정을 파일로 백업"""
+        """현재 레지스트리 설정을 백업 저장소에 저장 (직전 백업과 같으면 새로 저장하지 않음)"""
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_file = os.path.join(self.backup_path, f'vba_settings_{timestamp}.reg')
-            
-            lines = ['Windows Registry Editor Version 5.00\n']
-            for key_path, values in self.vba_keys.items():
-                hive, path = self._get_hive_and_path(key_path)
-                try:
-                    with winreg.OpenKey(hive, path, 0, winreg.KEY_READ) as key:
-                        lines.append(f'[{key_path}]\n')
-                        for value_name, _ in values.items():
-                            try:
-                                value, _ = winreg.QueryValueEx(key, value_name)
-                                if isinstance(value, int):
-                                    lines.append(f'"{value_name}"=dword:{value:08x}\n')
-                                else:
-                                    lines.append(f'"{value_name}"="{value}"\n')
-                            except WindowsError:
-                                self.logger.warning(f"Value {value_name} not found in {key_path}")
-                        lines.append('\n')
-                except WindowsError as e:
-                    self.logger.error(f"Error accessing registry key {key_path}: {e}")
-                    continue
-            with open(backup_file, 'w', encoding='utf-16') as f:
-                f.writelines(lines)
-            self.logger.info(f"Registry backup created: {backup_file}")
+            buffer = io.StringIO()
+            with RegFileWriter(buffer) as writer:
+                for key_path, values in self.vba_keys.items():
+                    try:
+                        current = self.pool.read_values(key_path, values)
+                    except FileNotFoundError:
+                        # 없던 키: 복원할 때 값을 지우도록 삭제로 기록
+                        current = {}
+                    except OSError as e:
+                        self.logger.error(f"Error accessing registry key {key_path}: {e}")
+                        continue
+                    writer.begin_key(key_path)
+                    for value_name in values:
+                        if value_name in current:
+                            writer.write_value(value_name, *current[value_name])
+                        else:
+                            writer.delete_value(value_name)
+            entry = self.backup_store.put(buffer.getvalue(), self.vba_keys)
+            self.logger.info(f"Registry backup stored: {entry.id[:12]} "
+                             f"({datetime.fromtimestamp(entry.timestamp).isoformat(timespec='seconds')})")
+            self.prune_backups()
             return True
         except Exception as e:
             self.logger.error(f"Failed to backup registry: {e}")
@@ -118,60 +95,212 @@ class RegistryManager:
     @measure_time
     def modify_registry(self) -> bool:
         """
-        VBA 관련 레지스트리 설정을 수정
+        VBA 관련 레지스트리 설정을 수정 (하나라도 실패하면 정책에 따라 되돌리고 False)
         """
+        return self.apply_registry()['success']
+
+    def _registry_security(self) -> Dict:
+        try:
+            return dict(get_security_policy().registry_security)
+        except Exception as e:
+            self.logger.error(f"Failed to load registry_security policy: {e}")
+            return {}
+
+    @measure_time
+    def apply_registry(self, values: Optional[Dict[str, Dict[str, int]]] = None,
+                       backup: Optional[bool] = None, verify: Optional[bool] = None,
+                       rollback: Optional[bool] = None) -> Dict:
+        """
+        레지스트리 값을 하나의 트랜잭션으로 적용
+
+        1) 대상 키의 현재 값(사전 이미지)을 메모리에 읽고 2) 모든 값을 기록한 뒤
+        3) 키마다 한 번의 일괄 조회로 검증합니다. 기록이나 검증에 실패한 값이 있으면
+        사전 이미지로 되돌립니다 (.reg 파일을 다시 읽지 않음). 없는 키는 만들고, 되돌릴
+        때 삭제합니다.
+
+        backup/verify/rollback을 지정하지 않으면 보안 정책 registry_security의
+        backup_before_modify/verify_after_modify/restore_on_failure를 따릅니다.
+
+        반환값: success, rolled_back, backup, values(키/값별 old, new, status, error,
+        rolled_back), timings(단계별 초). status는 applied, unchanged, write_failed,
+        verify_failed 중 하나입니다.
+        """
+        values = self.vba_keys if values is None else values
+        settings = self._registry_security()
+        if backup is None:
+            backup = settings.get('backup_before_modify', True)
+        if verify is None:
+            verify = settings.get('verify_after_modify', True)
+        if rollback is None:
+            rollback = settings.get('restore_on_failure', True)
+
+        result = {
+            'success': False,
+            'rolled_back': False,
+            'backup': None,
+            'values': [],
+            'timings': {}
+        }
         try:
-            for key_path, values in self.vba_keys.items():
-                hive, path = self._get_hive_and_path(key_path)
+            if backup:
+                start = time.perf_counter()
+                result['backup'] = self.backup_registry()
+                result['timings']['backup'] = time.perf_counter() - start
+                if not result['backup']:
+                    self.logger.error("Registry modification aborted: backup failed")
+                    return result
+
+            # 1단계: 사전 이미지 (키가 없으면 None)
+            start = time.perf_counter()
+            pre_image: Dict[str, Optional[Dict[str, Tuple[object, int]]]] = {}
+            for key_path, targets in values.items():
                 try:
-                    with winreg.OpenKey(hive, path, 0, winreg.KEY_WRITE) as key:
-                        for value_name, value in values.items():
-                            try:
-                                winreg.SetValueEx(key, value_name, 0, winreg.REG_DWORD, value)
-                            except WindowsError as e:
-                                self.logger.error(f"Error setting value {value_name} in {key_path}: {e}")
-                                continue
-                except WindowsError as e:
-                    self.logger.error(f"Error accessing registry key {key_path}: {e}")
+                    pre_image[key_path] = self.pool.read_values(key_path, targets)
+                except FileNotFoundError:
+                    pre_image[key_path] = None
+            result['timings']['snapshot'] = time.perf_counter() - start
+
+            entries: Dict[Tuple[str, str], Dict] = {}
+            for key_path, targets in values.items():
+                old_values = pre_image[key_path] or {}
+                for value_name, value in targets.items():
+                    old = old_values.get(value_name)
+                    entries[(key_path, value_name)] = {
+                        'key': key_path,
+                        'name': value_name,
+                        'old': old[0] if old is not None else None,
+                        'new': value,
+                        'status': 'unchanged' if old == (value, REG_DWORD) else 'applied',
+                        'error': None,
+                        'rolled_back': False
+                    }
+
+            # 2단계: 바뀌어야 하는 값만 기록
+            start = time.perf_counter()
+            for key_path, targets in values.items():
+                pending = {name: (value, REG_DWORD) for name, value in targets.items()
+                           if entries[(key_path, name)]['status'] == 'applied'}
+                if not pending:
                     continue
-            
-            self.logger.info("Registry modification completed")
-            return True
+                try:
+                    failed = self.pool.write_values(key_path, pending, create=True)
+                except OSError as e:
+                    failed = {name: e for name in pending}
+                for value_name, e in failed.items():
+                    entry = entries[(key_path, value_name)]
+                    entry['status'] = 'write_failed'
+                    entry['error'] = str(e)
+                    self.logger.error(f"Error setting value {value_name} in {key_path}: {e}")
+            result['timings']['write'] = time.perf_counter() - start
+
+            # 3단계: 키마다 한 번에 읽어서 검증
+            if verify:
+                start = time.perf_counter()
+                for key_path, targets in values.items():
+                    try:
+                        actual = self.pool.read_values(key_path, targets)
+                    except OSError as e:
+                        actual, error = {}, str(e)
+                    else:
+                        error = None
+                    for value_name, value in targets.items():
+                        entry = entries[(key_path, value_name)]
+                        if entry['status'] == 'write_failed':
+                            continue
+                        if actual.get(value_name) != (value, REG_DWORD):
+                            entry['status'] = 'verify_failed'
+                            entry['error'] = error or f"expected {value}, found {actual.get(value_name, (None,))[0]}"
+                            self.logger.error(f"Verification failed for {value_name} in {key_path}: {entry['error']}")
+                result['timings']['verify'] = time.perf_counter() - start
+
+            result['values'] = list(entries.values())
+            failed = [entry for entry in result['values'] if entry['status'] in ('write_failed', 'verify_failed')]
+            if failed and rollback:
+                start = time.perf_counter()
+                result['rolled_back'] = self._rollback(pre_image, values, entries)
+                result['timings']['rollback'] = time.perf_counter() - start
+            result['success'] = not failed
         except Exception as e:
             self.logger.error(f"Failed to modify registry: {str(e)}")
-            return False
+            return result
+
+        timings = ', '.join(f"{stage} {duration:.3f}s" for stage, duration in result['timings'].items())
+        counts = {}
+        for entry in result['values']:
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        summary = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+        if result['success']:
+            self.logger.info(f"Registry modification completed ({summary}; {timings})")
+        else:
+            self.logger.error(f"Registry modification failed ({summary}; rolled back: {result['rolled_back']}; "
+                              f"{timings})")
+        return result
+
+    def _rollback(self, pre_image: Dict[str, Optional[Dict[str, Tuple[object, int]]]],
+                  values: Dict[str, Dict[str, int]], entries: Dict[Tuple[str, str], Dict]) -> bool:
+        """사전 이미지로 되돌리기 (기록한 값만, 없던 값은 삭제하고 없던 키는 삭제)"""
+        success = True
+        for key_path, targets in values.items():
+            touched = [name for name in targets if entries[(key_path, name)]['status'] != 'unchanged']
+            if not touched:
+                continue
+            old_values = pre_image[key_path] or {}
+            restore = {name: old_values[name] for name in touched if name in old_values}
+            remove = [name for name in touched if name not in old_values]
+            try:
+                failed = self.pool.write_values(key_path, restore) if restore else {}
+                with self.pool.acquire(key_path, write=True) as key:
+                    for name in remove:
+                        try:
+                            key.delete_value(name)
+                        except FileNotFoundError:
+                            pass
+                if pre_image[key_path] is None:
+                    self._delete_created_key(key_path)
+            except OSError as e:
+                self.logger.error(f"Error rolling back registry key {key_path}: {e}")
+                success = False
+                continue
+            for name in touched:
+                if name not in failed:
+                    entries[(key_path, name)]['rolled_back'] = True
+                else:
+                    self.logger.error(f"Error rolling back value {name} in {key_path}: {failed[name]}")
+                    success = False
+        return success
+
+    def _delete_created_key(self, key_path: str):
+        """apply_registry가 만든 키가 비어 있으면 삭제"""
+        with self.pool.acquire(key_path) as key:
+            if key.values() or key.subkeys():
+                return
+        self.pool.delete_key(key_path)
+
+    def prune_backups(self) -> int:
+        """보안 정책 registry_security의 backup_retention_days/max_backups에 따라 오래된 백업 정리"""
+        settings = self._registry_security()
+        try:
+            return self.backup_store.prune(max_age_days=settings.get('backup_retention_days', 30),
+                                           max_entries=settings.get('max_backups', 100))
+        except OSError as e:
+            self.logger.error(f"Failed to prune registry backups: {e}")
+            return 0
 
     @measure_time
-    def restore_registry(self, backup_file: Optional[str] = None) -> bool:
+    def restore_registry(self, backup_file: Optional[str] = None, as_of: Optional[TimeValue] = None) -> bool:
         """
-        백업된 레지스트리 설정을 복원
+        백업된 레지스트리 설정을 복원 (기본: 가장 최근 백업, as_of: 해당 시각 기준 백업)
         """
         try:
             if backup_file is None:
-                # 가장 최근 백업 파일 찾기
-                backup_files = [f for f in os.listdir(self.backup_path) if f.startswith('vba_settings_')]
-                if not backup_files:
+                entry = self.backup_store.latest() if as_of is None else self.backup_store.as_of(as_of)
+                if entry is None:
                     self.logger.error("No backup files found")
                     return False
-                backup_file = os.path.join(self.backup_path, sorted(backup_files)[-1])
-
-            # .reg 파일 파싱
-            registry_data = self._parse_reg_file(backup_file)
-            
-            # 레지스트리 값 복원
-            for key_path, values in registry_data.items():
-                hive, path = self._get_hive_and_path(key_path)
-                try:
-                    with winreg.OpenKey(hive, path, 0, winreg.KEY_WRITE) as key:
-                        for value_name, value in values.items():
-                            try:
-                                winreg.SetValueEx(key, value_name, 0, winreg.REG_DWORD, value)
-                            except WindowsError as e:
-                                self.logger.error(f"Error restoring value {value_name} in {key_path}: {e}")
-                                continue
-                except WindowsError as e:
-                    self.logger.error(f"Error accessing registry key {key_path}: {e}")
-                    continue
+                backup_file = self.backup_store.object_path(entry.id)
+
+            self._apply_reg_sections(iter_reg_file(
+                backup_file, on_error=lambda e: self.logger.warning(f"Failed to parse {backup_file}: {e}")))
 
             self.logger.info(f"Registry restored from: {backup_file}")
             return True
@@ -179,6 +308,91 @@ class RegistryManager:
             self.logger.error(f"Failed to restore registry: {str(e)}")
             return False
 
+    def _apply_reg_sections(self, sections: Iterable[RegSection]) -> int:
+        """.reg 키 목록을 레지스트리에 반영 (값 기록/삭제, 키 생성/삭제, 실패한 항목 수 반환)"""
+        errors = 0
+        for section in sections:
+            key_path = section.key
+            if section.delete:
+                try:
+                    self.pool.delete_key(key_path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.logger.error(f"Error deleting registry key {key_path}: {e}")
+                    errors += 1
+                continue
+
+            assign = {name: value for name, value in section.values.items() if value is not DELETED}
+            remove = [name for name, value in section.values.items() if value is DELETED]
+            try:
+                if assign or not remove:
+                    failed = self.pool.write_values(key_path, assign, create=True)
+                else:
+                    failed = {}
+                if remove:
+                    with self.pool.acquire(key_path, write=True) as key:
+                        for name in remove:
+                            try:
+                                key.delete_value(name)
+                            except FileNotFoundError:
+                                pass
+            except FileNotFoundError:
+                # 삭제만 기록된 키가 없으면 이미 원하는 상태
+                continue
+            except OSError as e:
+                self.logger.error(f"Error accessing registry key {key_path}: {e}")
+                errors += 1
+                continue
+            for value_name, e in failed.items():
+                self.logger.error(f"Error restoring value {value_name} in {key_path}: {e}")
+            errors += len(failed)
+        return errors
+
+    @measure_time
+    def import_registry(self, reg_file: str) -> bool:
+        """.reg 파일을 키 단위로 읽으면서 레지스트리에 반영"""
+        try:
+            errors = self._apply_reg_sections(iter_reg_file(reg_file))
+            self.logger.info(f"Registry imported from: {reg_file} ({errors} errors)")
+            return errors == 0
+        except (OSError, RegFileError) as e:
+            self.logger.error(f"Failed to import registry file {reg_file}: {e}")
+            return False
+
+    @measure_time
+    def export_registry(self, key_path: str, reg_file: str) -> int:
+        """키와 모든 하위 키를 .reg 파일로 내보내기 (내보낸 키 수 반환, 실패 시 -1)
+
+        키를 하나씩 열어 바로 기록하므로 Office 전체 하위 트리도 일정한 메모리로
+        내보냅니다. 하위 트리의 핸들은 공유 풀에 넣지 않습니다.
+        """
+        count = 0
+        try:
+            with RegFileWriter.open(reg_file) as writer:
+                stack = [key_path]
+                while stack:
+                    current = stack.pop()
+                    try:
+                        with self.backend.open_key(current) as key:
+                            values = key.values()
+                            subkeys = key.subkeys()
+                    except FileNotFoundError:
+                        if current == key_path:
+                            raise
+                        continue
+                    writer.begin_key(current)
+                    for name, value, value_type in values:
+                        writer.write_value(name, value, value_type)
+                    count += 1
+                    stack.extend(f"{current}\\{name}" for name in reversed(subkeys))
+                writer.write_separator()
+            self.logger.info(f"Registry exported: {key_path} -> {reg_file} ({count} keys)")
+            return count
+        except (OSError, RegFileError, TypeError) as e:
+            self.logger.error(f"Failed to export registry key {key_path}: {e}")
+            return -1
+
     @measure_time
     def check_registry_status(self) -> bool:
         """
@@ -186,18 +400,13 @@ class RegistryManager:
         """
         try:
             for key_path, expected_values in self.vba_keys.items():
-                hive, path = self._get_hive_and_path(key_path)
                 try:
-                    with winreg.OpenKey(hive, path, 0, winreg.KEY_READ) as key:
-                        for value_name, expected_value in expected_values.items():
-                            try:
-                                actual_value, _ = winreg.QueryValueEx(key, value_name)
-                                if actual_value != expected_value:
-                                    return False
-                            except WindowsError:
-                                return False
-                except WindowsError:
+                    current = self.pool.read_values(key_path, expected_values)
+                except OSError:
                     return False
+                for value_name, expected_value in expected_values.items():
+                    if value_name not in current or current[value_name][0] != expected_value:
+                        return False
             return True
         except Exception as e:
             self.logger.error(f"Failed to check registry status: {str(e)}")
@@ -0,0 +1,454 @@
+import errno
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+from threading import RLock
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+try:
+    from Registry import Registry as HiveRegistry
+except ImportError:
+    HiveRegistry = None
+
+# 레지스트리 값 형식 (winreg 상수와 같은 값)
+REG_NONE = 0
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+HIVE_NAMES = ('HKEY_CURRENT_USER', 'HKEY_LOCAL_MACHINE', 'HKEY_CLASSES_ROOT', 'HKEY_USERS')
+
+_HIVE_ALIASES = {
+    'HKCU': 'HKEY_CURRENT_USER',
+    'HKLM': 'HKEY_LOCAL_MACHINE',
+    'HKCR': 'HKEY_CLASSES_ROOT',
+    'HKU': 'HKEY_USERS'
+}
+
+
+def split_key_path(key_path: str) -> Tuple[str, str]:
+    """레지스트리 키 경로를 (hive 이름, 나머지 경로)로 분리 (HKCU 등 약어 허용)"""
+    parts = key_path.split('\\', 1)
+    if len(parts) != 2:
+        raise ValueError(f"Invalid registry path: {key_path}")
+
+    hive_name, path = parts
+    hive_name = hive_name.upper()
+    hive_name = _HIVE_ALIASES.get(hive_name, hive_name)
+    if hive_name not in HIVE_NAMES:
+        raise ValueError(f"Unknown registry hive: {parts[0]}")
+    return hive_name, path
+
+
+def value_type_of(value) -> int:
+    """파이썬 값에 맞는 레지스트리 값 형식"""
+    if isinstance(value, bool):
+        raise TypeError("bool 값은 레지스트리 값 형식을 정할 수 없습니다")
+    if isinstance(value, int):
+        return REG_DWORD if 0 <= value <= 0xFFFFFFFF else REG_QWORD
+    if isinstance(value, str):
+        return REG_SZ
+    if isinstance(value, (bytes, bytearray)):
+        return REG_BINARY
+    if isinstance(value, (list, tuple)):
+        return REG_MULTI_SZ
+    if value is None:
+        return REG_NONE
+    raise TypeError(f"지원하지 않는 레지스트리 값: {value!r}")
+
+
+# 열어 둔 핸들의 키가 삭제된 뒤 접근하면 Windows가 돌려주는 오류 코드
+ERROR_KEY_DELETED = 1018
+
+
+class RegistryKeyDeletedError(OSError):
+    """열어 둔 핸들의 키가 그 사이에 삭제됨"""
+
+
+def is_key_deleted(error: BaseException) -> bool:
+    """핸들의 키가 삭제되어 발생한 오류인지 확인 (다시 열어야 함)"""
+    return isinstance(error, RegistryKeyDeletedError) or getattr(error, 'winerror', None) == ERROR_KEY_DELETED
+
+
+def _not_found(what: str, name: str) -> FileNotFoundError:
+    # winreg와 같이 없는 키/값은 FileNotFoundError
+    return FileNotFoundError(errno.ENOENT, f"레지스트리 {what}을(를) 찾을 수 없습니다", name)
+
+
+class RegistryKey:
+    """열린 레지스트리 키 핸들 인터페이스 (with 문으로 사용)"""
+
+    path: str = ''
+
+    def query_value(self, name: str) -> Tuple[object, int]:
+        """값과 값 형식 (없으면 FileNotFoundError)"""
+        raise NotImplementedError
+
+    def set_value(self, name: str, value, value_type: Optional[int] = None):
+        raise NotImplementedError
+
+    def delete_value(self, name: str):
+        raise NotImplementedError
+
+    def values(self) -> List[Tuple[str, object, int]]:
+        """(이름, 값, 값 형식) 목록"""
+        raise NotImplementedError
+
+    def subkeys(self) -> List[str]:
+        """하위 키 이름 목록"""
+        raise NotImplementedError
+
+    def query_info(self) -> Tuple[int, int, int]:
+        """(하위 키 수, 값 수, 마지막 수정 시각) - winreg.QueryInfoKey와 같은 형식
+
+        마지막 수정 시각은 하위 키를 추가/삭제하거나 값을 바꿀 때 달라지는 값으로,
+        변경 여부 비교에만 사용합니다.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class RegistryBackend:
+    """레지스트리 저장소 인터페이스
+
+    키 경로는 'HKEY_CURRENT_USER\\Software\\...' 형식이며, 없는 키나 값은
+    FileNotFoundError, 쓰기 권한 없이 연 키에 쓰면 PermissionError를 발생시킵니다
+    (winreg와 같은 OSError 계열).
+    """
+
+    name = 'base'
+
+    def open_key(self, key_path: str, write: bool = False) -> RegistryKey:
+        raise NotImplementedError
+
+    def create_key(self, key_path: str) -> RegistryKey:
+        """키를 열고, 없으면 상위 키까지 만들어서 쓰기 가능한 핸들 반환"""
+        raise NotImplementedError
+
+    def delete_key(self, key_path: str):
+        """하위 키가 없는 키 삭제 (열려 있던 핸들은 이후 RegistryKeyDeletedError)"""
+        raise NotImplementedError
+
+    def key_exists(self, key_path: str) -> bool:
+        try:
+            with self.open_key(key_path):
+                return True
+        except OSError:
+            return False
+
+    def close(self):
+        pass
+
+
+class _WinregKey(RegistryKey):
+    def __init__(self, handle, path: str):
+        self._handle = handle
+        self.path = path
+
+    def query_value(self, name: str) -> Tuple[object, int]:
+        return winreg.QueryValueEx(self._handle, name)
+
+    def set_value(self, name: str, value, value_type: Optional[int] = None):
+        if value_type is None:
+            value_type = value_type_of(value)
+        winreg.SetValueEx(self._handle, name, 0, value_type, value)
+
+    def delete_value(self, name: str):
+        winreg.DeleteValue(self._handle, name)
+
+    def values(self) -> List[Tuple[str, object, int]]:
+        result = []
+        index = 0
+        while True:
+            try:
+                result.append(winreg.EnumValue(self._handle, index))
+            except OSError:
+                return result
+            index += 1
+
+    def subkeys(self) -> List[str]:
+        result = []
+        index = 0
+        while True:
+            try:
+                result.append(winreg.EnumKey(self._handle, index))
+            except OSError:
+                return result
+            index += 1
+
+    def query_info(self) -> Tuple[int, int, int]:
+        return winreg.QueryInfoKey(self._handle)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.Close()
+            self._handle = None
+
+
+class WinregBackend(RegistryBackend):
+    """실제 Windows 레지스트리 (winreg)"""
+
+    name = 'winreg'
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform == 'win32' and winreg is not None
+
+    def _hive(self, hive_name: str):
+        return getattr(winreg, hive_name)
+
+    def open_key(self, key_path: str, write: bool = False) -> RegistryKey:
+        hive_name, path = split_key_path(key_path)
+        access = winreg.KEY_READ | winreg.KEY_WRITE if write else winreg.KEY_READ
+        return _WinregKey(winreg.OpenKey(self._hive(hive_name), path, 0, access), key_path)
+
+    def create_key(self, key_path: str) -> RegistryKey:
+        hive_name, path = split_key_path(key_path)
+        handle = winreg.CreateKeyEx(self._hive(hive_name), path, 0, winreg.KEY_READ | winreg.KEY_WRITE)
+        return _WinregKey(handle, key_path)
+
+    def delete_key(self, key_path: str):
+        hive_name, path = split_key_path(key_path)
+        winreg.DeleteKey(self._hive(hive_name), path)
+
+
+class _MemoryNode:
+    __slots__ = ('name', 'values', 'children', 'source', 'expanded', 'deleted', 'modified')
+
+    def __init__(self, name: str, source=None, modified: int = 0):
+        self.name = name
+        # 하위 키 추가/삭제, 값 변경 시 증가 (winreg의 마지막 수정 시각 대신)
+        self.modified = modified
+        # 대문자 이름 -> (원래 이름, 값, 값 형식), 대문자 이름 -> 하위 노드
+        self.values: Dict[str, Tuple[str, object, int]] = {}
+        self.children: Dict[str, '_MemoryNode'] = {}
+        # 오프라인 hive의 원본 키 (하위 키는 처음 접근할 때 불러옴)
+        self.source = source
+        self.expanded = source is None
+        self.deleted = False
+
+
+class _MemoryKey(RegistryKey):
+    def __init__(self, backend: 'MemoryRegistryBackend', node: _MemoryNode, path: str, writable: bool):
+        self._backend = backend
+        self._node = node
+        self._writable = writable
+        self.path = path
+
+    def _check_deleted(self):
+        if self._node.deleted:
+            raise RegistryKeyDeletedError(errno.ENOENT, "삭제된 레지스트리 키입니다", self.path)
+
+    def _check_writable(self):
+        self._check_deleted()
+        if not self._writable:
+            raise PermissionError(errno.EACCES, "읽기 전용으로 연 레지스트리 키입니다", self.path)
+
+    def query_value(self, name: str) -> Tuple[object, int]:
+        self._check_deleted()
+        with self._backend._lock:
+            entry = self._node.values.get(name.upper())
+        if entry is None:
+            raise _not_found('값', f"{self.path}\\{name}")
+        return entry[1], entry[2]
+
+    def set_value(self, name: str, value, value_type: Optional[int] = None):
+        self._check_writable()
+        if value_type is None:
+            value_type = value_type_of(value)
+        if isinstance(value, (list, tuple)):
+            value = list(value)
+        with self._backend._lock:
+            self._node.values[name.upper()] = (name, value, value_type)
+            self._node.modified += 1
+        self._backend._notify(self.path)
+
+    def delete_value(self, name: str):
+        self._check_writable()
+        with self._backend._lock:
+            if self._node.values.pop(name.upper(), None) is None:
+                raise _not_found('값', f"{self.path}\\{name}")
+            self._node.modified += 1
+        self._backend._notify(self.path)
+
+    def values(self) -> List[Tuple[str, object, int]]:
+        self._check_deleted()
+        with self._backend._lock:
+            return list(self._node.values.values())
+
+    def subkeys(self) -> List[str]:
+        self._check_deleted()
+        with self._backend._lock:
+            self._backend._expand(self._node)
+            return [child.name for child in self._node.children.values()]
+
+    def query_info(self) -> Tuple[int, int, int]:
+        self._check_deleted()
+        with self._backend._lock:
+            self._backend._expand(self._node)
+            return len(self._node.children), len(self._node.values), self._node.modified
+
+
+class MemoryRegistryBackend(RegistryBackend):
+    """메모리 레지스트리 (테스트, 벤치마크, Windows 이외 환경)
+
+    키와 값 이름은 Windows와 같이 대소문자를 구분하지 않고 원래 이름을 보존합니다.
+    data로 {키 경로: {값 이름: 값}} 초기 내용을 지정할 수 있으며, 값 형식을 지정하려면
+    값 자리에 (값, 값 형식)을 넣습니다.
+    """
+
+    name = 'memory'
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, object]]] = None):
+        self._lock = RLock()
+        self._roots: Dict[str, _MemoryNode] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        for key_path, values in (data or {}).items():
+            with self.create_key(key_path) as key:
+                for value_name, value in values.items():
+                    if isinstance(value, tuple):
+                        key.set_value(value_name, *value)
+                    else:
+                        key.set_value(value_name, value)
+
+    def _expand(self, node: _MemoryNode):
+        """하위 키를 아직 불러오지 않은 노드 채우기 (오프라인 hive에서 사용)"""
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """키가 만들어지거나 삭제되거나 값이 바뀔 때 해당 키 경로로 callback 호출
+
+        RegNotifyChangeKeyValue와 같이 무엇이 바뀌었는지는 전달하지 않으며, callback은
+        변경한 스레드에서 잠금 밖에서 호출됩니다.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self, key_path: str):
+        for callback in list(self._listeners):
+            callback(key_path)
+
+    def _find(self, key_path: str, create: bool = False) -> _MemoryNode:
+        hive_name, path = split_key_path(key_path)
+        node = self._roots.get(hive_name)
+        if node is None:
+            node = self._roots[hive_name] = _MemoryNode(hive_name)
+        for part in path.split('\\'):
+            if not part:
+                continue
+            self._expand(node)
+            child = node.children.get(part.upper())
+            if child is None:
+                if not create:
+                    raise _not_found('키', key_path)
+                child = node.children[part.upper()] = _MemoryNode(part)
+                node.modified += 1
+            node = child
+        return node
+
+    def open_key(self, key_path: str, write: bool = False) -> RegistryKey:
+        with self._lock:
+            return _MemoryKey(self, self._find(key_path), key_path, write)
+
+    def create_key(self, key_path: str) -> RegistryKey:
+        with self._lock:
+            key = _MemoryKey(self, self._find(key_path, create=True), key_path, True)
+        self._notify(key_path)
+        return key
+
+    def delete_key(self, key_path: str):
+        hive_name, path = split_key_path(key_path)
+        parent_path, _, leaf = path.rstrip('\\').rpartition('\\')
+        if not leaf:
+            raise ValueError(f"Invalid registry path: {key_path}")
+        with self._lock:
+            parent = self._find(f"{hive_name}\\{parent_path}")
+            self._expand(parent)
+            node = parent.children.get(leaf.upper())
+            if node is None:
+                raise _not_found('키', key_path)
+            self._expand(node)
+            if node.children:
+                # Windows와 같이 하위 키가 있는 키는 삭제할 수 없음
+                raise PermissionError(errno.EACCES, "하위 키가 있는 레지스트리 키는 삭제할 수 없습니다", key_path)
+            del parent.children[leaf.upper()]
+            parent.modified += 1
+            node.deleted = True
+        self._notify(key_path)
+
+
+class OfflineHiveBackend(MemoryRegistryBackend):
+    """오프라인 hive 파일 (NTUSER.DAT, SOFTWARE 등, python-registry로 읽기)
+
+    hives는 {마운트 경로: hive 파일 경로 또는 열어 둔 Registry 객체}이며, 마운트 경로는
+    'HKEY_CURRENT_USER'나 'HKEY_LOCAL_MACHINE\\SOFTWARE'처럼 지정합니다. 키는 처음
+    접근할 때 hive에서 불러옵니다. python-registry는 읽기 전용이므로 쓰기는 메모리에만
+    반영되고 hive 파일은 바뀌지 않습니다.
+    """
+
+    name = 'offline'
+
+    def __init__(self, hives: Dict[str, object]):
+        super().__init__()
+        for mount, hive in hives.items():
+            if isinstance(hive, str):
+                if HiveRegistry is None:
+                    raise RuntimeError("오프라인 hive를 읽으려면 python-registry가 필요합니다")
+                hive = HiveRegistry.Registry(hive)
+            self._mount(mount, hive.root())
+
+    def _mount(self, mount: str, root):
+        hive_name, _, path = mount.partition('\\')
+        hive_name, path = split_key_path(f"{hive_name}\\{path}")
+        with self._lock:
+            if not path:
+                node = self._load(hive_name, root)
+                self._roots[hive_name] = node
+                return
+            parent_path, _, leaf = path.rpartition('\\')
+            parent = self._find(f"{hive_name}\\{parent_path}", create=True)
+            parent.children[leaf.upper()] = self._load(leaf, root)
+
+    def _load(self, name: str, hive_key) -> _MemoryNode:
+        # hive의 마지막 수정 시각 (100ns 단위)에서 시작
+        node = _MemoryNode(name, source=hive_key, modified=int(hive_key.timestamp().timestamp() * 10 ** 7))
+        for value in hive_key.values():
+            value_name = value.name()
+            node.values[value_name.upper()] = (value_name, value.value(), value.value_type())
+        return node
+
+    def _expand(self, node: _MemoryNode):
+        if node.expanded:
+            return
+        for subkey in node.source.subkeys():
+            upper = subkey.name().upper()
+            if upper not in node.children:
+                node.children[upper] = self._load(subkey.name(), subkey)
+        node.expanded = True
+
+
+def create_registry_backend() -> RegistryBackend:
+    """실행 환경에 맞는 레지스트리 저장소 (Windows가 아니면 메모리 레지스트리)"""
+    if WinregBackend.is_available():
+        return WinregBackend()
+    return MemoryRegistryBackend()
+
@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+def _pattern_to_regex(pattern: str) -> str:
+    return '.*'.join(re.escape(part) for part in pattern.split('*'))
+
+
+@lru_cache(maxsize=1024)
+def compile_registry_pattern(pattern: str) -> 're.Pattern':
+    """와일드카드(*) 레지스트리 경로 패턴을 대소문자 무시 정규식으로 변환
+
+    '*'는 경로 구분자(\\)를 포함한 임의의 문자열과 일치합니다.
+    """
+    return re.compile(f'^{_pattern_to_regex(pattern)}$', re.IGNORECASE | re.DOTALL)
+
+
+class _TrieNode:
+    __slots__ = ('children', 'patterns', '_regex')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.patterns: List[str] = []
+        self._regex: Optional['re.Pattern'] = None
+
+    def add_pattern(self, pattern: str):
+        self.patterns.append(pattern)
+        self._regex = None
+
+    def compile(self):
+        if self.patterns and self._regex is None:
+            alternatives = '|'.join(f'({_pattern_to_regex(p)})' for p in self.patterns)
+            self._regex = re.compile(f'^(?:{alternatives})$', re.IGNORECASE | re.DOTALL)
+        for child in self.children.values():
+            child.compile()
+
+    def match(self, key: str) -> Optional[str]:
+        """이 노드의 패턴 전체를 하나로 합친 정규식으로 검사"""
+        if not self.patterns:
+            return None
+        if self._regex is None:
+            self.compile()
+        matched = self._regex.match(key)
+        if matched is None:
+            return None
+        return self.patterns[matched.lastindex - 1]
+
+
+class RegistryPatternIndex:
+    """레지스트리 경로 패턴 색인
+
+    와일드카드가 없는 패턴은 소문자 경로 사전에서 바로 찾고, 와일드카드 패턴은
+    첫 와일드카드 앞의 경로 구간으로 트라이에 색인합니다. 노드마다 패턴들을 하나의
+    정규식으로 합쳐 두고, 조회 시에는 키 경로를 따라 내려가며 만나는 노드만
+    검사하므로 관련 없는 패턴은 검사하지 않습니다. 같은 키의 반복 조회는 LRU
+    캐시로 처리합니다.
+    """
+
+    def __init__(self, patterns: Iterable[str], cache_size: int = 4096):
+        self.patterns: List[str] = []
+        self._exact: Dict[str, str] = {}
+        self._root = _TrieNode()
+        for pattern in patterns:
+            self.add(pattern)
+        self._root.compile()
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def add(self, pattern: str):
+        self.patterns.append(pattern)
+        if '*' not in pattern:
+            self._exact.setdefault(pattern.lower(), pattern)
+        else:
+            node = self._root
+            for segment in pattern.split('\\'):
+                if '*' in segment:
+                    break
+                node = node.children.setdefault(segment.lower(), _TrieNode())
+            node.add_pattern(pattern)
+        # 색인이 바뀌었으므로 캐시 무효화
+        if hasattr(self, 'match'):
+            self.match.cache_clear()
+
+    def _match(self, key: str) -> Optional[str]:
+        """key와 일치하는 첫 패턴 (없으면 None)"""
+        lowered = key.lower()
+        exact = self._exact.get(lowered)
+        if exact is not None:
+            return exact
+
+        node = self._root
+        segments = lowered.split('\\')
+        for depth in range(len(segments) + 1):
+            pattern = node.match(key)
+            if pattern is not None:
+                return pattern
+            if depth == len(segments):
+                break
+            node = node.children.get(segments[depth])
+            if node is None:
+                break
+        return None
+
+    def matches(self, key: str) -> bool:
+        return self.match(key) is not None
+
+    def cache_info(self):
+        return self.match.cache_info()
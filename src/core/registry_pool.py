@@ -0,0 +1,238 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from threading import Lock
+from .logger import Logger
+from .registry_backend import (RegistryBackend, RegistryKey, create_registry_backend, is_key_deleted,
+                               split_key_path)
+
+# (정규화된 키 경로, 쓰기 가능 여부)
+HandleKey = Tuple[str, bool]
+
+
+@lru_cache(maxsize=65536)
+def normalize_key_path(key_path: str) -> str:
+    """대소문자/약어/끝의 구분자를 무시한 키 경로 (풀의 색인 키)"""
+    hive_name, path = split_key_path(key_path)
+    path = '\\'.join(part for part in path.split('\\') if part)
+    return f"{hive_name}\\{path.upper()}"
+
+
+class _PooledHandle:
+    __slots__ = ('key', 'handle_key', 'refs', 'stale')
+
+    def __init__(self, key: RegistryKey, handle_key: HandleKey):
+        self.key = key
+        self.handle_key = handle_key
+        self.refs = 0
+        # 무효화된 핸들은 마지막 사용자가 반환할 때 닫음
+        self.stale = False
+
+
+class RegistryKeyPool:
+    """열린 레지스트리 키 핸들을 공유하는 풀
+
+    같은 키를 여러 번 열지 않도록 핸들을 참조 횟수와 함께 보관하고, 사용 중이 아닌
+    핸들은 최근 사용 순으로 최대 max_handles개까지 유지합니다. 키가 삭제되면 해당
+    키와 하위 키의 핸들을 무효화하며, 삭제된 키의 핸들로 접근하다 실패하면 새로
+    열어서 한 번 다시 시도합니다. 읽기 요청은 이미 열린 쓰기 핸들도 사용합니다.
+    """
+
+    def __init__(self, backend: Optional[RegistryBackend] = None, max_handles: int = 64):
+        self.logger = Logger('registry_pool')
+        self.backend = backend or create_registry_backend()
+        self.max_handles = max_handles
+        self._lock = Lock()
+        self._handles: 'OrderedDict[HandleKey, _PooledHandle]' = OrderedDict()
+        self.hits = 0
+        self.opens = 0
+        self.invalidations = 0
+
+    def _lookup(self, path: str, write: bool) -> Optional[_PooledHandle]:
+        for handle_key in ((path, True),) if write else ((path, False), (path, True)):
+            entry = self._handles.get(handle_key)
+            if entry is not None:
+                self._handles.move_to_end(handle_key)
+                return entry
+        return None
+
+    def _checkout(self, key_path: str, write: bool, create: bool) -> _PooledHandle:
+        path = normalize_key_path(key_path)
+        write = write or create
+        with self._lock:
+            entry = self._lookup(path, write)
+            if entry is not None:
+                entry.refs += 1
+                self.hits += 1
+                return entry
+
+        # 키 열기는 잠금 밖에서 수행
+        key = self.backend.create_key(key_path) if create else self.backend.open_key(key_path, write=write)
+        handle_key = (path, write)
+        with self._lock:
+            self.opens += 1
+            entry = self._lookup(path, write)
+            if entry is None:
+                entry = _PooledHandle(key, handle_key)
+                self._handles[handle_key] = entry
+                key = None
+            entry.refs += 1
+        if key is not None:
+            # 다른 스레드가 먼저 열었으면 그 핸들 사용
+            key.close()
+        return entry
+
+    def _release(self, entry: _PooledHandle):
+        to_close = []
+        with self._lock:
+            entry.refs -= 1
+            if entry.stale and entry.refs == 0:
+                to_close.append(entry.key)
+            excess = len(self._handles) - self.max_handles
+            if excess > 0:
+                # 가장 오래 사용하지 않은 유휴 핸들부터 닫음
+                victims = []
+                for handle_key, idle in self._handles.items():
+                    if len(victims) >= excess:
+                        break
+                    if idle.refs == 0:
+                        victims.append(handle_key)
+                for handle_key in victims:
+                    to_close.append(self._handles.pop(handle_key).key)
+        if to_close:
+            self._close_all(to_close)
+
+    def _close_all(self, keys: Iterable[RegistryKey]):
+        for key in keys:
+            try:
+                key.close()
+            except OSError as e:
+                self.logger.warning(f"레지스트리 핸들 닫기 실패: {e}")
+
+    @contextmanager
+    def acquire(self, key_path: str, write: bool = False, create: bool = False) -> Iterator[RegistryKey]:
+        """풀의 핸들 빌리기 (with 블록이 끝나면 반환, 닫지 않음)
+
+        create=True이면 키가 없을 때 만들어서 쓰기 핸들을 돌려줍니다.
+        """
+        entry = self._checkout(key_path, write, create)
+        try:
+            yield entry.key
+        except OSError as e:
+            if is_key_deleted(e):
+                self.invalidate(key_path)
+            raise
+        finally:
+            self._release(entry)
+
+    def invalidate(self, key_path: str) -> int:
+        """키와 하위 키의 핸들을 풀에서 제거 (무효화한 핸들 수 반환)"""
+        path = normalize_key_path(key_path)
+        prefix = path + '\\'
+        to_close = []
+        with self._lock:
+            removed = [k for k in self._handles if k[0] == path or k[0].startswith(prefix)]
+            for handle_key in removed:
+                entry = self._handles.pop(handle_key)
+                entry.stale = True
+                if entry.refs == 0:
+                    to_close.append(entry.key)
+            self.invalidations += len(removed)
+        self._close_all(to_close)
+        return len(removed)
+
+    def delete_key(self, key_path: str):
+        """키를 삭제하고 해당 핸들 무효화"""
+        self.backend.delete_key(key_path)
+        self.invalidate(key_path)
+
+    def _with_retry(self, key_path: str, write: bool, create: bool, func: Callable[[RegistryKey], object]):
+        """키가 삭제되어 오래된 핸들이 실패하면 새로 열어서 한 번 다시 시도"""
+        for attempt in (0, 1):
+            entry = self._checkout(key_path, write, create)
+            try:
+                return func(entry.key)
+            except OSError as e:
+                if attempt or not is_key_deleted(e):
+                    raise
+                self.invalidate(key_path)
+            finally:
+                self._release(entry)
+
+    def read_values(self, key_path: str, names: Optional[Iterable[str]] = None) -> Dict[str, Tuple[object, int]]:
+        """키 하나를 한 번만 열어 값 여러 개 조회 ({이름: (값, 값 형식)})
+
+        names가 없으면 모든 값을 읽고, 지정한 값 중 없는 것은 결과에서 빠집니다.
+        키가 없으면 FileNotFoundError가 발생합니다.
+        """
+        names = list(names) if names is not None else None
+
+        def read(key: RegistryKey) -> Dict[str, Tuple[object, int]]:
+            if names is None:
+                return {name: (value, value_type) for name, value, value_type in key.values()}
+            result = {}
+            for name in names:
+                try:
+                    result[name] = key.query_value(name)
+                except FileNotFoundError:
+                    continue
+            return result
+
+        return self._with_retry(key_path, False, False, read)
+
+    def write_values(self, key_path: str, values: Dict[str, object], create: bool = False) -> Dict[str, OSError]:
+        """키 하나를 한 번만 열어 값 여러 개 기록 (실패한 값 {이름: 오류} 반환)
+
+        값 자리에 (값, 값 형식)을 넣으면 형식을 지정합니다. 키를 열 수 없으면 OSError가
+        발생하며, create=True이면 없는 키를 만듭니다.
+        """
+        def write(key: RegistryKey) -> Dict[str, OSError]:
+            failed = {}
+            for name, value in values.items():
+                try:
+                    if isinstance(value, tuple):
+                        key.set_value(name, *value)
+                    else:
+                        key.set_value(name, value)
+                except OSError as e:
+                    if is_key_deleted(e):
+                        raise
+                    failed[name] = e
+            return failed
+
+        return self._with_retry(key_path, True, create, write)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'cached': len(self._handles),
+                'in_use': sum(1 for entry in self._handles.values() if entry.refs),
+                'hits': self.hits,
+                'opens': self.opens,
+                'invalidations': self.invalidations
+            }
+
+    def close(self):
+        """사용 중이 아닌 핸들을 모두 닫음 (사용 중인 핸들은 반환될 때 닫힘)"""
+        to_close = []
+        with self._lock:
+            for entry in self._handles.values():
+                entry.stale = True
+                if entry.refs == 0:
+                    to_close.append(entry.key)
+            self._handles.clear()
+        self._close_all(to_close)
+
+
+_default_pool: Optional[RegistryKeyPool] = None
+_default_pool_lock = Lock()
+
+
+def get_registry_pool() -> RegistryKeyPool:
+    """모든 컴포넌트가 공유하는 레지스트리 핸들 풀"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = RegistryKeyPool()
+        return _default_pool
@@ -0,0 +1,365 @@
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from threading import Event, Lock, Thread
+from .logger import Logger
+from .registry_backend import MemoryRegistryBackend, WinregBackend, split_key_path
+from .registry_pool import RegistryKeyPool, normalize_key_path
+
+try:
+    import pywintypes
+    import win32api
+    import win32con
+    import win32event
+except ImportError:
+    pywintypes = None
+    win32api = None
+    win32con = None
+    win32event = None
+
+# RegNotifyChangeKeyValue 필터
+REG_NOTIFY_CHANGE_NAME = 0x1
+REG_NOTIFY_CHANGE_LAST_SET = 0x4
+
+# WaitForMultipleObjects 최대 핸들 수(64)에서 깨우기 이벤트 하나를 뺀 값
+MAX_KEYS_PER_WAIT = 63
+
+# 없는 키는 이 키까지만 상위 키로 올라가서 감시 (그 위는 hive 전체의 쓰기마다 깨어나므로 폴링)
+NOTIFY_ROOT = ('SOFTWARE', 'MICROSOFT', 'OFFICE')
+# 알림을 등록하지 못한 키의 폴링 간격 (초)
+UNARMED_POLL_INTERVAL = 5.0
+
+KeyState = Optional[Dict[str, object]]
+
+
+def diff_key_state(old: KeyState, new: KeyState,
+                   value_names: Sequence[str]) -> List[Tuple[str, Optional[str], object, object]]:
+    """키 하나의 이전/현재 값 비교 ([(이벤트, 값 이름, 이전 값, 현재 값)])
+
+    이벤트는 key_created, key_deleted(값 이름 None), value_changed입니다.
+    """
+    if old is None and new is not None:
+        return [('key_created', None, None, new)]
+    if old is not None and new is None:
+        return [('key_deleted', None, old, None)]
+    if old is None:
+        return []
+    return [('value_changed', name, old.get(name), new.get(name))
+            for name in value_names if old.get(name) != new.get(name)]
+
+
+class RegistryChangeEvent:
+    """레지스트리 변경 알림"""
+
+    __slots__ = ('event', 'key', 'value', 'old', 'new', 'detected_at', 'source')
+
+    def __init__(self, event: str, key: str, value: Optional[str], old, new, detected_at: float, source: str):
+        self.event = event
+        self.key = key
+        self.value = value
+        self.old = old
+        self.new = new
+        self.detected_at = detected_at
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"RegistryChangeEvent({self.event}, {self.key!r}, {self.value!r}, {self.old!r} -> {self.new!r})"
+
+
+class RegistryWatcher:
+    """레지스트리 변경 알림 기반 감시 인터페이스
+
+    감시 스레드 하나가 변경 알림을 받은 키만 다시 읽어 이전 값과 비교하고, 바뀐 값마다
+    callback(RegistryChangeEvent)을 호출합니다. 알림이 없으면 키를 읽지 않습니다.
+    감시 키의 값이나 목록이 바뀔 때마다 generation이 증가합니다. 하위 클래스는 알림을 받으면 _notify(키 경로)를 호출합니다.
+    """
+
+    name = 'base'
+
+    def __init__(self, pool: RegistryKeyPool, value_names: Sequence[str] = ('VBAWarnings', 'AccessVBOM')):
+        self.logger = Logger('registry_watch')
+        self.pool = pool
+        self.value_names = list(value_names)
+        self.reads = 0
+        self.generation = 0
+        self._callback: Optional[Callable[[RegistryChangeEvent], None]] = None
+        self._keys: List[str] = []
+        self._state: Dict[str, KeyState] = {}
+        self._pending: Set[str] = set()
+        self._pending_lock = Lock()
+        # 감시 키/기준 상태와 알림 등록은 감시 스레드와 set_keys 호출자가 함께 사용
+        self._state_lock = Lock()
+        self._attach_lock = Lock()
+        self._signal = Event()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    @classmethod
+    def is_available(cls, pool: RegistryKeyPool) -> bool:
+        return False
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, key_paths: Iterable[str], callback: Callable[[RegistryChangeEvent], None]) -> bool:
+        if self.running:
+            return False
+        self._callback = callback
+        self._keys = list(key_paths)
+        self._state = {key_path: self._read(key_path) for key_path in self._keys}
+        self.generation += 1
+        self._stop_event.clear()
+        self._signal.clear()
+        with self._attach_lock:
+            self._attach()
+        self._thread = Thread(target=self._run_safe, name=f'registry_watch_{self.name}', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        self._signal.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        with self._attach_lock:
+            self._detach()
+
+    def set_keys(self, key_paths: Iterable[str]) -> bool:
+        """감시 대상 키 변경 (바뀌었으면 True, 새 키의 현재 값이 기준 상태)"""
+        key_paths = list(key_paths)
+        with self._state_lock:
+            if key_paths == self._keys:
+                return False
+            for key_path in key_paths:
+                if key_path not in self._state:
+                    self._state[key_path] = self._read(key_path)
+            for key_path in set(self._state) - set(key_paths):
+                del self._state[key_path]
+            self._keys = key_paths
+            self.generation += 1
+        with self._attach_lock:
+            if self.running:
+                self._detach()
+                self._attach()
+        return True
+
+    def _attach(self):
+        """알림 등록 (하위 클래스)"""
+
+    def _detach(self):
+        """알림 해제 (하위 클래스)"""
+
+    def _notify(self, key_path: str):
+        with self._pending_lock:
+            self._pending.add(key_path)
+        self._signal.set()
+
+    def _read(self, key_path: str) -> KeyState:
+        self.reads += 1
+        try:
+            values = self.pool.read_values(key_path, self.value_names)
+        except OSError:
+            return None
+        return {name: value for name, (value, _) in values.items()}
+
+    def _run_safe(self):
+        try:
+            self._run()
+        except Exception as e:
+            self.logger.error(f"레지스트리 감시 오류 ({self.name}): {e}")
+        finally:
+            with self._attach_lock:
+                self._detach()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._signal.wait()
+            self._signal.clear()
+            if self._stop_event.is_set():
+                return
+            with self._pending_lock:
+                pending, self._pending = self._pending, set()
+            for key_path in self._keys:
+                if key_path in pending:
+                    self._refresh(key_path)
+
+    def _refresh(self, key_path: str):
+        with self._state_lock:
+            if key_path not in self._state:
+                return
+            new = self._read(key_path)
+            old = self._state[key_path]
+            self._state[key_path] = new
+            changes = diff_key_state(old, new, self.value_names)
+            if changes:
+                self.generation += 1
+        detected_at = time.time()
+        for event, value_name, old_value, new_value in changes:
+            try:
+                self._callback(RegistryChangeEvent(event, key_path, value_name, old_value, new_value,
+                                                   detected_at, self.name))
+            except Exception as e:
+                self.logger.error(f"레지스트리 변경 이벤트 처리 중 오류 발생: {e}")
+
+
+class MemoryRegistryWatcher(RegistryWatcher):
+    """메모리 레지스트리의 변경 알림 (테스트, Windows 이외 환경)"""
+
+    name = 'memory'
+
+    def __init__(self, pool: RegistryKeyPool, value_names: Sequence[str] = ('VBAWarnings', 'AccessVBOM')):
+        super().__init__(pool, value_names)
+        self._targets: Dict[str, List[str]] = {}
+
+    @classmethod
+    def is_available(cls, pool: RegistryKeyPool) -> bool:
+        return isinstance(pool.backend, MemoryRegistryBackend)
+
+    def _attach(self):
+        targets: Dict[str, List[str]] = {}
+        for key_path in self._keys:
+            targets.setdefault(normalize_key_path(key_path), []).append(key_path)
+        self._targets = targets
+        self.pool.backend.add_listener(self._on_change)
+
+    def _detach(self):
+        self.pool.backend.remove_listener(self._on_change)
+
+    def _on_change(self, key_path: str):
+        changed = normalize_key_path(key_path)
+        prefix = changed + '\\'
+        for target, key_paths in self._targets.items():
+            # 감시 키 자체 또는 상위 키가 만들어지거나 삭제된 경우
+            if target == changed or target.startswith(prefix):
+                for watched in key_paths:
+                    self._notify(watched)
+
+
+class WinregNotifyWatcher(RegistryWatcher):
+    """Windows: RegNotifyChangeKeyValue 알림
+
+    대기 스레드 하나가 최대 63개 키의 알림 이벤트를 WaitForMultipleObjects로 함께
+    기다립니다. 아직 없는 키는 Software\\Microsoft\\Office까지의 가장 가까운 상위 키를
+    하위 트리 포함으로 감시하다가, 알림이 오면 다시 등록합니다. Office 키도 없으면
+    UNARMED_POLL_INTERVAL초마다 다시 읽습니다. 알림은 한 번 발생하면 해제되므로 매번
+    다시 등록합니다.
+    """
+
+    name = 'winreg'
+
+    def __init__(self, pool: RegistryKeyPool, value_names: Sequence[str] = ('VBAWarnings', 'AccessVBOM')):
+        super().__init__(pool, value_names)
+        self._waiters: List[Thread] = []
+        self._wake_events: List[object] = []
+        self._generation = 0
+
+    @classmethod
+    def is_available(cls, pool: RegistryKeyPool) -> bool:
+        return (sys.platform == 'win32' and win32event is not None
+                and isinstance(pool.backend, WinregBackend))
+
+    def _attach(self):
+        self._generation += 1
+        for start in range(0, len(self._keys), MAX_KEYS_PER_WAIT):
+            group = self._keys[start:start + MAX_KEYS_PER_WAIT]
+            wake = win32event.CreateEvent(None, False, False, None)
+            thread = Thread(target=self._wait_group, args=(group, wake, self._generation),
+                            name=f'registry_watch_wait_{start // MAX_KEYS_PER_WAIT}', daemon=True)
+            self._wake_events.append(wake)
+            self._waiters.append(thread)
+            thread.start()
+
+    def _detach(self):
+        # 대기 스레드는 generation이 바뀐 것을 보고 종료
+        self._generation += 1
+        for wake in self._wake_events:
+            try:
+                win32event.SetEvent(wake)
+            except pywintypes.error:
+                # 오류로 먼저 끝난 대기 스레드의 이벤트는 이미 닫혀 있음
+                pass
+        for thread in self._waiters:
+            if thread.is_alive():
+                thread.join(timeout=5.0)
+        self._waiters = []
+        self._wake_events = []
+
+    @staticmethod
+    def _min_watch_depth(parts: List[str]) -> int:
+        """상위 키로 올라갈 수 있는 최소 깊이 (Office 키 아래가 아니면 키 자체만)"""
+        upper = [part.upper() for part in parts]
+        for index in range(len(upper) - len(NOTIFY_ROOT) + 1):
+            if tuple(upper[index:index + len(NOTIFY_ROOT)]) == NOTIFY_ROOT:
+                return index + len(NOTIFY_ROOT)
+        return len(parts)
+
+    def _arm(self, key_path: str):
+        """키(없으면 Office 키까지의 가장 가까운 상위 키)에 알림 등록 ((키 핸들, 이벤트) 또는 None)
+
+        알림 등록은 등록한 스레드가 끝나면 취소되므로 대기 스레드에서 호출합니다.
+        """
+        hive_name, path = split_key_path(key_path)
+        parts = [part for part in path.split('\\') if part]
+        for depth in range(len(parts), self._min_watch_depth(parts) - 1, -1):
+            try:
+                handle = win32api.RegOpenKeyEx(getattr(win32con, hive_name), '\\'.join(parts[:depth]), 0,
+                                               win32con.KEY_NOTIFY)
+            except pywintypes.error:
+                continue
+            event = win32event.CreateEvent(None, False, False, None)
+            win32api.RegNotifyChangeKeyValue(handle, depth < len(parts),
+                                             REG_NOTIFY_CHANGE_NAME | REG_NOTIFY_CHANGE_LAST_SET, event, True)
+            return handle, event
+        return None
+
+    @staticmethod
+    def _disarm(armed):
+        handle, event = armed
+        handle.Close()
+        event.Close()
+
+    def _wait_group(self, key_paths: List[str], wake, generation: int):
+        armed: Dict[str, Tuple] = {}
+        try:
+            while not self._stop_event.is_set() and generation == self._generation:
+                for key_path in key_paths:
+                    if key_path not in armed:
+                        entry = self._arm(key_path)
+                        if entry is not None:
+                            armed[key_path] = entry
+                paths = [key_path for key_path in key_paths if key_path in armed]
+                unarmed = [key_path for key_path in key_paths if key_path not in armed]
+                timeout = int(UNARMED_POLL_INTERVAL * 1000) if unarmed else win32event.INFINITE
+                result = win32event.WaitForMultipleObjects([wake] + [armed[path][1] for path in paths],
+                                                           False, timeout)
+                if result == win32event.WAIT_TIMEOUT:
+                    # 알림을 등록하지 못한 키는 다시 읽어 비교 (다음 반복에서 다시 등록 시도)
+                    for key_path in unarmed:
+                        self._notify(key_path)
+                    continue
+                index = result - win32event.WAIT_OBJECT_0
+                if 1 <= index <= len(paths):
+                    key_path = paths[index - 1]
+                    self._disarm(armed.pop(key_path))
+                    self._notify(key_path)
+        except pywintypes.error as e:
+            self.logger.error(f"레지스트리 알림 대기 실패: {e}")
+        finally:
+            for entry in armed.values():
+                self._disarm(entry)
+            wake.Close()
+
+
+def create_registry_watcher(pool: RegistryKeyPool,
+                            value_names: Sequence[str] = ('VBAWarnings', 'AccessVBOM')) -> Optional[RegistryWatcher]:
+    """저장소에 맞는 알림 기반 감시 (사용할 수 없으면 None: 폴링으로 대체)"""
+    for watcher_class in (WinregNotifyWatcher, MemoryRegistryWatcher):
+        if watcher_class.is_available(pool):
+            return watcher_class(pool, value_names)
+    return None
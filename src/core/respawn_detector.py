@@ -0,0 +1,111 @@
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional
+from threading import Lock
+from .logger import Logger
+
+
+class _RespawnState:
+    """실행 파일별 종료 이력"""
+
+    __slots__ = ('kills', 'storm_since', 'last_kill', 'last_summary',
+                 'pending_kills', 'total_kills', 'parents')
+
+    def __init__(self):
+        self.kills = deque()
+        self.storm_since: Optional[float] = None
+        self.last_kill = 0.0
+        self.last_summary = 0.0
+        self.pending_kills = 0
+        self.total_kills = 0
+        self.parents = Counter()
+
+
+class RespawnDetector:
+    """같은 실행 파일이 반복해서 다시 실행되는 상황(respawn storm) 감지
+
+    window 초 안에 threshold 번 이상 종료되면 반복 실행으로 판단합니다.
+    반복 실행 중에는 종료할 때마다 로그를 남기지 않고 summary_interval 마다
+    요약만 기록하며, cooldown 초 동안 다시 종료할 일이 없으면 해제합니다.
+    """
+
+    def __init__(self, threshold: int = 3, window: float = 30.0, cooldown: float = 60.0,
+                 summary_interval: float = 30.0, logger: Optional[Logger] = None):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.summary_interval = summary_interval
+        self.logger = logger or Logger('respawn_detector')
+        self._states: Dict[str, _RespawnState] = {}
+        self._lock = Lock()
+
+    def record_kill(self, name: str, parent_name: Optional[str] = None,
+                    now: Optional[float] = None) -> bool:
+        """종료 기록 후 반복 실행 중인지 반환 (True면 개별 로그 생략)"""
+        now = time.monotonic() if now is None else now
+        name = name.upper()
+        with self._lock:
+            state = self._states.setdefault(name, _RespawnState())
+            state.kills.append(now)
+            state.last_kill = now
+            if parent_name:
+                state.parents[parent_name] += 1
+            while state.kills and now - state.kills[0] > self.window:
+                state.kills.popleft()
+
+            if state.storm_since is None:
+                if len(state.kills) < self.threshold:
+                    return False
+                state.storm_since = now
+                state.last_summary = now
+                state.total_kills = len(state.kills)
+                self.logger.warning(
+                    f"반복 실행 감지: {name} ({self.window:.0f}초 동안 {len(state.kills)}회 종료"
+                    f"{self._format_parents(state)}) - 집중 감시로 전환합니다."
+                )
+                return True
+
+            state.pending_kills += 1
+            state.total_kills += 1
+            return True
+
+    def is_storm(self, name: str) -> bool:
+        with self._lock:
+            state = self._states.get(name.upper())
+            return state is not None and state.storm_since is not None
+
+    def active_storms(self) -> List[str]:
+        with self._lock:
+            return [name for name, state in self._states.items() if state.storm_since is not None]
+
+    def tick(self, now: Optional[float] = None):
+        """요약 로그 기록 및 진정된 반복 실행 해제"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for name, state in list(self._states.items()):
+                if state.storm_since is None:
+                    if not state.kills or now - state.kills[-1] > self.window:
+                        del self._states[name]
+                    continue
+
+                if state.pending_kills and now - state.last_summary >= self.summary_interval:
+                    self.logger.warning(
+                        f"반복 실행 계속: {name} (최근 {now - state.last_summary:.0f}초 동안 "
+                        f"{state.pending_kills}회 종료, 누적 {state.total_kills}회{self._format_parents(state)})"
+                    )
+                    state.pending_kills = 0
+                    state.last_summary = now
+
+                if now - state.last_kill >= self.cooldown:
+                    self.logger.info(
+                        f"반복 실행 종료: {name} ({now - state.storm_since:.0f}초 동안 "
+                        f"총 {state.total_kills}회 종료{self._format_parents(state)})"
+                    )
+                    del self._states[name]
+
+    @staticmethod
+    def _format_parents(state: _RespawnState) -> str:
+        if not state.parents:
+            return ''
+        parents = ', '.join(f"{name} {count}회" for name, count in state.parents.most_common(3))
+        return f", 상위 프로세스: {parents}"
@@ -0,0 +1,138 @@
+import time
+from typing import Callable, Dict, List, Optional
+from threading import Event, Lock
+from .logger import Logger
+
+
+class ProbeStats:
+    """프로브 실행 시간 통계"""
+
+    __slots__ = ('runs', 'changes', 'total_time', 'min_time', 'max_time', 'last_time')
+
+    def __init__(self):
+        self.runs = 0
+        self.changes = 0
+        self.total_time = 0.0
+        self.min_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def record(self, duration: float, changed: bool):
+        """한 번의 실행 결과를 누적"""
+        if self.runs == 0 or duration < self.min_time:
+            self.min_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.runs += 1
+        self.total_time += duration
+        self.last_time = duration
+        if changed:
+            self.changes += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            'runs': self.runs,
+            'changes': self.changes,
+            'total_time': self.total_time,
+            'avg_time': self.total_time / self.runs if self.runs else 0.0,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+            'last_time': self.last_time
+        }
+
+
+class Probe:
+    """주기적으로 실행되는 점검 작업
+
+    func는 변경이 감지되었는지 여부를 반환합니다. 변경이 없으면 간격을
+    backoff 배수만큼 늘리고(최대 max_interval), 변경이 있으면 min_interval로 되돌립니다.
+    """
+
+    def __init__(self, name: str, func: Callable[[], bool], min_interval: float,
+                 max_interval: float, backoff: float = 2.0):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f"Invalid probe interval: {min_interval} ~ {max_interval}")
+        self.name = name
+        self.func = func
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.next_run = 0.0
+        self.stats = ProbeStats()
+
+    def run(self, now: float) -> bool:
+        start = time.perf_counter()
+        changed = bool(self.func())
+        self.stats.record(time.perf_counter() - start, changed)
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        self.next_run = now + self.interval
+        return changed
+
+
+class ProbeScheduler:
+    """프로브별 간격으로 점검 작업을 실행하는 스케줄러
+
+    stop_event를 기다리는 방식으로 대기하므로 중지 요청에 즉시 반응합니다.
+    """
+
+    def __init__(self, stop_event: Event, name: str = 'scheduler'):
+        self.logger = Logger(name)
+        self.stop_event = stop_event
+        self.probes: List[Probe] = []
+        self._lock = Lock()
+
+    def add_probe(self, name: str, func: Callable[[], bool], interval: float,
+                  max_interval: Optional[float] = None, backoff: float = 2.0) -> Probe:
+        """프로브 등록 (max_interval 미지정 시 백오프 없음)"""
+        probe = Probe(name, func, interval, max_interval or interval, backoff)
+        with self._lock:
+            self.probes.append(probe)
+        return probe
+
+    def wake(self, name: Optional[str] = None):
+        """프로브를 즉시 실행 대상으로 만들고 간격을 최소값으로 되돌림"""
+        with self._lock:
+            for probe in self.probes:
+                if name is None or probe.name == name:
+                    probe.interval = probe.min_interval
+                    probe.next_run = 0.0
+
+    def run(self):
+        """stop_event가 설정될 때까지 프로브 실행"""
+        while not self.stop_event.is_set():
+            with self._lock:
+                probes = list(self.probes)
+            if not probes:
+                self.stop_event.wait(1.0)
+                continue
+
+            now = time.monotonic()
+            for probe in probes:
+                if self.stop_event.is_set():
+                    return
+                if probe.next_run <= now:
+                    try:
+                        probe.run(now)
+                    except Exception as e:
+                        self.logger.error(f"프로브 실행 중 오류 발생 ({probe.name}): {e}")
+                        probe.interval = probe.max_interval
+                        probe.next_run = now + probe.interval
+
+            next_run = min(probe.next_run for probe in probes)
+            delay = next_run - time.monotonic()
+            if delay > 0:
+                self.stop_event.wait(delay)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """프로브별 실행 시간 통계 및 현재 간격 반환"""
+        with self._lock:
+            stats = {}
+            for probe in self.probes:
+                probe_stats = probe.stats.as_dict()
+                probe_stats['interval'] = probe.interval
+                stats[probe.name] = probe_stats
+            return stats
@@ -1,3 +1,4 @@
+import copy
 import ctypes
 import sys
 import os
@@ -12,22 +13,54 @@ import win32event
 import win32service
 import win32serviceutil
 import winerror
-import hashlib
 import json
 from datetime import datetime
 import psutil
 from .logger import Logger, measure_time
+from .process_snapshot import ProcessSnapshotProvider, get_process_snapshot_provider
+from .policy import DEFAULT_POLICY, SecurityPolicy, get_policy_store
+from .registry_patterns import compile_registry_pattern
+from .file_hash import FileHashVerifier
+from .process_paths import ProcessPathIndex
+from .audit_writer import AuditLogWriter
+from .audit_store import AuditStore
+from .log_rotation import rotation_options
 import time
 
 class SecurityManager:
-    def __init__(self):
+    def __init__(self, process_provider: Optional[ProcessSnapshotProvider] = None):
         self.logger = Logger('security')
-        self.security_policy = self._load_security_policy()
-        self.audit_log = []
+        # 검증과 컴파일이 끝난 공유 보안 정책 (파일이 바뀌면 새 정책으로 교체)
+        self.policy_store = get_policy_store()
+        # 감사 로그는 백그라운드 기록기가 묶어서 파일에 기록하고, 최근 기록만 메모리에 보관
+        audit_settings = self.security_policy.audit_settings
+        log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+        # 크기/기간 기준 로테이션, 압축, 보존 기간은 audit_settings를 따름
+        self.audit_store = AuditStore(os.path.join(log_dir, 'audit'), **rotation_options(audit_settings))
+        self._migrate_legacy_audit_log(os.path.join(log_dir, 'audit.log'))
+        self.audit_writer = AuditLogWriter(
+            self.audit_store,
+            durability=audit_settings.get("durability", "flush"),
+            ring_size=audit_settings.get("memory_entries", 1000)
+        )
+        self.audit_log = self.audit_writer.recent
         self.is_admin = self._is_admin()
-        self._process_cache = None
-        self._process_cache_time = 0
-        self._process_cache_ttl = 1  # 1초 캐시
+        self.process_provider = process_provider or get_process_snapshot_provider()
+        # PID → 실행 파일 경로 색인 (프로세스 시작/종료 시에만 갱신)
+        self.process_paths = ProcessPathIndex(self.process_provider)
+        # 실행 파일 해시는 (경로, 크기, 수정 시각, 파일 ID) 기준으로 캐시
+        self.hash_verifier = FileHashVerifier(require_trusted=self.security_policy.require_trusted_hash)
+        self.policy_store.subscribe(self._on_policy_reloaded)
+
+    @property
+    def security_policy(self) -> SecurityPolicy:
+        """현재 보안 정책"""
+        return self.policy_store.current
+
+    def _on_policy_reloaded(self, policy: SecurityPolicy) -> None:
+        """정책이 다시 로드되면 해시 검증 설정을 갱신"""
+        self.hash_verifier.require_trusted = policy.require_trusted_hash
+        self.audit_action("policy_reload", {"version": policy.version, "path": policy.source_path})
 
     def _is_admin(self) -> bool:
         """현재 프로세스가 관리자 권한으로 실행 중인지 확인"""
@@ -72,13 +105,14 @@ class SecurityManager:
         """필요한 권한을 확인합니다."""
         try:
             # 관리자 권한 확인
-            if self.security_policy["require_admin"]:
+            policy = self.security_policy
+            if policy.require_admin:
                 if not self._is_admin():
                     self.logger.warning("관리자 권한이 필요합니다.")
                     return False
                     
             # 원격 접근 차단 확인
-            if self.security_policy["block_remote_access"]:
+            if policy.block_remote_access:
                 if self._is_remote_session():
                     self.logger.warning("원격 세션에서의 접근이 차단되었습니다.")
                     return False
@@ -118,35 +152,17 @@ class SecurityManager:
 
     @measure_time
     def _load_security_policy(self) -> Dict:
-        """보안 정책을 로드합니다."""
+        """보안 정책을 다시 확인하고 현재 값을 사전으로 반환합니다."""
         try:
-            policy_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'security_policy.json')
-            if os.path.exists(policy_path):
-                with open(policy_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return self._create_default_policy()
+            self.policy_store.reload()
+            return self.security_policy.to_dict()
         except Exception as e:
             self.logger.error(f"보안 정책 로드 실패: {str(e)}")
             return self._create_default_policy()
             
     def _create_default_policy(self) -> Dict:
         """기본 보안 정책을 생성합니다."""
-        return {
-            "require_admin": True,
-            "block_remote_access": True,
-            "audit_changes": True,
-            "max_failed_attempts": 3,
-            "session_timeout": 3600,  # 1시간
-            "allowed_processes": [
-                "EXCEL.EXE",
-                "WINWORD.EXE",
-                "POWERPNT.EXE"
-            ],
-            "blocked_registry_keys": [
-                "HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\VBAWarnings",
-                "HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\AccessVBOM"
-            ]
-        }
+        return copy.deepcopy(DEFAULT_POLICY)
         
     def _is_remote_session(self) -> bool:
         """원격 세션 여부를 확인합니다."""
@@ -159,7 +175,7 @@ class SecurityManager:
     @measure_time
     def audit_action(self, action: str, details: Dict) -> None:
         """보안 관련 작업을 감사합니다."""
-        if not self.security_policy["audit_changes"]:
+        if not self.security_policy.audit_changes:
             return
             
         try:
@@ -171,43 +187,76 @@ class SecurityManager:
                 "session_id": win32ts.WTSGetActiveConsoleSessionId()
             }
             
-            self.audit_log.append(audit_entry)
-            self._save_audit_log()
+            # 큐에 넣고 바로 반환 (파일 기록은 백그라운드에서 일괄 처리)
+            self.audit_writer.submit(audit_entry)
             
             self.logger.info(f"감사 로그 기록: {action}")
         except Exception as e:
             self.logger.error(f"감사 로그 기록 중 오류 발생: {str(e)}")
             
-    def _save_audit_log(self) -> None:
-        """감사 로그를 파일에 저장합니다."""
+    def close(self) -> None:
+        """대기 중인 감사 로그를 모두 기록하고 종료합니다."""
         try:
-            log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-            os.makedirs(log_dir, exist_ok=True)
+            self.policy_store.unsubscribe(self._on_policy_reloaded)
+            self.audit_writer.close()
+            self.process_paths.close()
+        except Exception as e:
+            self.logger.error(f"보안 관리자 종료 중 오류 발생: {str(e)}")
             
-            log_file = os.path.join(log_dir, 'audit.log')
-            with open(log_file, 'a', encoding='utf-8') as f:
-                json.dump(self.audit_log[-1], f)
-                f.write('\n')
+    def _migrate_legacy_audit_log(self, log_file: str) -> None:
+        """이전 버전의 audit.log를 감사 로그 저장소로 이전합니다."""
+        if not os.path.exists(log_file):
+            return
+        try:
+            entries = []
+            with open(log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entries.append(json.loads(line))
+                    if len(entries) >= 1000:
+                        self.audit_store.append_many(entries)
+                        entries = []
+            self.audit_store.append_many(entries, durability='fsync')
+            os.remove(log_file)
+            self.logger.info("이전 감사 로그를 감사 로그 저장소로 이전했습니다.")
         except Exception as e:
-            self.logger.error(f"감사 로그 저장 중 오류 발생: {str(e)}")
+            self.logger.error(f"이전 감사 로그 이전 중 오류 발생: {str(e)}")
             
     @measure_time
     def get_audit_log(self, limit: int = 100) -> List[Dict]:
         """감사 로그를 조회합니다."""
         try:
-            return self.audit_log[-limit:]
+            # 이번 실행의 최근 기록으로 충분하면 메모리에서 바로 반환
+            recent = list(self.audit_log)
+            if len(recent) >= limit:
+                return recent[-limit:]
+            self.audit_writer.flush()
+            return self.audit_store.tail(limit)
         except Exception as e:
             self.logger.error(f"감사 로그 조회 중 오류 발생: {str(e)}")
             return []
             
+    @measure_time
+    def query_audit_log(self, start=None, end=None, action=None, user: Optional[str] = None,
+                        session_id=None, limit: int = 100, cursor: Optional[str] = None) -> Dict:
+        """조건(기간, 작업, 사용자, 세션)으로 감사 로그를 페이지 단위로 조회합니다.
+        
+        결과의 next_cursor를 cursor로 전달하면 다음 페이지를 조회합니다.
+        """
+        try:
+            self.audit_writer.flush()
+            entries, next_cursor = self.audit_store.query(start, end, action, user, session_id,
+                                                          limit, cursor)
+            return {"entries": entries, "next_cursor": next_cursor}
+        except Exception as e:
+            self.logger.error(f"감사 로그 조회 중 오류 발생: {str(e)}")
+            return {"entries": [], "next_cursor": None}
+            
     @measure_time
     def clear_audit_log(self) -> None:
         """감사 로그를 초기화합니다."""
         try:
-            self.audit_log.clear()
-            log_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs', 'audit.log')
-            if os.path.exists(log_file):
-                os.remove(log_file)
+            self.audit_writer.clear()
             self.logger.info("감사 로그가 초기화되었습니다.")
         except Exception as e:
             self.logger.error(f"감사 로그 초기화 중 오류 발생: {str(e)}")
@@ -217,14 +266,10 @@ class SecurityManager:
         """프로세스 보안 검증 (캐시 적용)"""
         try:
             process_name = process_name.upper()
-            if process_name not in self.security_policy["allowed_processes"]:
+            if process_name not in self.security_policy.allowed_processes:
                 self.logger.warning(f"허용되지 않은 프로세스: {process_name}")
                 return False
-            now = time.time()
-            if self._process_cache is None or now - self._process_cache_time > self._process_cache_ttl:
-                self._process_cache = [proc.info['name'].upper() for proc in psutil.process_iter(['name']) if proc.info['name']]
-                self._process_cache_time = now
-            if process_name in self._process_cache:
+            if self.process_provider.snapshot().find([process_name]):
                 return True
             self.logger.warning(f"프로세스 무결성 검증 실패: {process_name}")
             return False
@@ -235,14 +280,15 @@ class SecurityManager:
     def _verify_process_integrity(self, process_name: str) -> bool:
         """프로세스의 무결성을 검증합니다."""
         try:
-            # 프로세스 경로 확인
-            process_path = self._get_process_path(process_name)
-            if not process_path:
+            # 실행 중인 같은 이름의 프로세스들의 실행 파일 경로 (색인 조회)
+            process_paths = self.process_paths.get_paths(process_name)
+            if not process_paths:
                 return False
                 
-            # 파일 해시 검증
-            if not self._verify_file_hash(process_path):
-                return False
+            # 파일 해시 검증 (변경되지 않은 파일은 캐시된 해시 사용)
+            for process_path in process_paths:
+                if not self._verify_file_hash(process_path):
+                    return False
                 
             return True
         except Exception as e:
@@ -252,46 +298,40 @@ class SecurityManager:
     def _get_process_path(self, process_name: str) -> Optional[str]:
         """프로세스의 실행 경로를 가져옵니다."""
         try:
-            for proc in win32process.EnumProcesses():
-                try:
-                    handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, proc)
-                    if handle:
-                        path = win32process.GetModuleFileNameEx(handle, 0)
-                        if os.path.basename(path).upper() == process_name.upper():
-                            return path
-                except:
-                    continue
-            return None
+            process_paths = self.process_paths.get_paths(process_name)
+            return min(process_paths) if process_paths else None
         except Exception as e:
             self.logger.error(f"프로세스 경로 조회 중 오류 발생: {str(e)}")
             return None
             
     def _verify_file_hash(self, file_path: str) -> bool:
-        """파일의 해시를 검증합니다."""
+        """파일의 해시를 신뢰할 수 있는 해시 목록과 비교하여 검증합니다."""
         try:
-            # 실제 구현에서는 신뢰할 수 있는 해시값과 비교해야 합니다
-            # 여기서는 간단한 검증만 수행
-            if not os.path.exists(file_path):
+            if not self.hash_verifier.verify(file_path):
                 return False
-                
-            with open(file_path, 'rb') as f:
-                file_hash = hashlib.sha256(f.read()).hexdigest()
-                
-            # TODO: 신뢰할 수 있는 해시값과 비교
+            self.hash_verifier.cache.save()
             return True
         except Exception as e:
             self.logger.error(f"파일 해시 검증 중 오류 발생: {str(e)}")
             return False
+
+    @measure_time
+    def verify_file_hashes(self, file_paths: List[str]) -> Dict[str, bool]:
+        """여러 실행 파일의 해시를 병렬로 검증합니다."""
+        try:
+            return self.hash_verifier.verify_many(file_paths)
+        except Exception as e:
+            self.logger.error(f"파일 해시 일괄 검증 중 오류 발생: {str(e)}")
+            return {path: False for path in file_paths}
             
     @measure_time
     def check_registry_security(self, key_path: str) -> bool:
         """레지스트리 키의 보안 상태를 확인합니다."""
         try:
             # 차단된 레지스트리 키 확인
-            for blocked_key in self.security_policy["blocked_registry_keys"]:
-                if self._match_registry_pattern(key_path, blocked_key):
-                    self.logger.warning(f"차단된 레지스트리 키 접근: {key_path}")
-                    return False
+            if self.security_policy.registry_patterns.matches(key_path):
+                self.logger.warning(f"차단된 레지스트리 키 접근: {key_path}")
+                return False
                     
             return True
         except Exception as e:
@@ -299,16 +339,10 @@ class SecurityManager:
             return False
             
     def _match_registry_pattern(self, key: str, pattern: str) -> bool:
-        """레지스트리 키가 패턴과 일치하는지 확인"""
+        """레지스트리 키가 패턴과 일치하는지 확인 (대소문자 무시)"""
         try:
-            # 와일드카드 패턴을 정규식 패턴으로 변환
-            pattern = pattern.replace('\\', '\\\\')  # 백슬래시 이스케이프
-            pattern = pattern.replace('.', '\\.')    # 점 이스케이프
-            pattern = pattern.replace('*', '.*')     # 와일드카드 변환
-            pattern = f'^{pattern}$'                 # 전체 문자열 매칭
-            
-            import re
-            return bool(re.match(pattern, key))
+            # 컴파일된 정규식은 패턴별로 캐시됨
+            return bool(compile_registry_pattern(pattern).match(key))
         except Exception as e:
             self.logger.error(f"레지스트리 패턴 매칭 중 오류 발생: {str(e)}")
             return False 
\ No newline at end of file
@@ -0,0 +1,159 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+from threading import Lock
+from .logger import Logger, measure_time
+from .registry import RegistryManager
+from .registry_backend import OfflineHiveBackend, RegistryBackend, create_registry_backend
+from .registry_pool import RegistryKeyPool
+
+# 로컬/도메인 사용자(S-1-5-21-...)와 Azure AD 사용자(S-1-12-1-...) hive
+# S-1-5-18 등 시스템 계정, .DEFAULT, <SID>_Classes는 제외
+USER_SID_PATTERN = re.compile(r'^S-1-(5-21|12-1)(-\d+)+$', re.IGNORECASE)
+
+DEFAULT_MAX_WORKERS = 16
+
+# 오프라인 hive는 읽기 전용이므로 기록하는 작업은 수행하지 않음
+WRITE_OPERATIONS = ('apply', 'restore')
+
+
+def list_user_sids(pool: RegistryKeyPool) -> List[str]:
+    """HKEY_USERS 아래에 로드된 사용자 hive의 SID 목록"""
+    with pool.acquire('HKEY_USERS\\') as key:
+        return sorted(sid for sid in key.subkeys() if USER_SID_PATTERN.match(sid))
+
+
+class UserHiveFanout:
+    """모든 사용자 hive에 VBA 차단 정책을 적용/확인/백업
+
+    HKEY_USERS 아래에 로드된 사용자 hive마다 RegistryManager(대상 hive
+    HKEY_USERS\\<SID>)를 만들어 스레드 풀에서 함께 실행합니다. 로드된 hive는 하나의
+    키 핸들 풀을 공유하고, 사용자별 Office 키 색인과 백업 폴더(backup_path\\<SID>)는
+    다음 실행에서도 재사용합니다.
+
+    offline_hives로 {이름: NTUSER.DAT 경로 또는 Registry 객체}를 지정하면 로그온하지
+    않은 사용자도 HKEY_USERS\\<이름>에 연결하여 함께 처리합니다. 오프라인 hive는
+    python-registry로 읽기만 하므로 확인과 백업만 수행하고, 적용/복원은 파일에 기록할 수
+    없어 수행하지 않고 실패(reason 'offline_readonly')로 보고합니다.
+    """
+
+    def __init__(self, backend: Optional[RegistryBackend] = None, backup_path: Optional[str] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, max_handles: int = 1024,
+                 offline_hives: Optional[Dict[str, object]] = None):
+        self.logger = Logger('user_hives')
+        # 사용자 수백 명의 보안 키를 다시 열지 않도록 공유 풀보다 큰 전용 풀 사용
+        self.pool = RegistryKeyPool(backend or create_registry_backend(), max_handles=max_handles)
+        self.backup_path = backup_path or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'backups', 'users')
+        self.max_workers = max_workers
+        self.offline_hives = dict(offline_hives or {})
+        self._managers: Dict[str, RegistryManager] = {}
+        self._lock = Lock()
+
+    def user_sids(self) -> List[str]:
+        """처리 대상 (로드된 사용자 hive + 오프라인 hive)"""
+        try:
+            sids = list_user_sids(self.pool)
+        except OSError as e:
+            self.logger.error(f"HKEY_USERS 조회 실패: {e}")
+            sids = []
+        return sids + [name for name in self.offline_hives if name not in sids]
+
+    def manager(self, sid: str) -> RegistryManager:
+        """사용자 hive의 RegistryManager (처음 요청할 때 생성)"""
+        with self._lock:
+            manager = self._managers.get(sid)
+        if manager is not None:
+            return manager
+
+        hive = f'HKEY_USERS\\{sid}'
+        if sid in self.offline_hives:
+            pool = RegistryKeyPool(OfflineHiveBackend({hive: self.offline_hives[sid]}))
+        else:
+            pool = self.pool
+        manager = RegistryManager(backup_path=os.path.join(self.backup_path, sid), hive=hive, pool=pool)
+        with self._lock:
+            return self._managers.setdefault(sid, manager)
+
+    def _run(self, operation: str, func: Callable[[RegistryManager], object],
+             sids: Optional[Sequence[str]] = None) -> Dict:
+        """사용자 hive마다 func를 스레드 풀에서 실행하고 결과 요약"""
+        start = time.perf_counter()
+        sids = list(dict.fromkeys(sids)) if sids is not None else self.user_sids()
+        discover = time.perf_counter() - start
+
+        def run_one(sid: str) -> Dict:
+            started = time.perf_counter()
+            entry = {'sid': sid, 'offline': sid in self.offline_hives, 'success': False,
+                     'result': None, 'error': None, 'reason': None}
+            if entry['offline'] and operation in WRITE_OPERATIONS:
+                # 메모리 오버레이에만 기록되므로 사용자 hive에 반영된 것으로 보고하지 않음
+                entry['reason'] = 'offline_readonly'
+                entry['duration'] = time.perf_counter() - started
+                return entry
+            try:
+                result = func(self.manager(sid))
+                entry['result'] = result
+                entry['success'] = result['success'] if isinstance(result, dict) else bool(result)
+            except Exception as e:
+                entry['error'] = str(e)
+                self.logger.error(f"사용자 hive 처리 중 오류 발생 ({operation}): {sid} - {e}")
+            entry['duration'] = time.perf_counter() - started
+            return entry
+
+        users: Dict[str, Dict] = {}
+        if sids:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sids)),
+                                    thread_name_prefix='user_hives') as executor:
+                for entry in executor.map(run_one, sids):
+                    users[entry['sid']] = entry
+        elapsed = time.perf_counter() - start
+
+        durations = [entry['duration'] for entry in users.values()]
+        failed = [sid for sid, entry in users.items() if not entry['success']]
+        summary = {
+            'operation': operation,
+            'success': not failed,
+            'total': len(users),
+            'succeeded': len(users) - len(failed),
+            'failed': failed,
+            'users': users,
+            'timings': {
+                'discover': discover,
+                'total': elapsed,
+                'max_user': max(durations, default=0.0),
+                'mean_user': sum(durations) / len(durations) if durations else 0.0
+            }
+        }
+        message = (f"사용자 hive {operation}: {summary['succeeded']}/{summary['total']}명 성공 "
+                   f"({elapsed:.3f}s, 최대 {summary['timings']['max_user']:.3f}s)")
+        if failed:
+            self.logger.warning(f"{message}, 실패: {', '.join(failed)}")
+        else:
+            self.logger.info(message)
+        return summary
+
+    @measure_time
+    def apply_all(self, sids: Optional[Sequence[str]] = None, **options) -> Dict:
+        """모든 사용자 hive에 apply_registry (options는 backup/verify/rollback)"""
+        return self._run('apply', lambda manager: manager.apply_registry(**options), sids)
+
+    @measure_time
+    def check_all(self, sids: Optional[Sequence[str]] = None) -> Dict:
+        """모든 사용자 hive가 VBA 차단 상태인지 확인"""
+        return self._run('check', RegistryManager.check_registry_status, sids)
+
+    @measure_time
+    def backup_all(self, sids: Optional[Sequence[str]] = None) -> Dict:
+        """모든 사용자 hive의 VBA 설정 백업 (backup_path\\<SID>)"""
+        return self._run('backup', RegistryManager.backup_registry, sids)
+
+    @measure_time
+    def restore_all(self, sids: Optional[Sequence[str]] = None) -> Dict:
+        """모든 사용자 hive를 각자의 최근 백업으로 복원"""
+        return self._run('restore', RegistryManager.restore_registry, sids)
+
+    def close(self):
+        self.pool.close()
@@ -1,22 +1,70 @@
-import win32api
-import win32con
-import win32security
-import psutil
-import logging
+import time
+from threading import Lock
+from typing import Optional, Tuple
 from .registry import RegistryManager
 from .process_monitor import ProcessMonitor
-from .security import SecurityManager
 from .change_tracker import ChangeTracker
+from .process_snapshot import ProcessSnapshotProvider, get_process_snapshot_provider
+from .process_rules import get_process_matcher
 from .logger import Logger, measure_time
 
+# 변경 알림이나 주기적인 프로세스 조회가 없을 때 차단 상태를 재사용하는 시간 (초)
+DEFAULT_STATUS_MAX_AGE = 5.0
+
+
+class VBABlockStatus:
+    """VBA 차단 상태 확인 결과"""
+
+    __slots__ = ('blocked', 'registry_blocked', 'monitoring', 'running_processes', 'checked_at', '_checked')
+
+    def __init__(self, blocked: bool, registry_blocked: bool, monitoring: bool, running_processes: int):
+        self.blocked = blocked
+        self.registry_blocked = registry_blocked
+        self.monitoring = monitoring
+        self.running_processes = running_processes
+        self.checked_at = time.time()
+        self._checked = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        """확인 후 지난 시간 (초)"""
+        return time.monotonic() - self._checked
+
+    def __repr__(self) -> str:
+        return f"VBABlockStatus(blocked={self.blocked}, age={self.age:.1f}s)"
+
+
 class VBABlocker:
-    def __init__(self):
-        self.registry_manager = RegistryManager()
-        self.process_monitor = ProcessMonitor()
-        self.security_manager = SecurityManager()
-        self.change_tracker = ChangeTracker()
+    def __init__(self, process_provider: Optional[ProcessSnapshotProvider] = None,
+                 status_max_age: float = DEFAULT_STATUS_MAX_AGE,
+                 registry_manager: Optional[RegistryManager] = None, security_manager=None):
+        # 모든 컴포넌트가 하나의 프로세스 스냅샷을 공유
+        self.process_provider = process_provider or get_process_snapshot_provider()
+        self.registry_manager = registry_manager or RegistryManager()
+        # 프로세스 규칙은 공유 보안 정책을 따르므로 정책이 다시 로드되면 함께 바뀜
+        self.process_monitor = ProcessMonitor(self.process_provider)
+        if security_manager is None:
+            # Windows 보안 API(pywin32)가 필요하므로 지정하지 않은 경우에만 로드
+            from .security import SecurityManager
+            security_manager = SecurityManager(self.process_provider)
+        self.security_manager = security_manager
+        # 변경 추적은 레지스트리 관리자와 같은 키 핸들 풀/Office 키 색인을 사용
+        self.change_tracker = ChangeTracker(process_provider=self.process_provider,
+                                            registry_pool=self.registry_manager.pool,
+                                            key_index=self.registry_manager.key_index)
         self.logger = Logger('vba_blocker')
 
+        # 차단 상태는 레지스트리 변경 알림/대상 프로세스의 generation이 바뀔 때만 다시 확인
+        self.status_max_age = status_max_age
+        self._status: Optional[Tuple[Tuple, VBABlockStatus]] = None
+        self._status_lock = Lock()
+        self._status_generation = 0
+
+    @property
+    def process_matcher(self):
+        """현재 보안 정책의 프로세스 매처"""
+        return get_process_matcher()
+
     @measure_time
     def block_vba_execution(self) -> bool:
         """VBA 실행을 차단합니다."""
@@ -33,12 +81,7 @@ class VBABlocker:
                 self.logger.error("변경 사항 추적 시작 실패")
                 return False
 
-            # 레지스트리 백업
-            if not self.registry_manager.backup_registry():
-                self.logger.error("레지스트리 백업 실패")
-                return False
-
-            # 레지스트리 수정
+            # 레지스트리 수정 (정책에 따라 백업, 검증, 실패 시 되돌리기까지 한 번에 수행)
             if not self.registry_manager.modify_registry():
                 self.logger.error("레지스트리 수정 실패")
                 return False
@@ -58,54 +101,108 @@ class VBABlocker:
         except Exception as e:
             self.logger.error(f"VBA 차단 중 오류 발생: {str(e)}")
             return False
+        finally:
+            self.invalidate_status()
 
     def _kill_vba_processes(self):
         """실행 중인 VBA 프로세스를 종료합니다."""
         try:
-            killed = False
-            for proc in self._get_vba_processes():
-                try:
-                    proc.kill()
-                    self.logger.info(f"프로세스 종료: {proc.name()} (PID: {proc.pid})")
-                    killed = True
-                except Exception as e:
-                    self.logger.error(f"프로세스 종료 실패: {proc.name()} (PID: {proc.pid}) - {str(e)}")
-            return killed
+            # ProcessMonitor와 같은 일괄 종료 경로 사용 (하위 프로세스 포함)
+            result = self.process_monitor.terminate_process_trees(self._get_vba_processes())
+            return not result['failed']
         except Exception as e:
             self.logger.error(f"VBA 프로세스 종료 중 오류 발생: {str(e)}")
             return False
 
     def _get_vba_processes(self):
         """VBA 관련 프로세스 목록을 반환합니다."""
-        target_processes = ['EXCEL.EXE', 'WINWORD.EXE', 'POWERPNT.EXE']
-        return [p for p in psutil.process_iter(['name']) 
-                if p.info['name'] in target_processes]
+        snapshot = self.process_provider.snapshot(max_age=0)
+        return self.process_matcher.filter(snapshot, snapshot)
 
-    @measure_time
     def is_vba_blocked(self) -> bool:
         """VBA 차단 상태를 확인합니다."""
-        try:
-            # 관리자 권한 확인
-            if not self.security_manager.is_admin:
-                self.logger.warning("관리자 권한이 필요합니다.")
-                return False
+        return self.get_vba_status().blocked
 
-            # 레지스트리 상태 확인
-            registry_status = self.registry_manager.check_registry_status()
-            
-            # 프로세스 모니터링 상태 확인
-            monitoring_active = self.process_monitor.monitoring
-            
-            # 실행 중인 VBA 프로세스 확인
-            running_processes = self.process_monitor.get_running_processes()
-            no_running_processes = len(running_processes) == 0
+    def get_vba_status(self) -> VBABlockStatus:
+        """VBA 차단 상태 (마지막 확인 결과 재사용, age로 결과가 얼마나 오래되었는지 확인)
 
-            is_blocked = registry_status and monitoring_active and no_running_processes
-            self.logger.debug(f"VBA 차단 상태: {is_blocked}")
-            return is_blocked
-        except Exception as e:
-            self.logger.error(f"VBA 차단 상태 확인 중 오류 발생: {str(e)}")
+        레지스트리 변경 알림, Office 키 색인, 대상 프로세스 테이블의 generation과 모니터링
+        상태가 그대로이면 다시 확인하지 않습니다. 모니터링 중에 프로세스 스냅샷이
+        status_max_age초보다 오래되었으면(시작 알림 사용 중의 긴 보조 점검 간격 등) 먼저
+        스냅샷을 갱신합니다. 레지스트리 변경 알림이나 모니터링이 없으면 status_max_age초
+        동안만 재사용합니다.
+        """
+        if self.process_monitor.monitoring and self.process_provider.snapshot_age > self.status_max_age:
+            # 대상 프로세스 변경 사항은 ProcessMonitor의 구독으로 target_generation에 반영
+            self.process_provider.snapshot(max_age=self.status_max_age)
+        # 설치된 Office 버전 색인도 먼저 확인 (check_interval마다 한 번만 조회)
+        self.registry_manager.key_index.entries()
+        generations = self._status_generations()
+        cached = self._status
+        if cached is not None and self._status_valid(cached, generations):
+            return cached[1]
+        with self._status_lock:
+            cached = self._status
+            # 기다리는 동안 다른 스레드가 이미 확인한 경우
+            if cached is not None and self._status_valid(cached, generations):
+                return cached[1]
+            try:
+                status = self._check_vba_status()
+            except Exception as e:
+                # 오류 결과는 재사용하지 않음
+                self.logger.error(f"VBA 차단 상태 확인 중 오류 발생: {str(e)}")
+                return VBABlockStatus(False, False, False, 0)
+            # 확인 전의 generation으로 저장하여, 확인 중에 바뀌었으면 다음 조회에서 다시 확인
+            self._status = (generations, status)
+            return status
+
+    def invalidate_status(self):
+        """캐시된 차단 상태 무효화"""
+        self._status_generation += 1
+
+    def _status_generations(self) -> Tuple:
+        watcher = self.change_tracker.registry_watcher
+        monitoring = self.process_monitor.monitoring
+        return (
+            self._status_generation,
+            watcher.generation if watcher is not None and watcher.running else None,
+            self.registry_manager.key_index.generation,
+            # 모니터링 중에는 대상 프로세스 테이블이 바뀔 때만 다시 확인 (아니면 기간으로만 만료)
+            self.process_monitor.target_generation if monitoring else None,
+            monitoring,
+            self.process_matcher
+        )
+
+    def _status_valid(self, cached: Tuple[Tuple, VBABlockStatus], generations: Tuple) -> bool:
+        if cached[0] != generations:
             return False
+        if cached[1].age <= self.status_max_age:
+            return True
+        # 레지스트리는 변경 알림으로, 대상 프로세스는 모니터링으로 generation이 갱신되는 중
+        watcher = self.change_tracker.registry_watcher
+        return watcher is not None and watcher.running and self.process_monitor.monitoring
+
+    @measure_time
+    def _check_vba_status(self) -> VBABlockStatus:
+        """레지스트리 값과 실행 중인 프로세스를 조회하여 차단 상태 확인"""
+        # 관리자 권한 확인
+        if not self.security_manager.is_admin:
+            self.logger.warning("관리자 권한이 필요합니다.")
+            return VBABlockStatus(False, False, self.process_monitor.monitoring, 0)
+
+        # 레지스트리 상태 확인
+        registry_status = self.registry_manager.check_registry_status()
+
+        # 프로세스 모니터링 상태 확인
+        monitoring_active = self.process_monitor.monitoring
+
+        # 실행 중인 VBA 프로세스 확인
+        running_processes = self.process_monitor.get_running_processes()
+        no_running_processes = len(running_processes) == 0
+
+        is_blocked = registry_status and monitoring_active and no_running_processes
+        self.logger.debug(f"VBA 차단 상태: {is_blocked}")
+        return VBABlockStatus(is_blocked, registry_status, monitoring_active, len(running_processes))
 
     @measure_time
     def restore_vba(self) -> bool:
@@ -138,6 +235,8 @@ class VBABlocker:
         except Exception as e:
             self.logger.error(f"VBA 복원 중 오류 발생: {str(e)}")
             return False
+        finally:
+            self.invalidate_status()
 
     @measure_time
     def get_system_changes(self) -> list:
@@ -0,0 +1,171 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from src.core.audit_store import AuditStore
+
+class TestAuditStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_time = datetime(2024, 1, 1, 9, 0, 0)
+        self.store = self._open()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _open(self):
+        return AuditStore(self.temp_dir, max_segment_bytes=4096, index_interval=8)
+
+    def _entry(self, i):
+        return {
+            "timestamp": (self.base_time + timedelta(minutes=i)).isoformat(),
+            "action": ("block_vba", "restore_vba", "check_process")[i % 3],
+            "details": {"index": i},
+            "user": f"user{i % 2}",
+            "session_id": i % 4
+        }
+
+    def _fill(self, count=300):
+        entries = [self._entry(i) for i in range(count)]
+        for i in range(0, count, 10):
+            self.store.append_many(entries[i:i + 10])
+        return entries
+
+    def _segment_files(self):
+        return sorted(f for f in os.listdir(self.temp_dir) if f.endswith('.jsonl'))
+
+    def test_query_by_time_range(self):
+        """기간 조회 테스트"""
+        self._fill()
+        self.assertGreater(len(self._segment_files()), 1)
+        start = self.base_time + timedelta(minutes=100)
+        end = self.base_time + timedelta(minutes=149)
+        entries, cursor = self.store.query(start=start, end=end, limit=1000)
+        self.assertEqual([e['details']['index'] for e in entries], list(range(100, 150)))
+        self.assertIsNone(cursor)
+
+    def test_query_by_action_user_session(self):
+        """작업, 사용자, 세션 조건 조회 테스트"""
+        self._fill()
+        entries, _ = self.store.query(action='restore_vba', limit=1000)
+        self.assertEqual([e['details']['index'] for e in entries], list(range(1, 300, 3)))
+
+        entries, _ = self.store.query(action=['block_vba', 'restore_vba'], user='user1', session_id=3,
+                                      limit=1000)
+        expected = [i for i in range(300) if i % 3 in (0, 1) and i % 2 == 1 and i % 4 == 3]
+        self.assertEqual([e['details']['index'] for e in entries], expected)
+
+        self.assertEqual(self.store.query(user='nobody')[0], [])
+
+    def test_cursor_pagination(self):
+        """커서 기반 페이지 조회 테스트"""
+        self._fill()
+        collected = []
+        cursor = None
+        pages = 0
+        while True:
+            entries, cursor = self.store.query(action='block_vba', limit=7, cursor=cursor)
+            collected.extend(e['details']['index'] for e in entries)
+            pages += 1
+            if cursor is None:
+                break
+        self.assertEqual(collected, list(range(0, 300, 3)))
+        self.assertGreater(pages, 10)
+
+    def test_tail(self):
+        """최근 기록 조회 테스트"""
+        self._fill()
+        self.assertEqual([e['details']['index'] for e in self.store.tail(25)], list(range(275, 300)))
+        self.assertEqual(len(self.store.tail(1000)), 300)
+
+    def test_reopen_uses_saved_index(self):
+        """다시 열어도 기록과 색인 유지"""
+        self._fill()
+        self.store.close()
+        index_files = [f for f in os.listdir(self.temp_dir) if f.endswith('.idx')]
+        self.assertEqual(len(index_files), len(self._segment_files()) - 1)
+
+        self.store = self._open()
+        self.assertEqual(len(self.store), 300)
+        entries, _ = self.store.query(action='check_process', session_id=1, limit=1000)
+        self.assertEqual([e['details']['index'] for e in entries],
+                         [i for i in range(300) if i % 3 == 2 and i % 4 == 1])
+
+    def test_recover_partial_line(self):
+        """비정상 종료로 잘린 마지막 줄 복구"""
+        self._fill(5)
+        self.store.close()
+        path = os.path.join(self.temp_dir, self._segment_files()[-1])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"timestamp": "2024-01-01T1')
+
+        self.store = self._open()
+        self.assertEqual(len(self.store), 5)
+        self.store.append_many([self._entry(5)])
+        self.assertEqual([e['details']['index'] for e in self.store.tail(10)], list(range(6)))
+
+    def test_clear(self):
+        """기록 삭제 테스트"""
+        self._fill()
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.store.query()[0], [])
+        self.assertEqual(self._segment_files(), [])
+
+    def test_compressed_segments(self):
+        """압축된 세그먼트도 같은 방식으로 조회"""
+        self.store.close()
+        self.store = AuditStore(self.temp_dir, max_segment_bytes=4096, index_interval=8, compress=True)
+        self._fill()
+        self.store.wait_for_compression()
+        names = os.listdir(self.temp_dir)
+        self.assertGreater(len([n for n in names if n.endswith('.jsonl.gz')]), 1)
+        self.assertEqual(len([n for n in names if n.endswith('.jsonl')]), 1)
+
+        entries, _ = self.store.query(action='restore_vba', limit=1000)
+        self.assertEqual([e['details']['index'] for e in entries], list(range(1, 300, 3)))
+        start = self.base_time + timedelta(minutes=40)
+        entries, _ = self.store.query(start=start, end=start + timedelta(minutes=9), limit=1000)
+        self.assertEqual([e['details']['index'] for e in entries], list(range(40, 50)))
+
+        # 다시 열어도 압축본과 저장된 색인 사용
+        self.store.close()
+        self.store = AuditStore(self.temp_dir, compress=True)
+        self.assertEqual(len(self.store), 300)
+        self.assertEqual([e['details']['index'] for e in self.store.tail(5)], list(range(295, 300)))
+
+    def test_time_based_rotation(self):
+        """첫 기록 후 max_segment_age가 지나면 다음 세그먼트로 넘어감"""
+        self.store.close()
+        self.store = AuditStore(self.temp_dir, max_segment_age=3600)
+        self.store.append_many([self._entry(0)])
+        self.store.append_many([dict(self._entry(1), timestamp=datetime.now().isoformat())])
+        self.store.append_many([dict(self._entry(2), timestamp=datetime.now().isoformat())])
+        self.assertEqual(len(self._segment_files()), 2)
+        self.assertEqual(len(self.store), 3)
+
+    def test_retention(self):
+        """보존 기간이 지난 세그먼트 삭제"""
+        self._fill()
+        segments = len(self._segment_files())
+        # 기록 시각 기준: 처음 100분 분량 이전을 보존 기간 밖으로
+        now = (self.base_time + timedelta(minutes=100)).timestamp() + 86400
+        self.store.retention_days = 1
+        self.store.apply_retention(now)
+
+        self.assertLess(len(self._segment_files()), segments)
+        entries, _ = self.store.query(limit=1000)
+        indexes = [e['details']['index'] for e in entries]
+        self.assertEqual(indexes, list(range(indexes[0], 300)))
+        self.assertGreater(indexes[0], 0)
+        self.assertLessEqual(indexes[0], 100)
+
+    def test_invalid_cursor(self):
+        """잘못된 커서"""
+        with self.assertRaises(ValueError):
+            self.store.query(cursor='invalid')
+
+if __name__ == '__main__':
+    unittest.main()
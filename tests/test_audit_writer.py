@@ -0,0 +1,112 @@
+import unittest
+import os
+import shutil
+import tempfile
+from threading import Thread
+from src.core.audit_store import AuditStore
+from src.core.audit_writer import AuditLogWriter, _open_writers
+
+class TestAuditLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = AuditStore(os.path.join(self.temp_dir, 'audit'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _read_lines(self):
+        return self.store.tail(10000)
+
+    def test_group_commit(self):
+        """여러 스레드의 기록을 묶어서 한 번에 기록"""
+        writer = AuditLogWriter(self.store, durability='fsync', commit_interval=0.05)
+        writer.start()
+
+        def submit(worker):
+            for i in range(100):
+                writer.submit({'worker': worker, 'index': i})
+
+        threads = [Thread(target=submit, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(writer.flush())
+
+        entries = self._read_lines()
+        self.assertEqual(len(entries), 400)
+        # 워커별 순서 유지
+        for worker in range(4):
+            self.assertEqual([e['index'] for e in entries if e['worker'] == worker], list(range(100)))
+        stats = writer.get_stats()
+        self.assertLess(stats['batches'], 400)
+        self.assertEqual(stats['dropped'], 0)
+        writer.close()
+
+    def test_close_drains_queue(self):
+        """종료 시 큐에 남은 기록을 모두 기록"""
+        writer = AuditLogWriter(self.store, durability='none', commit_interval=1.0)
+        writer.start()
+        for i in range(50):
+            writer.submit({'index': i})
+        writer.close()
+        self.assertFalse(writer.running)
+        self.assertEqual([e['index'] for e in self._read_lines()], list(range(50)))
+
+    def test_bounded_queue(self):
+        """큐가 가득 차면 대기하지 않고 기록을 버림"""
+        writer = AuditLogWriter(self.store, max_queue=10, auto_start=False)
+        results = [writer.submit({'index': i}) for i in range(15)]
+        self.assertEqual(results.count(False), 5)
+        self.assertEqual(writer.get_stats()['dropped'], 5)
+        writer.close()
+        self.assertEqual(len(self._read_lines()), 10)
+
+    def test_ring_buffer(self):
+        """메모리에는 최근 기록만 보관"""
+        writer = AuditLogWriter(self.store, ring_size=5)
+        for i in range(20):
+            writer.submit({'index': i})
+        self.assertEqual([e['index'] for e in writer.recent], list(range(15, 20)))
+        writer.close()
+
+    def test_lazy_start(self):
+        """첫 기록 때 스레드를 시작하고 close() 후에는 종료 훅에서 빠짐"""
+        writer = AuditLogWriter(self.store)
+        self.assertFalse(writer.running)
+        self.assertNotIn(writer, _open_writers)
+        writer.submit({'index': 0})
+        self.assertTrue(writer.running)
+        self.assertIn(writer, _open_writers)
+        writer.close()
+        self.assertFalse(writer.running)
+        self.assertNotIn(writer, _open_writers)
+        # 닫힌 뒤의 기록은 버리고 스레드나 저장소를 다시 열지 않음
+        self.assertFalse(writer.submit({'index': 1}))
+        self.assertEqual(writer.get_stats()['dropped'], 1)
+        self.assertTrue(writer.flush())
+        self.assertFalse(writer.running)
+        self.assertIsNone(self.store._file)
+        self.assertEqual([e['index'] for e in self._read_lines()], [0])
+
+    def test_clear(self):
+        """기록 삭제 테스트"""
+        writer = AuditLogWriter(self.store)
+        writer.start()
+        writer.submit({'index': 0})
+        writer.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(len(writer.recent), 0)
+
+        writer.submit({'index': 1})
+        writer.close()
+        self.assertEqual(self._read_lines(), [{'index': 1}])
+
+    def test_invalid_durability(self):
+        """알 수 없는 내구성 수준"""
+        with self.assertRaises(ValueError):
+            AuditLogWriter(self.store, durability='always')
+
+if __name__ == '__main__':
+    unittest.main()
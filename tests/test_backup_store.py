@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from src.core.backup_store import MANIFEST_NAME, BackupStore
+from src.core.registry import RegistryManager
+from src.core.registry_backend import MemoryRegistryBackend
+
+KEY = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security'
+
+
+def reg_content(value):
+    return f'Windows Registry Editor Version 5.00\n[{KEY}]\n"VBAWarnings"=dword:{value:08x}\n\n'
+
+
+class TestBackupStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = BackupStore(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _objects(self):
+        return sorted(os.listdir(self.store.objects_path))
+
+    def test_deduplication(self):
+        """같은 내용은 한 번만 저장하고, 직전 백업과 같으면 항목도 추가하지 않음"""
+        first = self.store.put(reg_content(1), [KEY], timestamp=100)
+        self.assertIs(self.store.put(reg_content(1), [KEY], timestamp=200), first)
+        self.store.put(reg_content(2), [KEY], timestamp=300)
+        self.store.put(reg_content(1), [KEY], timestamp=400)
+        self.assertEqual([entry.timestamp for entry in self.store.entries()], [100, 300, 400])
+        self.assertEqual(len(self._objects()), 2)
+        self.assertEqual(self.store.read(self.store.latest()), reg_content(1))
+        self.assertEqual(self.store.latest().keys, [KEY])
+
+    def test_as_of(self):
+        """특정 시각 기준 백업 조회"""
+        for timestamp, value in ((100, 1), (200, 2), (300, 3)):
+            self.store.put(reg_content(value), [KEY], timestamp=timestamp)
+        self.assertIsNone(self.store.as_of(50))
+        self.assertEqual(self.store.as_of(200).timestamp, 200)
+        self.assertEqual(self.store.as_of(299.9).timestamp, 200)
+        self.assertEqual(self.store.as_of(datetime.fromtimestamp(1000)).timestamp, 300)
+
+    def test_reload_manifest(self):
+        """매니페스트에서 다시 불러오고 손상된 줄은 무시"""
+        self.store.put(reg_content(1), [KEY], timestamp=100)
+        self.store.put(reg_content(2), [KEY], timestamp=200)
+        with open(os.path.join(self.temp_dir, MANIFEST_NAME), 'a', encoding='utf-8') as f:
+            f.write('{"id": \n')
+        store = BackupStore(self.temp_dir)
+        self.assertEqual(len(store.entries()), 2)
+        self.assertEqual(store.read(store.latest()), reg_content(2))
+
+    def test_prune(self):
+        """보존 개수/기간을 넘은 항목과 참조되지 않는 내용 파일 삭제"""
+        for timestamp, value in ((100, 1), (200, 2), (300, 1), (400, 3)):
+            self.store.put(reg_content(value), [KEY], timestamp=timestamp)
+        self.assertEqual(self.store.prune(max_entries=3), 1)
+        # 내용 1은 300의 백업이 아직 참조
+        self.assertEqual(len(self._objects()), 3)
+        self.assertEqual(self.store.prune(max_age_days=1, now=250 + 86400), 1)
+        self.assertEqual([entry.timestamp for entry in self.store.entries()], [300, 400])
+        self.assertEqual(len(self._objects()), 2)
+        # 최근 백업은 항상 유지
+        self.assertEqual(self.store.prune(max_entries=0, max_age_days=0, now=10 ** 9), 1)
+        self.assertEqual(len(self.store.entries()), 1)
+        self.assertEqual(len(self._objects()), 1)
+        self.assertEqual(len(BackupStore(self.temp_dir).entries()), 1)
+
+    def test_legacy_migration(self):
+        """이전 버전의 vba_settings_*.reg 파일을 저장소로 이전"""
+        for name, value in (('vba_settings_20240101_120000.reg', 1), ('vba_settings_20240102_120000.reg', 2)):
+            with open(os.path.join(self.temp_dir, name), 'w', encoding='utf-16') as f:
+                f.write(reg_content(value))
+        store = BackupStore(self.temp_dir)
+        self.assertEqual([entry.timestamp for entry in store.entries()],
+                         [datetime(2024, 1, 1, 12).timestamp(), datetime(2024, 1, 2, 12).timestamp()])
+        self.assertEqual(store.latest().keys, [KEY])
+        # 원본 파일은 그대로 두고, 다시 열어도 한 번만 가져옴
+        self.assertEqual(len([name for name in os.listdir(self.temp_dir) if name.startswith('vba_settings_')]), 2)
+        self.assertEqual(len(BackupStore(self.temp_dir).entries()), 2)
+
+
+class TestRegistryManagerBackups(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backend = MemoryRegistryBackend({KEY: {'VBAWarnings': 1, 'AccessVBOM': 1}})
+        self.manager = RegistryManager(self.backend, backup_path=self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_legacy_backups_survive_backup(self):
+        """가져온 이전 버전 백업은 보존 기간이 지나도 backup_registry()의 정리에서 유지"""
+        name = 'vba_settings_20200101_120000.reg'
+        with open(os.path.join(self.temp_dir, name), 'w', encoding='utf-16') as f:
+            f.write(reg_content(3))
+        manager = RegistryManager(self.backend, backup_path=self.temp_dir)
+        self.assertTrue(manager.backup_registry())
+        self.assertEqual(manager.prune_backups(), 0)
+        entries = manager.backup_store.entries()
+        self.assertEqual([entry.legacy for entry in entries], [name, None])
+        self.assertEqual(manager.backup_store.read(entries[0]), reg_content(3))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, name)))
+
+    def test_repeated_backup(self):
+        """바뀐 것이 없으면 반복 백업해도 백업이 늘지 않음"""
+        for _ in range(5):
+            self.assertTrue(self.manager.backup_registry())
+        self.assertEqual(len(self.manager.backup_store.entries()), 1)
+
+    def test_restore_as_of(self):
+        """특정 시각 기준 백업으로 복원"""
+        self.manager.backup_registry()
+        first = self.manager.backup_store.latest()
+        self.assertTrue(self.manager.modify_registry())
+        self.manager.backup_registry()
+        self.assertNotEqual(self.manager.backup_store.latest().id, first.id)
+
+        self.assertTrue(self.manager.restore_registry())
+        self.assertTrue(self.manager.check_registry_status())
+        self.assertTrue(self.manager.restore_registry(as_of=first.timestamp))
+        with self.backend.open_key(KEY) as key:
+            self.assertEqual(key.query_value('VBAWarnings')[0], 1)
+
+if __name__ == '__main__':
+    unittest.main()
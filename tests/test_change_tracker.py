@@ -1,17 +1,16 @@
 import unittest
-import os
 import time
 from src.core.change_tracker import ChangeTracker
+from src.core.registry_backend import MemoryRegistryBackend
+from src.core.registry_pool import RegistryKeyPool
 
 class TestChangeTracker(unittest.TestCase):
     def setUp(self):
         self.change_tracker = ChangeTracker()
-        self.log_file = self.change_tracker.log_file
 
     def tearDown(self):
-        # 테스트 후 로그 파일 정리
-        if os.path.exists(self.log_file):
-            os.remove(self.log_file)
+        # 테스트 후 변경 기록 정리
+        self.change_tracker.clear_changes()
 
     def test_start_stop_tracking(self):
         """추적 시작/중지 기능 테스트"""
@@ -56,5 +55,77 @@ class TestChangeTracker(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(self.change_tracker.get_changes()), 0)
 
+    def test_probe_stats(self):
+        """프로브별 실행 통계 테스트"""
+        self.change_tracker.start_tracking()
+        time.sleep(0.5)
+        self.change_tracker.stop_tracking()
+
+        stats = self.change_tracker.get_probe_stats()
+        self.assertIn('registry', stats)
+        self.assertIn('process', stats)
+        self.assertGreater(stats['registry']['runs'], 0)
+
+    def test_registry_transitions(self):
+        """레지스트리 상태 전이만 기록"""
+        key = self.change_tracker.watched_keys[0]
+        state = {key: {'VBAWarnings': 1}}
+        self.assertFalse(self.change_tracker._diff_registry_state(state))  # 기준 상태
+        self.assertFalse(self.change_tracker._diff_registry_state({key: {'VBAWarnings': 1}}))
+        self.assertTrue(self.change_tracker._diff_registry_state({key: {'VBAWarnings': 2}}))
+        self.assertTrue(self.change_tracker._diff_registry_state({key: None}))
+
+        changes = self.change_tracker.get_changes()
+        self.assertEqual([c['event'] for c in changes], ['value_changed', 'key_deleted'])
+        self.assertEqual(changes[0]['data']['old'], 1)
+        self.assertEqual(changes[0]['data']['new'], 2)
+
+    def test_read_registry_state_uses_pool(self):
+        """설치된 Office 응용 프로그램의 보안 키를 풀의 핸들로 조회"""
+        office = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office'
+        pool = RegistryKeyPool(MemoryRegistryBackend({
+            f'{office}\\15.0\\Excel\\Security': {'VBAWarnings': 2},
+            f'{office}\\16.0\\Word': {}
+        }))
+        tracker = ChangeTracker(registry_pool=pool)
+        self.assertEqual(tracker.watched_keys, [f'{office}\\15.0\\Excel\\Security',
+                                                f'{office}\\16.0\\Word\\Security'])
+        state = tracker._read_registry_state()
+        opens = pool.get_stats()['opens']
+        for _ in range(3):
+            state = tracker._read_registry_state()
+        self.assertEqual(state[tracker.watched_keys[0]], {'VBAWarnings': 2})
+        self.assertIsNone(state[tracker.watched_keys[1]])
+        # 이미 열린 키는 다시 열지 않음
+        self.assertEqual(pool.get_stats()['opens'], opens)
+
+    def test_registry_notifications(self):
+        """변경 알림을 받는 중에는 점검 때 값을 읽지 않고 알림으로 변경 기록"""
+        key_path = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security'
+        backend = MemoryRegistryBackend({key_path: {'VBAWarnings': 2}})
+        tracker = ChangeTracker(registry_pool=RegistryKeyPool(backend))
+        tracker.clear_changes()
+        self.assertTrue(tracker.start_tracking())
+        try:
+            self.assertTrue(tracker.registry_watcher.running)
+            reads = tracker.registry_watcher.reads
+            self.assertFalse(tracker._check_registry_changes())
+            self.assertEqual(tracker.registry_watcher.reads, reads)
+            with backend.create_key(key_path) as key:
+                key.set_value('VBAWarnings', 4)
+            deadline = time.time() + 2.0
+            changes = []
+            while time.time() < deadline and not changes:
+                tracker.journal.flush()
+                changes = tracker.get_changes()
+                time.sleep(0.01)
+        finally:
+            tracker.stop_tracking()
+            tracker.clear_changes()
+        self.assertEqual([(c['event'], c['data']['old'], c['data']['new']) for c in changes],
+                         [('value_changed', 2, 4)])
+        self.assertFalse(tracker.registry_watcher.running)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
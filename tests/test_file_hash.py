@@ -0,0 +1,101 @@
+import unittest
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from src.core.file_hash import DEFAULT_TRUSTED_PATH, FileHashCache, FileHashVerifier, TrustedHashStore, hash_file
+
+class TestFileHash(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'cache', 'file_hashes.json')
+        self.trusted_path = os.path.join(self.temp_dir, 'trusted_hashes.json')
+        self.exe_path = self._write('EXCEL.EXE', b'excel' * 100000)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_hash_file_chunked(self):
+        """청크 단위 해시가 전체 해시와 같은지 테스트"""
+        with open(self.exe_path, 'rb') as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        self.assertEqual(hash_file(self.exe_path, chunk_size=4096), expected)
+
+    def test_cache_skips_unchanged_file(self):
+        """변경되지 않은 파일은 다시 해시하지 않음"""
+        cache = FileHashCache(self.cache_path)
+        first = cache.get_hash(self.exe_path)
+        self.assertEqual(cache.get_hash(self.exe_path), first)
+        self.assertEqual(cache.hash_count, 1)
+
+        # 내용이 바뀌면 다시 해시
+        self._write('EXCEL.EXE', b'patched')
+        self.assertNotEqual(cache.get_hash(self.exe_path), first)
+        self.assertEqual(cache.hash_count, 2)
+
+    def test_cache_persistence(self):
+        """저장된 캐시를 다음 실행에서 재사용"""
+        cache = FileHashCache(self.cache_path)
+        digest = cache.get_hash(self.exe_path)
+        self.assertTrue(cache.save())
+
+        reloaded = FileHashCache(self.cache_path)
+        self.assertEqual(reloaded.get_hash(self.exe_path), digest)
+        self.assertEqual(reloaded.hash_count, 0)
+
+    def test_missing_file(self):
+        """존재하지 않는 파일"""
+        cache = FileHashCache(None)
+        self.assertIsNone(cache.get_hash(os.path.join(self.temp_dir, 'missing.exe')))
+
+    def test_trusted_store(self):
+        """신뢰 해시 목록 비교 테스트"""
+        store = TrustedHashStore(self.trusted_path)
+        verifier = FileHashVerifier(FileHashCache(None), store)
+        # 목록에 없는 파일은 통과
+        self.assertTrue(verifier.verify(self.exe_path))
+
+        store.trust(self.exe_path, 'ab' * 32)
+        self.assertFalse(verifier.verify(self.exe_path))
+
+        store.trust(self.exe_path, hash_file(self.exe_path))
+        self.assertTrue(store.save())
+        reloaded = FileHashVerifier(FileHashCache(None), TrustedHashStore(self.trusted_path),
+                                    require_trusted=True)
+        self.assertTrue(reloaded.verify(self.exe_path))
+
+    def test_default_trusted_store(self):
+        """배포된 신뢰 해시 목록은 빈 목록, 파일이 없으면 경고 후 빈 목록"""
+        with open(DEFAULT_TRUSTED_PATH, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {})
+        with self.assertLogs('file_hash', level='WARNING'):
+            store = TrustedHashStore(self.trusted_path)
+        self.assertFalse(store.has_entry(self.exe_path))
+
+    def test_require_trusted(self):
+        """신뢰 목록이 필수이면 목록에 없는 파일은 거부"""
+        verifier = FileHashVerifier(FileHashCache(None), TrustedHashStore(None), require_trusted=True)
+        self.assertFalse(verifier.verify(self.exe_path))
+
+    def test_verify_many(self):
+        """여러 파일 병렬 검증 테스트"""
+        paths = [self._write(f'app{i}.exe', bytes([i]) * 1000) for i in range(8)]
+        missing = os.path.join(self.temp_dir, 'missing.exe')
+        cache = FileHashCache(self.cache_path)
+        verifier = FileHashVerifier(cache, TrustedHashStore(None))
+
+        results = verifier.verify_many(paths + [missing])
+        self.assertTrue(all(results[path] for path in paths))
+        self.assertFalse(results[missing])
+        self.assertEqual(cache.hash_count, 8)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+if __name__ == '__main__':
+    unittest.main()
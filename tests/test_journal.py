@@ -0,0 +1,154 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from src.core.journal import ChangeJournal
+
+class TestChangeJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = ChangeJournal(self.temp_dir, 'test', max_segment_bytes=256,
+                                     batch_size=4, fsync=False)
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _segment_files(self):
+        return sorted(f for f in os.listdir(self.temp_dir) if f.endswith('.jsonl'))
+
+    def test_append_and_stream(self):
+        """기록 추가 및 스트리밍 조회 테스트"""
+        for i in range(50):
+            self.journal.append({'index': i})
+
+        records = list(self.journal.iter_records())
+        self.assertEqual([r['index'] for r in records], list(range(50)))
+        # 세그먼트 크기 제한에 따라 로테이션
+        self.assertGreater(len(self._segment_files()), 1)
+
+    def test_batched_flush(self):
+        """배치 크기 전에는 디스크에 쓰지 않음"""
+        self.journal.flush_interval = 3600
+        self.journal._last_flush = float('inf')
+        self.journal.append({'index': 0})
+        self.assertEqual(self._segment_files(), [])
+        for i in range(1, 4):
+            self.journal.append({'index': i})
+        self.assertEqual(len(self._segment_files()), 1)
+
+    def test_recover_partial_line(self):
+        """비정상 종료로 잘린 마지막 줄 복구"""
+        for i in range(3):
+            self.journal.append({'index': i})
+        self.journal.close()
+
+        path = os.path.join(self.temp_dir, self._segment_files()[-1])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"index": 3, "da')
+
+        journal = ChangeJournal(self.temp_dir, 'test', fsync=False)
+        journal.append({'index': 4})
+        self.assertEqual([r['index'] for r in journal.iter_records()], [0, 1, 2, 4])
+        journal.close()
+
+    def test_compact(self):
+        """세그먼트 압축 테스트"""
+        for i in range(50):
+            self.journal.append({'index': i})
+
+        remaining = self.journal.compact(max_records=10)
+        self.assertEqual(remaining, 10)
+        self.assertEqual(len(self._segment_files()), 1)
+
+        self.journal.append({'index': 50})
+        self.assertEqual([r['index'] for r in self.journal.iter_records()], list(range(40, 51)))
+
+    def test_recover_interrupted_compaction(self):
+        """압축 중단 시 남은 이전 세그먼트 정리"""
+        for i in range(50):
+            self.journal.append({'index': i})
+        self.journal.flush()
+        old_segments = self._segment_files()
+
+        # 압축본이 기록되었지만 이전 세그먼트 삭제 전에 중단된 상황 재현
+        backup = {}
+        for name in old_segments[:-1]:
+            with open(os.path.join(self.temp_dir, name), 'r', encoding='utf-8') as f:
+                backup[name] = f.read()
+        self.journal.compact()
+        for name, content in backup.items():
+            with open(os.path.join(self.temp_dir, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+
+        journal = ChangeJournal(self.temp_dir, 'test', fsync=False)
+        self.assertEqual([r['index'] for r in journal.iter_records()], list(range(50)))
+        journal.close()
+
+    def test_clear(self):
+        """기록 삭제 테스트"""
+        self.journal.append({'index': 0})
+        self.journal.clear()
+        self.assertEqual(list(self.journal.iter_records()), [])
+
+    def _compressing_journal(self, **kwargs):
+        self.journal.close()
+        self.journal = ChangeJournal(self.temp_dir, 'test', max_segment_bytes=256, batch_size=4,
+                                     fsync=False, compress=True, **kwargs)
+        return self.journal
+
+    def test_compressed_segments(self):
+        """지난 세그먼트 압축 후에도 모든 기록 조회"""
+        journal = self._compressing_journal()
+        for i in range(50):
+            journal.append({'index': i})
+        journal.flush()
+        journal.wait_for_compression()
+
+        names = sorted(os.listdir(self.temp_dir))
+        compressed = [name for name in names if name.endswith('.jsonl.gz')]
+        self.assertGreater(len(compressed), 0)
+        # 현재 세그먼트는 압축하지 않음
+        self.assertTrue(names[-1].endswith('.jsonl'))
+        self.assertEqual([r['index'] for r in journal.iter_records()], list(range(50)))
+
+        journal.close()
+        reopened = ChangeJournal(self.temp_dir, 'test', fsync=False)
+        reopened.append({'index': 50})
+        self.assertEqual([r['index'] for r in reopened.iter_records()], list(range(51)))
+        self.assertEqual(reopened.compact(max_records=5), 5)
+        self.assertEqual([r['index'] for r in reopened.iter_records()], list(range(46, 51)))
+        reopened.close()
+
+    def test_time_based_rotation(self):
+        """열린 지 max_segment_age가 지난 세그먼트는 다음 세그먼트로 넘어감"""
+        self.journal.close()
+        self.journal = ChangeJournal(self.temp_dir, 'test', batch_size=1, fsync=False,
+                                     max_segment_age=0)
+        for i in range(3):
+            self.journal.append({'index': i})
+        self.assertEqual(len(self._segment_files()), 3)
+
+    def test_retention(self):
+        """보존 기간이 지난 세그먼트 삭제"""
+        journal = self._compressing_journal(retention_days=1)
+        for i in range(50):
+            journal.append({'index': i})
+        journal.flush()
+        journal.wait_for_compression()
+
+        old = time.time() - 3 * 86400
+        names = sorted(n for n in os.listdir(self.temp_dir) if '.jsonl' in n)
+        for name in names[:2]:
+            os.utime(os.path.join(self.temp_dir, name), (old, old))
+        journal.apply_retention()
+
+        remaining = sorted(n for n in os.listdir(self.temp_dir) if '.jsonl' in n)
+        self.assertEqual(remaining, names[2:])
+        records = [r['index'] for r in journal.iter_records()]
+        self.assertEqual(records, list(range(records[0], 50)))
+        self.assertGreater(records[0], 0)
+
+if __name__ == '__main__':
+    unittest.main()
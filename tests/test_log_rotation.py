@@ -0,0 +1,77 @@
+import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from src.core.log_rotation import SegmentCompressor, compress_file, open_segment, rotation_options
+from src.core.policy import SecurityPolicy
+
+class TestLogRotation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'audit.000001.jsonl')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for i in range(100):
+                f.write(json.dumps({'index': i}) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_rotation_options(self):
+        """audit_settings를 저장소 인자로 변환"""
+        options = rotation_options({"log_retention_days": 7, "log_rotation_size_mb": 2,
+                                    "log_compression": False})
+        self.assertEqual(options['max_segment_bytes'], 2 * 1024 * 1024)
+        self.assertEqual(options['retention_days'], 7)
+        self.assertFalse(options['compress'])
+        # 지정하지 않은 값은 기본값 사용
+        self.assertEqual(options['max_segment_age'], 24 * 3600)
+
+    def test_policy_audit_settings(self):
+        """보안 정책의 audit_settings로 저장소 인자 구성"""
+        policy = SecurityPolicy({"audit_settings": {"log_retention_days": 5, "log_rotation_size_mb": 1,
+                                                    "log_rotation_interval_hours": 0,
+                                                    "log_compression": True}})
+        options = rotation_options(policy.audit_settings)
+        self.assertEqual(options['retention_days'], 5)
+        self.assertEqual(options['max_segment_bytes'], 1024 * 1024)
+        self.assertIsNone(options['max_segment_age'])
+        self.assertTrue(options['compress'])
+
+    def test_compress_file(self):
+        """압축 후 원본 삭제 및 수정 시각 유지"""
+        os.utime(self.path, (1000000000, 1000000000))
+        compressed = compress_file(self.path)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.path.getmtime(compressed), 1000000000)
+        with gzip.open(compressed, 'rt', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 100)
+
+    def test_open_segment(self):
+        """압축 여부와 관계없이 같은 방식으로 읽기"""
+        with open_segment(self.path, 'r') as f:
+            plain = f.read()
+        compressed = compress_file(self.path)
+        with open_segment(compressed, 'r') as f:
+            self.assertEqual(f.read(), plain)
+        with open_segment(compressed) as f:
+            f.seek(len(plain.splitlines()[0]) + 1)
+            self.assertEqual(json.loads(f.readline()), {'index': 1})
+
+    def test_background_compressor(self):
+        """압축 완료 후 경로 변경 알림, 그 다음 원본 삭제"""
+        seen = []
+
+        def on_done(original, compressed):
+            # 알림 시점에는 원본이 남아 있어야 함
+            seen.append((os.path.exists(original), compressed))
+
+        compressor = SegmentCompressor()
+        compressor.submit(self.path, on_done)
+        compressor.shutdown()
+        self.assertEqual(seen, [(True, self.path + '.gz')])
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
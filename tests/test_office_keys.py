@@ -0,0 +1,69 @@
+import unittest
+from src.core.office_keys import OfficeApplicationKey, OfficeKeyIndex
+from src.core.registry_backend import MemoryRegistryBackend
+from src.core.registry_pool import RegistryKeyPool
+
+OFFICE = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office'
+
+
+class TestOfficeKeyIndex(unittest.TestCase):
+    def setUp(self):
+        self.backend = MemoryRegistryBackend({
+            f'{OFFICE}\\15.0\\Excel\\Security': {'VBAWarnings': 1},
+            f'{OFFICE}\\16.0\\Word': {},
+            f'{OFFICE}\\16.0\\Outlook': {},
+            # VBA 설정이 없는 응용 프로그램과 버전이 아닌 키는 제외
+            f'{OFFICE}\\16.0\\Lync': {},
+            f'{OFFICE}\\16.0\\Common': {},
+            f'{OFFICE}\\ClickToRun\\Excel': {}
+        })
+        self.index = OfficeKeyIndex(RegistryKeyPool(self.backend), check_interval=0)
+
+    def test_discovery(self):
+        """설치된 버전과 응용 프로그램만 버전 순서로 나열"""
+        self.assertEqual(self.index.versions(), ['15.0', '16.0'])
+        self.assertEqual(self.index.security_keys(), [
+            f'{OFFICE}\\15.0\\Excel\\Security',
+            f'{OFFICE}\\16.0\\Word\\Security',
+            f'{OFFICE}\\16.0\\Outlook\\Security'
+        ])
+        self.assertEqual(self.index.value_map({'VBAWarnings': 2})[f'{OFFICE}\\16.0\\Word\\Security'],
+                         {'VBAWarnings': 2})
+
+    def test_default_targets(self):
+        """Office 키가 없으면 16.0의 기본 응용 프로그램 사용"""
+        index = OfficeKeyIndex(RegistryKeyPool(MemoryRegistryBackend()))
+        self.assertEqual(index.entries(), [OfficeApplicationKey('HKEY_CURRENT_USER', '16.0', app)
+                                           for app in ('Excel', 'Word', 'PowerPoint')])
+
+    def test_no_enumeration_when_unchanged(self):
+        """기준 키가 그대로면 다시 나열하지 않음 (값 변경은 무시)"""
+        self.index.entries()
+        generation = self.index.generation
+        with self.backend.open_key(f'{OFFICE}\\15.0\\Excel\\Security', write=True) as key:
+            key.set_value('VBAWarnings', 2)
+        for _ in range(5):
+            self.index.entries()
+        self.assertEqual(self.index.enumeration_count, 1)
+        self.assertEqual(self.index.generation, generation)
+
+    def test_refresh_on_change(self):
+        """응용 프로그램이나 버전이 추가되면 다시 나열하고 generation 증가"""
+        self.index.entries()
+        generation = self.index.generation
+        with self.backend.create_key(f'{OFFICE}\\16.0\\PowerPoint'):
+            pass
+        self.assertIn(f'{OFFICE}\\16.0\\PowerPoint\\Security', self.index.security_keys())
+        self.assertEqual(self.index.generation, generation + 1)
+
+        with self.backend.create_key(f'{OFFICE}\\17.0\\Access'):
+            pass
+        self.assertEqual(self.index.versions(), ['15.0', '16.0', '17.0'])
+        self.assertEqual(self.index.generation, generation + 2)
+        self.assertEqual(self.index.enumeration_count, 3)
+        # 강제로 다시 나열해도 내용이 같으면 generation 유지
+        self.assertFalse(self.index.refresh(force=True))
+        self.assertEqual(self.index.generation, generation + 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from src.core.policy import PolicyStore, PolicyValidationError, SecurityPolicy, get_policy_store
+from src.core.process_rules import get_process_matcher
+from src.core.process_snapshot import ProcessInfo
+
+class TestSecurityPolicy(unittest.TestCase):
+    def test_defaults_and_compiled_values(self):
+        """빠진 항목은 기본값, 이름과 패턴은 미리 컴파일"""
+        policy = SecurityPolicy({"allowed_processes": ["excel.exe"]})
+        self.assertTrue(policy.require_admin)
+        self.assertEqual(policy.allowed_processes, frozenset({"EXCEL.EXE"}))
+        self.assertTrue(policy.registry_patterns.matches(
+            "HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Security\\VBAWarnings"))
+        self.assertIsNotNone(policy.process_matcher.match(ProcessInfo(1, 'winword.exe', 1.0)))
+        self.assertEqual(policy["session_timeout"], 3600)
+        self.assertIn("audit_changes", policy)
+
+    def test_immutable(self):
+        """생성 후 변경할 수 없음"""
+        policy = SecurityPolicy({"audit_settings": {"durability": "fsync"}})
+        with self.assertRaises(AttributeError):
+            policy.require_admin = False
+        with self.assertRaises(TypeError):
+            policy.audit_settings["durability"] = "none"
+        self.assertIsInstance(policy["allowed_processes"], tuple)
+
+        # to_dict는 수정 가능한 복사본
+        data = policy.to_dict()
+        data["allowed_processes"].append("CMD.EXE")
+        self.assertNotIn("CMD.EXE", policy.allowed_processes)
+
+    def test_validation_errors(self):
+        """잘못된 항목을 모두 모아서 보고"""
+        with self.assertRaises(PolicyValidationError) as ctx:
+            SecurityPolicy({
+                "require_admin": "yes",
+                "allowed_processes": "EXCEL.EXE",
+                "session_timeout": -1
+            })
+        self.assertEqual(len(ctx.exception.errors), 3)
+
+        with self.assertRaises(PolicyValidationError):
+            SecurityPolicy({"audit_settings": {"durability": "always"}})
+        with self.assertRaises(PolicyValidationError):
+            SecurityPolicy({"registry_security": {"max_backups": -1}})
+        with self.assertRaises(PolicyValidationError):
+            SecurityPolicy({"process_rules": [{"name": "empty"}]})
+
+class TestPolicyStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'security_policy.json')
+        self.mtime = 1700000000
+        self._write({"allowed_processes": ["EXCEL.EXE"]})
+        self.store = PolicyStore(self.path, check_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, data, raw: str = None):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(raw if raw is not None else json.dumps(data))
+        # 파일 시스템의 시각 해상도와 무관하게 수정 시각이 바뀌도록 지정
+        self.mtime += 10
+        os.utime(self.path, (self.mtime, self.mtime))
+
+    def test_reload_on_change(self):
+        """파일이 바뀌면 새 정책으로 교체하고 구독자에게 알림"""
+        received = []
+        self.store.subscribe(received.append)
+        first = self.store.current
+        self.assertIs(self.store.current, first)
+        self.assertEqual(first.version, 1)
+
+        self._write({"allowed_processes": ["EXCEL.EXE", "WINWORD.EXE"]})
+        second = self.store.current
+        self.assertIsNot(second, first)
+        self.assertEqual(second.version, 2)
+        self.assertIn("WINWORD.EXE", second.allowed_processes)
+        self.assertEqual(received, [second])
+        # 이전 정책 객체는 그대로 유지
+        self.assertNotIn("WINWORD.EXE", first.allowed_processes)
+
+    def test_invalid_file_keeps_previous_policy(self):
+        """검증에 실패한 파일은 거부하고 기존 정책 유지"""
+        received = []
+        self.store.subscribe(received.append)
+        first = self.store.current
+
+        self._write(None, raw='{"allowed_processes": [')
+        self.assertIs(self.store.current, first)
+        self.assertIsNotNone(self.store.last_error)
+
+        self._write({"require_admin": "no"})
+        self.assertIs(self.store.current, first)
+        self.assertIn("require_admin", str(self.store.last_error))
+        self.assertEqual(received, [])
+
+        self._write({"require_admin": False})
+        self.assertFalse(self.store.current.require_admin)
+        self.assertIsNone(self.store.last_error)
+
+    def test_check_interval(self):
+        """check_interval 동안에는 파일을 다시 확인하지 않음"""
+        store = PolicyStore(self.path, check_interval=3600)
+        first = store.current
+        self._write({"require_admin": False})
+        self.assertIs(store.current, first)
+        self.assertTrue(store.reload())
+        self.assertFalse(store.current.require_admin)
+
+    def test_missing_file_uses_defaults(self):
+        """정책 파일이 없으면 기본 정책"""
+        store = PolicyStore(os.path.join(self.temp_dir, 'missing.json'))
+        self.assertTrue(store.current.require_admin)
+        self.assertEqual(store.current.version, 0)
+
+    def test_shared_matcher(self):
+        """공유 매처는 공유 정책의 매처"""
+        self.assertIs(get_process_matcher(), get_policy_store().current.process_matcher)
+
+if __name__ == '__main__':
+    unittest.main()
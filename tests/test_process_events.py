@@ -0,0 +1,53 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from src.core.process_events import ProcDirEventSource, create_process_event_source
+
+@unittest.skipUnless(ProcDirEventSource.is_available(), "/proc 필요")
+class TestProcDirEventSource(unittest.TestCase):
+    def setUp(self):
+        self.source = ProcDirEventSource(interval=0.02)
+        self.events = []
+
+    def tearDown(self):
+        self.source.stop()
+
+    def test_detect_process_start(self):
+        """새 프로세스 시작 감지 및 감지 지연 시간"""
+        self.source.start(self.events.append)
+        time.sleep(0.05)
+        proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(1)'])
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline and not any(e.info.pid == proc.pid for e in self.events):
+            time.sleep(0.01)
+
+        event = next(e for e in self.events if e.info.pid == proc.pid)
+        self.assertEqual(event.info.ppid, os.getpid())
+        self.assertEqual(event.source, 'procfs')
+        self.assertLess(event.latency, 1.0)
+
+    def test_truncated_stat(self):
+        """읽는 도중 종료되어 stat이 비었거나 잘렸으면 None"""
+        proc_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, proc_root)
+        source = ProcDirEventSource(proc_root=proc_root)
+        for pid, data in ((100, b''), (101, b'101 (python'), (102, b'102 (python) S 1 2')):
+            os.makedirs(os.path.join(proc_root, str(pid)))
+            with open(os.path.join(proc_root, str(pid), 'stat'), 'wb') as f:
+                f.write(data)
+            self.assertIsNone(source._read_stat(pid))
+        self.assertIsNone(source._read_stat(103))
+
+    def test_factory(self):
+        """운영체제에 맞는 이벤트 소스 선택"""
+        self.assertIsInstance(create_process_event_source(), ProcDirEventSource)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,15 @@
 import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+import sys
 import time
+import psutil
 from src.core.process_monitor import ProcessMonitor
+from src.core.process_snapshot import FakeProcessSource, ProcessSnapshotProvider
+from src.core.process_events import ProcDirEventSource, ProcessStartEvent
+from src.core.process_rules import ProcessMatcher
 
 class TestProcessMonitor(unittest.TestCase):
     def setUp(self):
@@ -46,5 +55,134 @@ class TestProcessMonitor(unittest.TestCase):
         result = self.process_monitor.is_process_running('EXCEL.EXE')
         self.assertIsInstance(result, bool)
 
+    def test_shared_snapshot(self):
+        """공유 스냅샷의 가상 프로세스 테이블 사용"""
+        source = FakeProcessSource()
+        source.add(100, 'EXCEL.EXE', time.time())
+        source.add(200, 'notepad.exe', time.time())
+        monitor = ProcessMonitor(ProcessSnapshotProvider(source))
+
+        processes = monitor.get_running_processes()
+        self.assertEqual([p['pid'] for p in processes], [100])
+        self.assertTrue(monitor.is_process_running('excel.exe'))
+        self.assertFalse(monitor.is_process_running('WINWORD.EXE'))
+
+    def test_incremental_table(self):
+        """새로 나타난 프로세스만 분류하고 종료된 프로세스는 제거"""
+        source = FakeProcessSource()
+        for pid in range(1000, 2000):
+            source.add(pid, f'svc{pid}.exe', 1.0)
+        provider = ProcessSnapshotProvider(source, refresh_interval=0)
+        monitor = ProcessMonitor(provider)
+        terminated = []
+        provider.get_process = lambda info: info
+        monitor.terminate_process_trees = lambda infos: terminated.extend(info.pid for info in infos)
+
+        monitor._check_and_terminate_processes()
+        self.assertEqual(monitor.classified_count, 1000)
+        self.assertEqual(terminated, [])
+
+        source.add(5000, 'EXCEL.EXE', 2.0)
+        monitor._check_and_terminate_processes()
+        self.assertEqual(monitor.classified_count, 1001)
+        self.assertEqual(terminated, [5000])
+
+        source.remove(5000)
+        monitor._check_and_terminate_processes()
+        self.assertEqual(monitor.classified_count, 1001)
+        self.assertEqual(terminated, [5000])
+
+        # 대상이 아닌 프로세스의 변경은 target_generation을 올리지 않음
+        generation = monitor.target_generation
+        source.add(6000, 'notepad.exe', 3.0)
+        monitor._check_and_terminate_processes()
+        self.assertEqual(monitor.target_generation, generation)
+        source.add(6001, 'WINWORD.EXE', 3.0)
+        monitor._check_and_terminate_processes()
+        self.assertEqual(monitor.target_generation, generation + 1)
+
+    def test_batch_termination(self):
+        """여러 프로세스를 함께 종료 (대기 시간이 프로세스 수에 비례하지 않음)"""
+        procs = [subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+                 for _ in range(5)]
+        targets = [(psutil.Process(p.pid), 'Microsoft Excel') for p in procs]
+
+        start = time.monotonic()
+        result = self.process_monitor.terminate_processes(targets)
+        elapsed = time.monotonic() - start
+        for p in procs:
+            p.wait()
+
+        self.assertEqual(len(result['terminated']) + len(result['killed']), 5)
+        self.assertEqual(result['failed'], [])
+        self.assertIn('wait', result['timings'])
+        self.assertLess(elapsed, 3.0)
+
+    def test_terminate_process_tree(self):
+        """하위 프로세스까지 함께 종료"""
+        code = ('import subprocess, sys, time; '
+                'child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"]); '
+                'print(child.pid, flush=True); time.sleep(60)')
+        parent = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE)
+        child_pid = int(parent.stdout.readline())
+        parent.stdout.close()
+
+        provider = ProcessSnapshotProvider()
+        monitor = ProcessMonitor(provider)
+        root = provider.snapshot(max_age=0).get(parent.pid)
+        result = monitor.terminate_process_trees([root])
+        parent.wait()
+
+        stopped = {pid for pid, _ in result['terminated'] + result['killed']}
+        self.assertEqual(stopped, {parent.pid, child_pid})
+        self.assertFalse(psutil.pid_exists(child_pid) and
+                         psutil.Process(child_pid).status() != psutil.STATUS_ZOMBIE)
+
+    def test_event_not_counted_twice(self):
+        """시작 알림으로 처리한 프로세스는 다음 스냅샷에서 다시 집계하지 않음"""
+        source = FakeProcessSource()
+        provider = ProcessSnapshotProvider(source, refresh_interval=60.0)
+        matcher = ProcessMatcher([{'name': 'excel', 'process_name': 'EXCEL.EXE'}])
+        monitor = ProcessMonitor(provider, use_events=False, matcher=matcher)
+        terminated = []
+        monitor.terminate_process_trees = lambda infos: terminated.extend(info.pid for info in infos)
+        monitor._attach_table()
+
+        info = source.add(999001, 'EXCEL.EXE', time.time())
+        monitor._on_process_event(ProcessStartEvent(info, time.time(), 'wmi'))
+        source.add(999002, 'EXCEL.EXE', time.time())
+        provider.refresh()
+
+        # 알림으로 처리한 프로세스도 테이블에는 남아 폴링에서 다시 종료할 수 있음
+        self.assertEqual(len(monitor._target_table), 2)
+        self.assertEqual(matcher.get_hit_counts(), {'excel': 2})
+        stats = monitor.get_detection_stats()
+        self.assertEqual(stats['wmi']['runs'], 1)
+        self.assertEqual(stats['polling']['runs'], 1)
+        self.assertEqual(terminated, [999001])
+
+    @unittest.skipUnless(ProcDirEventSource.is_available(), "/proc 필요")
+    def test_event_driven_detection(self):
+        """시작 알림으로 대상 프로세스를 즉시 종료"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        target = os.path.join(temp_dir, 'vbatestproc')
+        shutil.copy(shutil.which('sleep'), target)
+
+        matcher = ProcessMatcher([{'name': 'test', 'process_name': 'vbatestproc'}])
+        monitor = ProcessMonitor(ProcessSnapshotProvider(), ProcDirEventSource(interval=0.02),
+                                 matcher=matcher)
+        monitor.start_monitoring()
+        self.addCleanup(monitor.stop_monitoring)
+        time.sleep(0.1)
+
+        proc = subprocess.Popen([target, '30'])
+        proc.wait(timeout=5)
+
+        stats = monitor.get_detection_stats()
+        self.assertEqual(stats['procfs']['runs'], 1)
+        self.assertLess(stats['procfs']['max_time'], 1.0)
+        self.assertEqual(matcher.get_hit_counts(), {'test': 1})
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,64 @@
+import unittest
+import os
+import psutil
+from src.core.process_snapshot import FakeProcessSource, ProcessInfo, ProcessSnapshotProvider
+from src.core.process_paths import FakeExePathResolver, ProcessPathIndex, PsutilExePathResolver
+
+class TestProcessPathIndex(unittest.TestCase):
+    def setUp(self):
+        self.source = FakeProcessSource()
+        self.source.add(100, 'EXCEL.EXE', 1000.0)
+        self.source.add(200, 'winword.exe', 1000.0)
+        self.source.add(300, 'EXCEL.EXE', 1000.0)
+        self.provider = ProcessSnapshotProvider(self.source, refresh_interval=0)
+        self.resolver = FakeExePathResolver({
+            100: r'C:\Office\EXCEL.EXE',
+            200: r'C:\Office\WINWORD.EXE',
+            300: r'D:\Portable\EXCEL.EXE'
+        })
+        self.index = ProcessPathIndex(self.provider, self.resolver)
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_get_path(self):
+        """PID로 실행 파일 경로 조회"""
+        self.assertEqual(self.index.get_path(200), r'C:\Office\WINWORD.EXE')
+        self.assertIsNone(self.index.get_path(999))
+
+    def test_reverse_lookup(self):
+        """이름으로 실행 파일 경로 역조회 (대소문자 무시)"""
+        paths = self.index.get_paths('excel.exe')
+        self.assertEqual(paths, {os.path.normpath(r'C:\Office\EXCEL.EXE'),
+                                 os.path.normpath(r'D:\Portable\EXCEL.EXE')})
+        self.assertEqual(self.index.get_paths('OUTLOOK.EXE'), set())
+
+    def test_path_resolved_once(self):
+        """경로는 프로세스당 한 번만 조회"""
+        for _ in range(5):
+            self.index.get_path(100)
+            self.index.get_paths('EXCEL.EXE')
+        self.assertEqual(self.resolver.resolve_count, 2)
+
+    def test_process_exit_and_pid_reuse(self):
+        """종료된 프로세스 제거 및 재사용된 PID는 다시 조회"""
+        self.index.get_path(100)
+        self.source.remove(100)
+        self.assertIsNone(self.index.get_path(100))
+
+        self.source.add(100, 'POWERPNT.EXE', 2000.0)
+        self.resolver.paths[100] = r'C:\Office\POWERPNT.EXE'
+        self.assertEqual(self.index.get_path(100), r'C:\Office\POWERPNT.EXE')
+        self.assertEqual(self.index.get_paths('EXCEL.EXE'), {os.path.normpath(r'D:\Portable\EXCEL.EXE')})
+
+    def test_psutil_resolver(self):
+        """psutil 구현으로 현재 프로세스 경로 조회"""
+        proc = psutil.Process()
+        info = ProcessInfo(proc.pid, proc.name(), proc.create_time())
+        self.assertEqual(os.path.realpath(PsutilExePathResolver().resolve(info)),
+                         os.path.realpath(proc.exe()))
+        # 생성 시각이 다르면 재사용된 PID로 간주
+        self.assertIsNone(PsutilExePathResolver().resolve(ProcessInfo(proc.pid, proc.name(), 1.0)))
+
+if __name__ == '__main__':
+    unittest.main()
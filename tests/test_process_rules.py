@@ -0,0 +1,74 @@
+import unittest
+import os
+import subprocess
+import sys
+from src.core.process_rules import ProcessMatcher, load_process_rules
+from src.core.process_snapshot import FakeProcessSource, ProcessSnapshotProvider, ProcessInfo
+
+class TestProcessMatcher(unittest.TestCase):
+    def setUp(self):
+        self.source = FakeProcessSource()
+        self.provider = ProcessSnapshotProvider(self.source)
+
+    def test_default_rules(self):
+        """정책 파일의 기본 규칙 로드"""
+        matcher = load_process_rules()
+        for name in ('EXCEL.EXE', 'WINWORD.EXE', 'POWERPNT.EXE', 'MSACCESS.EXE', 'OUTLOOK.EXE'):
+            self.assertTrue(matcher.has_name(name))
+
+        excel = ProcessInfo(100, 'excel.exe', 1.0)
+        self.assertEqual(matcher.match(excel).display_name, 'Microsoft Excel')
+        self.assertIsNone(matcher.match(ProcessInfo(101, 'notepad.exe', 1.0)))
+
+    def test_parent_rule(self):
+        """상위 프로세스 이름 조건"""
+        matcher = ProcessMatcher([
+            {'name': 'excel_from_launcher', 'process_name': 'EXCEL.EXE', 'parent_name': 'launcher.exe'}
+        ])
+        self.source.add(10, 'launcher.exe', 1.0)
+        child = self.source.add(20, 'EXCEL.EXE', 2.0, ppid=10)
+        orphan = self.source.add(30, 'EXCEL.EXE', 3.0, ppid=99)
+        snapshot = self.provider.snapshot(max_age=0)
+
+        self.assertIsNotNone(matcher.match(child, snapshot))
+        self.assertIsNone(matcher.match(orphan, snapshot))
+
+    def test_expensive_attributes(self):
+        """exe 경로와 명령줄은 필요할 때만 조회"""
+        matcher = ProcessMatcher([
+            {'name': 'marker', 'exe_path': os.path.dirname(os.path.realpath(sys.executable)) + '/python*',
+             'cmdline_contains': ['VBA-RULE-MARKER']}
+        ])
+        proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)', 'vba-rule-marker'])
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+
+        snapshot = ProcessSnapshotProvider().snapshot(max_age=0)
+        matched = [info.pid for info in matcher.filter(snapshot, snapshot)]
+        self.assertEqual(matched, [proc.pid])
+
+    def test_reused_pid(self):
+        """생성 시각이 다른 프로세스(재사용된 PID)의 exe/명령줄로는 일치하지 않음"""
+        matcher = ProcessMatcher([
+            {'name': 'python', 'exe_path': os.path.dirname(os.path.realpath(sys.executable)) + '/python*'}
+        ])
+        snapshot = ProcessSnapshotProvider().snapshot(max_age=0)
+        current = snapshot.get(os.getpid())
+        self.assertIsNotNone(matcher.match(current, snapshot))
+        stale = ProcessInfo(current.pid, current.name, current.create_time - 60.0)
+        self.assertIsNone(matcher.match(stale, snapshot))
+
+    def test_hit_counts(self):
+        """규칙별 일치 횟수"""
+        matcher = load_process_rules({'process_rules': [{'name': 'excel', 'process_name': 'EXCEL.EXE'}]})
+        rule = matcher.match(ProcessInfo(100, 'EXCEL.EXE', 1.0))
+        matcher.record_hit(rule)
+        self.assertEqual(matcher.get_hit_counts(), {'excel': 1})
+
+    def test_invalid_rule(self):
+        """조건이 없는 규칙은 거부"""
+        with self.assertRaises(ValueError):
+            ProcessMatcher([{'name': 'empty'}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from src.core.process_snapshot import (
+    FakeProcessSource, ProcessSnapshotProvider, PsutilProcessSource
+)
+
+class TestProcessSnapshotProvider(unittest.TestCase):
+    def setUp(self):
+        self.source = FakeProcessSource()
+        self.source.add(4, 'System', 1.0)
+        self.provider = ProcessSnapshotProvider(self.source, refresh_interval=60.0)
+
+    def test_snapshot_reuse(self):
+        """갱신 주기 이내의 조회는 스냅샷 재사용"""
+        first = self.provider.snapshot()
+        second = self.provider.snapshot()
+        self.assertIs(first, second)
+        self.assertEqual(self.source.scan_count, 1)
+
+        self.provider.snapshot(max_age=0)
+        self.assertEqual(self.source.scan_count, 2)
+
+    def test_generation(self):
+        """프로세스 테이블이 바뀔 때만 generation 증가"""
+        self.provider.refresh()
+        generation = self.provider.generation
+        self.provider.refresh()
+        self.assertEqual(self.provider.generation, generation)
+
+        self.source.add(100, 'EXCEL.EXE', 10.0)
+        self.provider.refresh()
+        self.assertEqual(self.provider.generation, generation + 1)
+
+    def test_snapshot_age(self):
+        """조회 전에는 inf, 조회 후에는 마지막 조회 후 지난 시간"""
+        self.assertEqual(self.provider.snapshot_age, float('inf'))
+        self.provider.refresh()
+        self.assertLess(self.provider.snapshot_age, 1.0)
+
+    def test_subscriber_diff(self):
+        """구독자는 시작/종료된 프로세스 목록을 전달받음"""
+        diffs = []
+        self.provider.refresh()
+        self.provider.subscribe(diffs.append)
+
+        excel = self.source.add(100, 'EXCEL.EXE', 10.0)
+        self.provider.refresh()
+        self.source.remove(100)
+        self.source.add(100, 'WINWORD.EXE', 20.0)  # PID 재사용
+        self.provider.refresh()
+        self.provider.refresh()  # 변경 없음
+
+        self.assertEqual(len(diffs), 2)
+        self.assertEqual(diffs[0].started, [excel])
+        self.assertEqual(diffs[1].exited, [excel])
+        self.assertEqual([p.name for p in diffs[1].started], ['WINWORD.EXE'])
+
+    def test_find(self):
+        """이름으로 프로세스 검색 (대소문자 무시)"""
+        self.source.add(100, 'excel.exe', 10.0)
+        found = self.provider.snapshot().find(['EXCEL.EXE'])
+        self.assertEqual([p.pid for p in found], [100])
+
+    def test_descendants(self):
+        """하위 프로세스 트리 수집 (재사용된 PID 제외)"""
+        launcher = self.source.add(100, 'launcher.exe', 10.0)
+        excel = self.source.add(200, 'EXCEL.EXE', 20.0, ppid=100)
+        helper = self.source.add(300, 'helper.exe', 30.0, ppid=200)
+        self.source.add(400, 'stale.exe', 5.0, ppid=200)  # 부모보다 먼저 생성됨
+
+        snapshot = self.provider.snapshot(max_age=0)
+        self.assertEqual(snapshot.descendants([excel]), [helper])
+        self.assertEqual(snapshot.parent(excel), launcher)
+        self.assertIsNone(snapshot.parent(launcher))
+
+    def test_psutil_source(self):
+        """실제 프로세스 테이블 조회"""
+        processes = PsutilProcessSource().scan()
+        self.assertGreater(len(processes), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import subprocess
+import sys
+import psutil
+from src.core.process_terminator import ProcessTerminator
+
+IGNORE_TERM = 'import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print(1, flush=True); time.sleep(60)'
+
+class TestProcessTerminator(unittest.TestCase):
+    def setUp(self):
+        self.terminator = ProcessTerminator(timeout=0.5, kill_timeout=2.0)
+
+    def _spawn(self, code):
+        proc = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE)
+        proc.stdout.readline()
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.stdout.close)
+        return proc
+
+    def test_escalate_to_kill(self):
+        """종료 신호를 무시하는 프로세스는 강제 종료"""
+        normal = self._spawn('import time; print(1, flush=True); time.sleep(60)')
+        stubborn = self._spawn(IGNORE_TERM)
+
+        result = self.terminator.terminate([
+            (psutil.Process(normal.pid), 'normal'),
+            (psutil.Process(stubborn.pid), 'stubborn')
+        ])
+        self.assertEqual(result['terminated'], [(normal.pid, 'normal')])
+        self.assertEqual(result['killed'], [(stubborn.pid, 'stubborn')])
+        self.assertIn('kill', result['timings'])
+
+    def test_empty(self):
+        """대상이 없으면 아무 작업도 하지 않음"""
+        result = self.terminator.terminate([])
+        self.assertEqual(result['terminated'], [])
+        self.assertEqual(result['timings'], {})
+
+if __name__ == '__main__':
+    unittest.main()
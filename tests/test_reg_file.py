@@ -0,0 +1,163 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.reg_file import (DELETED, RegFileError, RegFileWriter, RegSection, format_value, iter_reg_file,
+                               write_reg_file)
+from src.core.registry import RegistryManager
+from src.core.registry_backend import (REG_BINARY, REG_DWORD, REG_EXPAND_SZ, REG_MULTI_SZ, REG_NONE, REG_QWORD,
+                                       REG_SZ, MemoryRegistryBackend)
+
+OFFICE = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office'
+
+# regedit로 내보낸 파일과 같은 형식
+SAMPLE = '\r\n'.join([
+    'Windows Registry Editor Version 5.00',
+    '',
+    '; 주석',
+    f'[{OFFICE}\\16.0\\Excel\\Security]',
+    '@="기본값"',
+    '"VBAWarnings"=dword:00000002',
+    '"Path"="C:\\\\Program Files\\\\\\"Office\\""',
+    '"Expand"=hex(2):25,00,54,00,45,00,4d,00,50,00,25,00,00,00',
+    '"Multi"=hex(7):61,00,00,00,62,00,63,00,00,00,00,00',
+    '"Big"=hex(b):00,00,00,00,01,00,00,00',
+    '"Quad"=qword:0000000100000000',
+    '"Blob"=hex:01,02,\\',
+    '  03,04',
+    '"None"=hex(0):',
+    '"Gone"=-',
+    '',
+    f'[-{OFFICE}\\15.0]',
+    ''
+])
+
+
+class TestRegFileReader(unittest.TestCase):
+    def test_all_value_types(self):
+        """hex(...), qword, 줄 이어짐, 이스케이프, 삭제 표기 해석"""
+        sections = list(iter_reg_file(io.StringIO(SAMPLE)))
+        self.assertEqual(len(sections), 2)
+        values = sections[0].values
+        self.assertEqual(values[''], ('기본값', REG_SZ))
+        self.assertEqual(values['VBAWarnings'], (2, REG_DWORD))
+        self.assertEqual(values['Path'], ('C:\\Program Files\\"Office"', REG_SZ))
+        self.assertEqual(values['Expand'], ('%TEMP%', REG_EXPAND_SZ))
+        self.assertEqual(values['Multi'], (['a', 'bc'], REG_MULTI_SZ))
+        self.assertEqual(values['Big'], (1 << 32, REG_QWORD))
+        self.assertEqual(values['Quad'], (1 << 32, REG_QWORD))
+        self.assertEqual(values['Blob'], (b'\x01\x02\x03\x04', REG_BINARY))
+        self.assertEqual(values['None'], (b'', REG_NONE))
+        self.assertIs(values['Gone'], DELETED)
+        self.assertEqual(sections[1], RegSection(f'{OFFICE}\\15.0', delete=True))
+
+    def test_errors(self):
+        """잘못된 줄은 오류, on_error를 지정하면 건너뛰기"""
+        text = f'[{OFFICE}]\n"A"=dword:zz\n"B"=dword:00000001\n'
+        with self.assertRaises(RegFileError) as ctx:
+            list(iter_reg_file(io.StringIO(text)))
+        self.assertEqual(ctx.exception.line_number, 2)
+        errors = []
+        sections = list(iter_reg_file(io.StringIO(text), on_error=errors.append))
+        self.assertEqual(sections[0].values, {'B': (1, REG_DWORD)})
+        self.assertEqual(len(errors), 1)
+
+
+class TestRegFileRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """쓰고 다시 읽으면 값과 형식이 그대로"""
+        sections = [
+            RegSection(f'{OFFICE}\\16.0\\Word\\Security', values={
+                '': ('default', REG_SZ),
+                'Quote "and" \\slash': ('"C:\\x\\"', REG_SZ),
+                'Lines': ('first\r\nsecond', REG_SZ),
+                'Odd': (b'\x41\x00\x42', REG_SZ),
+                'Empty': ([], REG_MULTI_SZ),
+                'Large': (bytes(range(256)) * 4, REG_BINARY),
+                'Dword': (0xFFFFFFFF, REG_DWORD),
+                'Qword': (2 ** 64 - 1, REG_QWORD),
+                'Custom': (b'\xff', 0x20),
+                'Removed': DELETED
+            }),
+            RegSection(f'{OFFICE}\\16.0\\Empty'),
+            RegSection(f'{OFFICE}\\14.0', delete=True)
+        ]
+        path = os.path.join(self.temp_dir, 'export.reg')
+        self.assertEqual(write_reg_file(path, sections), 3)
+        self.assertEqual(list(iter_reg_file(path)), sections)
+        with open(path, 'r', encoding='utf-16', newline='') as f:
+            lines = f.read().split('\r\n')
+        self.assertEqual(lines[0], 'Windows Registry Editor Version 5.00')
+        self.assertLessEqual(max(len(line) for line in lines), 80)
+
+    def test_empty_values(self):
+        """winreg가 None으로 돌려주는 빈 값도 기록하고 빈 값으로 다시 읽음"""
+        path = os.path.join(self.temp_dir, 'empty.reg')
+        with RegFileWriter.open(path) as writer:
+            writer.begin_key(f'{OFFICE}\\16.0\\Word\\Security')
+            for name, value_type in (('Binary', REG_BINARY), ('None', REG_NONE),
+                                     ('Sz', REG_SZ), ('Expand', REG_EXPAND_SZ)):
+                writer.write_value(name, None, value_type)
+            writer.write_separator()
+        values = list(iter_reg_file(path))[0].values
+        self.assertEqual(values, {'Binary': (b'', REG_BINARY), 'None': (b'', REG_NONE),
+                                  'Sz': ('', REG_SZ), 'Expand': ('', REG_EXPAND_SZ)})
+
+    def test_format_value(self):
+        self.assertEqual(format_value('VBAWarnings', 2, REG_DWORD), '"VBAWarnings"=dword:00000002')
+        self.assertEqual(format_value('', 'x'), '@="x"')
+        self.assertEqual(format_value('Q', 1, REG_QWORD), '"Q"=hex(b):01,00,00,00,00,00,00,00')
+        with self.assertRaises(RegFileError):
+            RegFileWriter(io.StringIO()).write_value('A', 1)
+
+
+class TestRegistryManagerRegFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data = {
+            f'{OFFICE}\\16.0\\Excel\\Security': {'VBAWarnings': 1, 'Trusted': (['a', 'b'], REG_MULTI_SZ)},
+            f'{OFFICE}\\16.0\\Excel\\Options': {'Path': ('%APPDATA%\\x', REG_EXPAND_SZ), 'Blob': b'\x00\x01'},
+            f'{OFFICE}\\16.0\\Word\\Security': {'VBAWarnings': 3}
+        }
+        self.backend = MemoryRegistryBackend(self.data)
+        self.manager = RegistryManager(self.backend, backup_path=self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _dump(self, backend):
+        result = {}
+        for key_path in self.data:
+            with backend.open_key(key_path) as key:
+                result[key_path] = sorted(key.values())
+        return result
+
+    def test_export_import_subtree(self):
+        """Office 하위 트리 전체를 내보내고 다른 레지스트리로 가져오기"""
+        path = os.path.join(self.temp_dir, 'office.reg')
+        self.assertEqual(self.manager.export_registry(OFFICE, path), 7)
+        target = MemoryRegistryBackend()
+        self.assertTrue(RegistryManager(target, backup_path=self.temp_dir).import_registry(path))
+        self.assertEqual(self._dump(target), self._dump(self.backend))
+        self.assertEqual(self.manager.export_registry(f'{OFFICE}\\99.0', path), -1)
+
+    def test_restore_removes_created_values(self):
+        """백업 때 없던 값은 복원할 때 삭제"""
+        self.manager.backup_registry()
+        self.assertTrue(self.manager.modify_registry())
+        self.assertTrue(self.manager.restore_registry())
+        with self.backend.open_key(f'{OFFICE}\\16.0\\Word\\Security') as key:
+            self.assertEqual(sorted(name for name, _, _ in key.values()), ['VBAWarnings'])
+            self.assertEqual(key.query_value('VBAWarnings'), (3, REG_DWORD))
+        with self.backend.open_key(f'{OFFICE}\\16.0\\Excel\\Security') as key:
+            self.assertEqual(key.query_value('Trusted'), (['a', 'b'], REG_MULTI_SZ))
+
+if __name__ == '__main__':
+    unittest.main()
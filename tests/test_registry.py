@@ -1,16 +1,25 @@
 import unittest
+import errno
 import os
+import shutil
+import tempfile
 from src.core.registry import RegistryManager
+from src.core.registry_backend import REG_SZ, MemoryRegistryBackend
 
 class TestRegistryManager(unittest.TestCase):
     def setUp(self):
-        self.registry_manager = RegistryManager()
+        # 백업은 저장소의 backups 디렉터리가 아닌 임시 디렉터리에 기록
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry_manager = RegistryManager(backup_path=self.temp_dir)
         self.test_key = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security'
         self.test_values = {
             'VBAWarnings': 2,
             'AccessVBOM': 0
         }
 
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
     def test_backup_registry(self):
         """레지스트리 백업 기능 테스트"""
         result = self.registry_manager.backup_registry()
@@ -51,5 +60,114 @@ class TestRegistryManager(unittest.TestCase):
         
         self.assertNotEqual(initial_status, modified_status)
 
+class FaultyBackend(MemoryRegistryBackend):
+    """지정한 값의 기록이 실패하거나(fail) 무시되는(drop) 메모리 레지스트리"""
+
+    def __init__(self, data=None, fail=(), drop=()):
+        self.fail = set()
+        self.drop = set()
+        super().__init__(data)
+        self.fail = set(fail)
+        self.drop = set(drop)
+
+    def _wrap(self, key):
+        set_value = key.set_value
+
+        def faulty_set_value(name, value, value_type=None):
+            if name in self.fail:
+                raise PermissionError(errno.EACCES, "access denied", name)
+            if name not in self.drop:
+                set_value(name, value, value_type)
+
+        key.set_value = faulty_set_value
+        return key
+
+    def open_key(self, key_path, write=False):
+        return self._wrap(super().open_key(key_path, write))
+
+    def create_key(self, key_path):
+        return self._wrap(super().create_key(key_path))
+
+
+class TestRegistryTransaction(unittest.TestCase):
+    """메모리 레지스트리에서 트랜잭션 적용 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.keys = {
+            'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security': {'VBAWarnings': 1},
+            'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Word\\Security': {'VBAWarnings': 2}
+        }
+        self.powerpoint = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\PowerPoint\\Security'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _manager(self, **faults):
+        # PowerPoint는 설치되어 있지만 보안 키는 아직 없음
+        data = dict(self.keys)
+        data[self.powerpoint.rsplit('\\', 1)[0]] = {}
+        backend = FaultyBackend(data, **faults)
+        return RegistryManager(backend, backup_path=self.temp_dir), backend
+
+    def _values(self, backend, key_path):
+        try:
+            with backend.open_key(key_path) as key:
+                return {name: value for name, value, _ in key.values()}
+        except FileNotFoundError:
+            return None
+
+    def test_apply_success(self):
+        """모든 값 기록 후 한 번에 검증"""
+        manager, backend = self._manager()
+        result = manager.apply_registry(backup=True)
+        self.assertTrue(result['success'])
+        self.assertTrue(result['backup'])
+        self.assertFalse(result['rolled_back'])
+        self.assertEqual(set(result['timings']), {'backup', 'snapshot', 'write', 'verify'})
+        statuses = {(e['key'].split('\\')[-2], e['name']): e['status'] for e in result['values']}
+        self.assertEqual(statuses[('Word', 'VBAWarnings')], 'unchanged')
+        self.assertEqual(statuses[('Excel', 'VBAWarnings')], 'applied')
+        # 없던 PowerPoint 키는 새로 만듦
+        self.assertEqual(statuses[('PowerPoint', 'AccessVBOM')], 'applied')
+        self.assertTrue(manager.check_registry_status())
+
+    def test_write_failure_rolls_back(self):
+        """기록 실패 시 사전 이미지로 되돌림"""
+        manager, backend = self._manager(fail={'AccessVBOM'})
+        result = manager.apply_registry(backup=False)
+        self.assertFalse(result['success'])
+        self.assertTrue(result['rolled_back'])
+        failed = [e for e in result['values'] if e['status'] == 'write_failed']
+        self.assertEqual(len(failed), 3)
+        self.assertIn('access denied', failed[0]['error'])
+
+        excel, word = self.keys
+        self.assertEqual(self._values(backend, excel), {'VBAWarnings': 1})
+        self.assertEqual(self._values(backend, word), {'VBAWarnings': 2})
+        self.assertIsNone(self._values(backend, self.powerpoint))
+
+    def test_verify_failure(self):
+        """검증 실패도 되돌리며, 되돌리기를 끄면 기록된 값 유지"""
+        manager, backend = self._manager(drop={'AccessVBOM'})
+        result = manager.apply_registry(backup=False, rollback=False)
+        self.assertFalse(result['success'])
+        self.assertFalse(result['rolled_back'])
+        self.assertEqual({e['status'] for e in result['values'] if e['name'] == 'AccessVBOM'}, {'verify_failed'})
+        self.assertEqual(self._values(backend, self.powerpoint), {'VBAWarnings': 2})
+
+        manager, backend = self._manager(drop={'AccessVBOM'})
+        self.assertFalse(manager.modify_registry())
+        self.assertEqual(self._values(backend, list(self.keys)[0]), {'VBAWarnings': 1})
+
+    def test_value_types_restored(self):
+        """되돌릴 때 원래 값 형식 유지"""
+        excel = list(self.keys)[0]
+        self.keys[excel] = {'VBAWarnings': ('1', REG_SZ)}
+        manager, backend = self._manager(fail={'AccessVBOM'})
+        manager.apply_registry(backup=False)
+        with backend.open_key(excel) as key:
+            self.assertEqual(key.query_value('VBAWarnings'), ('1', REG_SZ))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
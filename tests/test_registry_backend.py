@@ -0,0 +1,171 @@
+import unittest
+import os
+from datetime import datetime
+import shutil
+import tempfile
+from src.core.registry import RegistryManager
+from src.core.registry_backend import (REG_DWORD, REG_MULTI_SZ, REG_SZ, MemoryRegistryBackend,
+                                       OfflineHiveBackend, split_key_path)
+
+OFFICE_KEY = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\{}\\Security'
+
+
+class FakeHiveValue:
+    """python-registry RegistryValue와 같은 형태의 테스트용 값"""
+
+    def __init__(self, name, value, value_type):
+        self._name, self._value, self._type = name, value, value_type
+
+    def name(self):
+        return self._name
+
+    def value(self):
+        return self._value
+
+    def value_type(self):
+        return self._type
+
+
+class FakeHiveKey:
+    """python-registry RegistryKey와 같은 형태의 테스트용 키"""
+
+    def __init__(self, name, values=None, subkeys=None):
+        self._name = name
+        self._values = [FakeHiveValue(n, v, REG_DWORD if isinstance(v, int) else REG_SZ)
+                        for n, v in (values or {}).items()]
+        self._subkeys = subkeys or []
+        self.subkeys_calls = 0
+
+    def name(self):
+        return self._name
+
+    def values(self):
+        return self._values
+
+    def subkeys(self):
+        self.subkeys_calls += 1
+        return self._subkeys
+
+    def timestamp(self):
+        return datetime(2024, 1, 1)
+
+
+class FakeHive:
+    def __init__(self, root):
+        self._root = root
+
+    def root(self):
+        return self._root
+
+
+def office_hive(vba_warnings=1):
+    """NTUSER.DAT 형태의 hive (Excel/Word/PowerPoint 보안 키)"""
+    apps = [FakeHiveKey(app, {'VBAWarnings': vba_warnings, 'AccessVBOM': 1}) for app in
+            ('Excel', 'Word', 'PowerPoint')]
+    for app in apps:
+        app._subkeys = [FakeHiveKey('Security', {v.name(): v.value() for v in app.values()})]
+        app._values = []
+    version = FakeHiveKey('16.0', subkeys=apps)
+    office = FakeHiveKey('Office', subkeys=[version])
+    microsoft = FakeHiveKey('Microsoft', subkeys=[office])
+    software = FakeHiveKey('Software', subkeys=[microsoft])
+    return FakeHive(FakeHiveKey('ROOT', subkeys=[software]))
+
+
+class TestMemoryRegistryBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = MemoryRegistryBackend({
+            OFFICE_KEY.format('Excel'): {'VBAWarnings': 1, 'Name': 'excel', 'List': (['a', 'b'], REG_MULTI_SZ)}
+        })
+
+    def test_read_write(self):
+        """값 읽기/쓰기, 대소문자 무시"""
+        with self.backend.open_key(OFFICE_KEY.format('EXCEL').replace('Software', 'SOFTWARE')) as key:
+            self.assertEqual(key.query_value('vbawarnings'), (1, REG_DWORD))
+            self.assertEqual(key.query_value('List'), (['a', 'b'], REG_MULTI_SZ))
+        with self.backend.open_key(OFFICE_KEY.format('Excel'), write=True) as key:
+            key.set_value('VBAWarnings', 2, REG_DWORD)
+            key.delete_value('Name')
+        with self.backend.open_key('HKCU\\Software\\Microsoft\\Office\\16.0\\Excel\\Security') as key:
+            self.assertEqual(key.query_value('VBAWarnings'), (2, REG_DWORD))
+            self.assertEqual(sorted(name for name, _, _ in key.values()), ['List', 'VBAWarnings'])
+
+    def test_errors(self):
+        """없는 키/값과 읽기 전용 핸들"""
+        with self.assertRaises(FileNotFoundError):
+            self.backend.open_key(OFFICE_KEY.format('Word'))
+        self.assertFalse(self.backend.key_exists(OFFICE_KEY.format('Word')))
+        with self.backend.open_key(OFFICE_KEY.format('Excel')) as key:
+            with self.assertRaises(FileNotFoundError):
+                key.query_value('Missing')
+            with self.assertRaises(PermissionError):
+                key.set_value('VBAWarnings', 2)
+        with self.assertRaises(ValueError):
+            split_key_path('HKEY_NOWHERE\\Software')
+
+    def test_subkeys(self):
+        """하위 키 나열 및 키 생성"""
+        with self.backend.create_key(OFFICE_KEY.format('Word')):
+            pass
+        with self.backend.open_key('HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0') as key:
+            self.assertEqual(sorted(key.subkeys()), ['Excel', 'Word'])
+
+
+class TestOfflineHiveBackend(unittest.TestCase):
+    def test_lazy_load_and_overlay(self):
+        """필요한 키만 불러오고, 쓰기는 메모리에만 반영"""
+        hive = office_hive()
+        backend = OfflineHiveBackend({'HKEY_CURRENT_USER': hive})
+        software = hive.root().subkeys()[0]
+        software.subkeys_calls = 0
+
+        with backend.open_key(OFFICE_KEY.format('Word'), write=True) as key:
+            self.assertEqual(key.query_value('VBAWarnings'), (1, REG_DWORD))
+            key.set_value('VBAWarnings', 2, REG_DWORD)
+        with backend.open_key(OFFICE_KEY.format('Word')) as key:
+            self.assertEqual(key.query_value('VBAWarnings'), (2, REG_DWORD))
+        self.assertEqual(software.subkeys_calls, 1)
+        # 원본 hive는 그대로
+        word = hive.root().subkeys()[0].subkeys()[0].subkeys()[0].subkeys()[0].subkeys()[1]
+        self.assertEqual(word.subkeys()[0].values()[0].value(), 1)
+
+    def test_mount_under_key(self):
+        """hive를 하위 키 경로에 연결"""
+        backend = OfflineHiveBackend({'HKEY_USERS\\S-1-5-21-1000': office_hive(vba_warnings=3)})
+        key_path = 'HKEY_USERS\\S-1-5-21-1000\\Software\\Microsoft\\Office\\16.0\\Excel\\Security'
+        with backend.open_key(key_path) as key:
+            self.assertEqual(key.query_value('VBAWarnings')[0], 3)
+        with backend.open_key('HKEY_USERS\\S-1-5-21-1000\\Software') as key:
+            self.assertEqual(key.subkeys(), ['Microsoft'])
+
+
+class TestRegistryManagerBackends(unittest.TestCase):
+    """백업/수정/상태 확인/복원이 모든 저장소에서 같은 결과"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run_cycle(self, backend):
+        manager = RegistryManager(backend, backup_path=os.path.join(self.temp_dir, backend.name))
+        self.assertFalse(manager.check_registry_status())
+        self.assertTrue(manager.backup_registry())
+        self.assertTrue(manager.modify_registry())
+        self.assertTrue(manager.check_registry_status())
+        self.assertTrue(manager.restore_registry())
+        self.assertFalse(manager.check_registry_status())
+        with backend.open_key(OFFICE_KEY.format('PowerPoint')) as key:
+            self.assertEqual(key.query_value('VBAWarnings')[0], 1)
+
+    def test_memory_backend(self):
+        data = {OFFICE_KEY.format(app): {'VBAWarnings': 1, 'AccessVBOM': 1}
+                for app in ('Excel', 'Word', 'PowerPoint')}
+        self._run_cycle(MemoryRegistryBackend(data))
+
+    def test_offline_backend(self):
+        self._run_cycle(OfflineHiveBackend({'HKEY_CURRENT_USER': office_hive()}))
+
+if __name__ == '__main__':
+    unittest.main()
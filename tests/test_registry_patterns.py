@@ -0,0 +1,55 @@
+import unittest
+from src.core.registry_patterns import RegistryPatternIndex, compile_registry_pattern
+
+POLICY_PATTERNS = [
+    'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\VBAWarnings',
+    'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\*\\Security\\AccessVBOM'
+]
+
+class TestRegistryPatternIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RegistryPatternIndex(POLICY_PATTERNS + [
+            'HKEY_LOCAL_MACHINE\\Software\\Policies\\Microsoft\\Office',
+            '*\\Excel\\Security\\Trusted Locations*'
+        ])
+
+    def test_wildcard_spans_segments(self):
+        """'*'는 여러 경로 구간과 일치"""
+        key = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security\\VBAWarnings'
+        self.assertEqual(self.index.match(key), POLICY_PATTERNS[0])
+        self.assertFalse(self.index.matches(
+            'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Options'))
+
+    def test_case_insensitive(self):
+        """레지스트리 경로처럼 대소문자를 구분하지 않음"""
+        self.assertTrue(self.index.matches(
+            'hkey_current_user\\software\\microsoft\\office\\16.0\\word\\security\\vbawarnings'))
+        self.assertTrue(self.index.matches('hkey_local_machine\\SOFTWARE\\Policies\\Microsoft\\Office'))
+
+    def test_leading_wildcard(self):
+        """첫 구간의 와일드카드 패턴"""
+        self.assertTrue(self.index.matches(
+            'HKEY_USERS\\S-1-5-21\\Software\\Microsoft\\Office\\16.0\\Excel\\Security\\Trusted Locations\\Location0'))
+
+    def test_literal_characters(self):
+        """'.' 등은 문자 그대로 비교"""
+        index = RegistryPatternIndex(['HKEY_CURRENT_USER\\Office\\16.0\\*'])
+        self.assertTrue(index.matches('HKEY_CURRENT_USER\\Office\\16.0\\Excel'))
+        self.assertFalse(index.matches('HKEY_CURRENT_USER\\Office\\16x0\\Excel'))
+
+    def test_cache(self):
+        """반복 조회는 캐시에서 처리"""
+        key = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security\\AccessVBOM'
+        self.index.match(key)
+        self.index.match(key)
+        self.assertEqual(self.index.cache_info().hits, 1)
+
+        self.index.add('HKEY_CURRENT_USER\\Other')
+        self.assertEqual(self.index.cache_info().currsize, 0)
+
+    def test_compile_registry_pattern(self):
+        """패턴 컴파일 결과 재사용"""
+        self.assertIs(compile_registry_pattern(POLICY_PATTERNS[0]), compile_registry_pattern(POLICY_PATTERNS[0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from src.core.registry_backend import REG_DWORD, MemoryRegistryBackend
+from src.core.registry_pool import RegistryKeyPool, normalize_key_path
+
+KEY = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\Excel\\Security'
+
+
+class CountingBackend(MemoryRegistryBackend):
+    """키를 연 횟수와 닫힌 핸들 수를 세는 메모리 레지스트리"""
+
+    def __init__(self, data=None):
+        self.open_count = 0
+        self.closed = []
+        super().__init__(data)
+        # 초기 내용을 채우면서 연 핸들은 세지 않음
+        self.open_count = 0
+        self.closed.clear()
+
+    def _counted(self, key):
+        self.open_count += 1
+        close = key.close
+        key.close = lambda: (self.closed.append(key.path), close())
+        return key
+
+    def open_key(self, key_path, write=False):
+        return self._counted(super().open_key(key_path, write))
+
+    def create_key(self, key_path):
+        return self._counted(super().create_key(key_path))
+
+
+class TestRegistryKeyPool(unittest.TestCase):
+    def setUp(self):
+        self.backend = CountingBackend({KEY: {'VBAWarnings': 1, 'AccessVBOM': 1}})
+        self.pool = RegistryKeyPool(self.backend, max_handles=2)
+
+    def test_handle_reuse(self):
+        """같은 키는 한 번만 열고, 읽기는 쓰기 핸들도 사용"""
+        for _ in range(5):
+            self.assertEqual(self.pool.read_values(KEY, ['VBAWarnings']), {'VBAWarnings': (1, REG_DWORD)})
+        self.pool.read_values(KEY.upper().replace('HKEY_CURRENT_USER', 'HKCU'))
+        self.assertEqual(self.backend.open_count, 1)
+
+        self.pool.write_values(KEY, {'VBAWarnings': (2, REG_DWORD), 'AccessVBOM': 0})
+        self.pool.read_values(KEY)
+        self.assertEqual(self.backend.open_count, 2)
+        self.assertEqual(self.pool.read_values(KEY), {'VBAWarnings': (2, REG_DWORD), 'AccessVBOM': (0, REG_DWORD)})
+
+    def test_batch_missing_values_and_keys(self):
+        """없는 값은 결과에서 빠지고, 없는 키는 FileNotFoundError"""
+        self.assertEqual(self.pool.read_values(KEY, ['VBAWarnings', 'Missing']), {'VBAWarnings': (1, REG_DWORD)})
+        with self.assertRaises(FileNotFoundError):
+            self.pool.read_values(KEY.replace('Excel', 'Word'))
+        self.assertEqual(self.pool.write_values(KEY.replace('Excel', 'Word'), {'VBAWarnings': 2}, create=True), {})
+        self.assertEqual(self.pool.read_values(KEY.replace('Excel', 'Word')), {'VBAWarnings': (2, REG_DWORD)})
+
+    def test_reference_counting(self):
+        """사용 중인 핸들은 무효화되어도 반환될 때 닫힘"""
+        with self.pool.acquire(KEY) as key:
+            self.assertEqual(self.pool.get_stats()['in_use'], 1)
+            self.assertEqual(self.pool.invalidate(KEY), 1)
+            self.assertEqual(self.backend.closed, [])
+            self.assertEqual(key.query_value('AccessVBOM')[0], 1)
+        self.assertEqual(self.backend.closed, [KEY])
+        self.assertEqual(self.pool.get_stats()['cached'], 0)
+
+    def test_lru_limit(self):
+        """사용 중이 아닌 핸들은 max_handles개까지만 유지"""
+        keys = [KEY.replace('Excel', app) for app in ('Excel', 'Word', 'PowerPoint')]
+        for key_path in keys:
+            self.pool.write_values(key_path, {'VBAWarnings': 2}, create=True)
+        self.assertEqual(self.pool.get_stats()['cached'], 2)
+        self.assertEqual(self.backend.closed, [keys[0]])
+
+    def test_deleted_key(self):
+        """삭제된 키의 핸들은 무효화하고, 다시 만들어진 키는 새로 열기"""
+        self.pool.read_values(KEY)
+        self.pool.delete_key(KEY)
+        self.assertEqual(self.pool.get_stats()['cached'], 0)
+        with self.assertRaises(FileNotFoundError):
+            self.pool.read_values(KEY)
+
+        # 풀을 거치지 않고 삭제된 경우: 오래된 핸들 실패 후 새로 열어서 다시 시도
+        self.pool.write_values(KEY, {'VBAWarnings': 3}, create=True)
+        self.backend.delete_key(KEY)
+        with self.backend.create_key(KEY) as key:
+            key.set_value('VBAWarnings', 4)
+        self.assertEqual(self.pool.read_values(KEY), {'VBAWarnings': (4, REG_DWORD)})
+        self.assertGreaterEqual(self.pool.get_stats()['invalidations'], 2)
+
+    def test_invalidate_subkeys(self):
+        """상위 키를 무효화하면 하위 키 핸들도 제거"""
+        self.pool.read_values(KEY)
+        self.assertEqual(self.pool.invalidate('HKCU\\Software\\Microsoft\\Office'), 1)
+        self.assertEqual(normalize_key_path('hkcu\\Software\\\\Office\\'), 'HKEY_CURRENT_USER\\SOFTWARE\\OFFICE')
+
+if __name__ == '__main__':
+    unittest.main()
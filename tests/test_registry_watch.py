@@ -0,0 +1,128 @@
+import time
+import unittest
+from threading import Lock
+from src.core.registry_backend import MemoryRegistryBackend, RegistryBackend, REG_DWORD
+from src.core.registry_pool import RegistryKeyPool
+from src.core.registry_watch import (MemoryRegistryWatcher, WinregNotifyWatcher, create_registry_watcher,
+                                     diff_key_state)
+
+SECURITY = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\{}\\Security'
+EXCEL = SECURITY.format('Excel')
+WORD = SECURITY.format('Word')
+
+
+class TestDiffKeyState(unittest.TestCase):
+    def test_events(self):
+        names = ['VBAWarnings', 'AccessVBOM']
+        self.assertEqual(diff_key_state(None, {'VBAWarnings': 2}, names),
+                         [('key_created', None, None, {'VBAWarnings': 2})])
+        self.assertEqual(diff_key_state({}, None, names), [('key_deleted', None, {}, None)])
+        self.assertEqual(diff_key_state({'VBAWarnings': 2}, {'VBAWarnings': 4, 'Other': 1}, names),
+                         [('value_changed', 'VBAWarnings', 2, 4)])
+        self.assertEqual(diff_key_state(None, None, names), [])
+
+
+class TestMemoryRegistryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.backend = MemoryRegistryBackend({EXCEL: {'VBAWarnings': 2}})
+        self.pool = RegistryKeyPool(self.backend)
+        self.watcher = create_registry_watcher(self.pool)
+        self.events = []
+        self.lock = Lock()
+
+    def tearDown(self):
+        self.watcher.stop()
+
+    def _on_event(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def _wait_events(self, count: int, timeout: float = 2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if len(self.events) >= count:
+                    return list(self.events)
+            time.sleep(0.01)
+        return list(self.events)
+
+    def test_value_changed(self):
+        """값이 바뀌면 이전 값과 새 값으로 알림"""
+        self.assertIsInstance(self.watcher, MemoryRegistryWatcher)
+        self.assertTrue(self.watcher.start([EXCEL], self._on_event))
+        with self.backend.create_key(EXCEL) as key:
+            key.set_value('VBAWarnings', 4, REG_DWORD)
+        events = self._wait_events(1)
+        self.assertEqual([(e.event, e.key, e.value, e.old, e.new) for e in events],
+                         [('value_changed', EXCEL, 'VBAWarnings', 2, 4)])
+        self.assertEqual(events[0].source, 'memory')
+
+    def test_generation(self):
+        """값이 실제로 바뀐 경우에만 generation 증가"""
+        self.watcher.start([EXCEL], self._on_event)
+        generation = self.watcher.generation
+        with self.backend.create_key(EXCEL) as key:
+            key.set_value('VBAWarnings', 2, REG_DWORD)
+            key.set_value('VBAWarnings', 3, REG_DWORD)
+        self._wait_events(1)
+        time.sleep(0.05)
+        self.assertEqual(self.watcher.generation, generation + len(self.events))
+
+    def test_key_created_and_deleted(self):
+        """아직 없는 키가 만들어지거나 상위 키가 삭제되면 알림"""
+        self.watcher.start([EXCEL, WORD], self._on_event)
+        with self.backend.create_key(WORD) as key:
+            key.set_value('VBAWarnings', 1, REG_DWORD)
+        self.assertEqual(self._wait_events(1)[0].event, 'key_created')
+        self.backend.delete_key(EXCEL)
+        events = self._wait_events(2)
+        self.assertEqual((events[1].event, events[1].key, events[1].old), ('key_deleted', EXCEL, {'VBAWarnings': 2}))
+
+    def test_no_reads_while_idle(self):
+        """변경이 없거나 감시하지 않는 키만 바뀌면 다시 읽지 않음"""
+        self.watcher.start([EXCEL], self._on_event)
+        reads = self.watcher.reads
+        with self.backend.create_key('HKEY_CURRENT_USER\\Software\\Other') as key:
+            key.set_value('VBAWarnings', 1, REG_DWORD)
+        time.sleep(0.1)
+        self.assertEqual(self.watcher.reads, reads)
+        self.assertEqual(self.events, [])
+
+    def test_set_keys(self):
+        """감시 키를 바꾸면 새 키의 알림만 받음"""
+        self.watcher.start([EXCEL], self._on_event)
+        self.assertTrue(self.watcher.set_keys([WORD]))
+        self.assertFalse(self.watcher.set_keys([WORD]))
+        with self.backend.create_key(EXCEL) as key:
+            key.set_value('VBAWarnings', 3, REG_DWORD)
+        with self.backend.create_key(WORD) as key:
+            key.set_value('AccessVBOM', 0, REG_DWORD)
+        self._wait_events(1)
+        time.sleep(0.05)
+        self.assertEqual([(e.event, e.key) for e in self.events], [('key_created', WORD)])
+
+    def test_stop(self):
+        self.watcher.start([EXCEL], self._on_event)
+        self.watcher.stop()
+        self.assertFalse(self.watcher.running)
+        self.assertEqual(self.backend._listeners, [])
+
+
+class TestWinregNotifyWatcher(unittest.TestCase):
+    def test_min_watch_depth(self):
+        """없는 키는 Office 키까지만 상위 키로 올라가서 감시"""
+        depth = WinregNotifyWatcher._min_watch_depth
+        self.assertEqual(depth(['Software', 'Microsoft', 'Office', '16.0', 'Excel', 'Security']), 3)
+        self.assertEqual(depth(['S-1-5-21-1-2-3-1001', 'software', 'microsoft', 'office', '16.0']), 4)
+        self.assertEqual(depth(['Software', 'Policies', 'Example']), 3)
+
+
+class TestCreateRegistryWatcher(unittest.TestCase):
+    def test_unavailable(self):
+        """알림을 쓸 수 없는 저장소는 None (폴링으로 대체)"""
+        self.assertIsNone(create_registry_watcher(RegistryKeyPool(RegistryBackend())))
+        self.assertFalse(WinregNotifyWatcher.is_available(RegistryKeyPool(MemoryRegistryBackend())))
+
+
+if __name__ == '__main__':
+    unittest.main()
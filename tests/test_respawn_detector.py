@@ -0,0 +1,32 @@
+import unittest
+from src.core.respawn_detector import RespawnDetector
+
+class TestRespawnDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = RespawnDetector(threshold=3, window=10.0, cooldown=20.0, summary_interval=5.0)
+
+    def test_storm_detection(self):
+        """짧은 시간 안에 반복 종료되면 반복 실행으로 판단"""
+        self.assertFalse(self.detector.record_kill('excel.exe', 'launcher.exe', now=0.0))
+        self.assertFalse(self.detector.record_kill('EXCEL.EXE', 'launcher.exe', now=1.0))
+        self.assertTrue(self.detector.record_kill('EXCEL.EXE', 'launcher.exe', now=2.0))
+        self.assertTrue(self.detector.is_storm('excel.exe'))
+        self.assertEqual(self.detector.active_storms(), ['EXCEL.EXE'])
+
+    def test_window(self):
+        """window보다 간격이 길면 반복 실행이 아님"""
+        for now in (0.0, 11.0, 22.0, 33.0):
+            self.assertFalse(self.detector.record_kill('EXCEL.EXE', now=now))
+
+    def test_cooldown(self):
+        """cooldown 동안 종료가 없으면 해제"""
+        for now in (0.0, 1.0, 2.0, 3.0):
+            self.detector.record_kill('EXCEL.EXE', now=now)
+        self.detector.tick(now=10.0)
+        self.assertTrue(self.detector.is_storm('EXCEL.EXE'))
+        self.detector.tick(now=30.0)
+        self.assertFalse(self.detector.is_storm('EXCEL.EXE'))
+        self.assertEqual(self.detector.active_storms(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import time
+from threading import Thread, Event
+from src.core.scheduler import ProbeScheduler, Probe
+
+class TestProbeScheduler(unittest.TestCase):
+    def setUp(self):
+        self.stop_event = Event()
+        self.scheduler = ProbeScheduler(self.stop_event, 'test_scheduler')
+
+    def test_backoff_and_reset(self):
+        """변경이 없으면 간격 증가, 변경 시 최소 간격으로 복귀"""
+        results = [False, False, False, True]
+        probe = Probe('test', lambda: results.pop(0), 0.1, 0.4)
+
+        probe.run(0.0)
+        self.assertAlmostEqual(probe.interval, 0.2)
+        probe.run(0.0)
+        self.assertAlmostEqual(probe.interval, 0.4)
+        probe.run(0.0)
+        self.assertAlmostEqual(probe.interval, 0.4)  # 최대 간격 유지
+        probe.run(0.0)
+        self.assertAlmostEqual(probe.interval, 0.1)
+
+    def test_stats(self):
+        """프로브별 실행 통계 테스트"""
+        self.scheduler.add_probe('fast', lambda: True, 0.01)
+        thread = Thread(target=self.scheduler.run)
+        thread.start()
+        time.sleep(0.1)
+        self.stop_event.set()
+        thread.join(timeout=1.0)
+
+        stats = self.scheduler.get_stats()['fast']
+        self.assertGreater(stats['runs'], 0)
+        self.assertEqual(stats['runs'], stats['changes'])
+        self.assertGreaterEqual(stats['max_time'], stats['min_time'])
+
+    def test_stop_within_tick(self):
+        """긴 간격 대기 중에도 중지 요청에 즉시 반응"""
+        self.scheduler.add_probe('slow', lambda: False, 60.0)
+        thread = Thread(target=self.scheduler.run)
+        thread.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        self.stop_event.set()
+        thread.join(timeout=1.0)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_invalid_interval(self):
+        """잘못된 간격 설정 테스트"""
+        with self.assertRaises(ValueError):
+            self.scheduler.add_probe('bad', lambda: False, 0)
+
+if __name__ == '__main__':
+    unittest.main()
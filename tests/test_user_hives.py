@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.registry_backend import MemoryRegistryBackend
+from src.core.user_hives import UserHiveFanout, list_user_sids
+from src.core.registry_pool import RegistryKeyPool
+from tests.test_registry_backend import office_hive
+
+USERS = ['S-1-5-21-100-200-300-1001', 'S-1-5-21-100-200-300-1002', 'S-1-12-1-400-500-600-700']
+SECURITY = 'HKEY_USERS\\{}\\Software\\Microsoft\\Office\\16.0\\{}\\Security'
+
+
+class TestUserHiveFanout(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        data = {SECURITY.format(sid, app): {'VBAWarnings': 1, 'AccessVBOM': 1}
+                for sid in USERS for app in ('Excel', 'Word')}
+        # 시스템 계정, .DEFAULT, _Classes hive는 대상이 아님
+        data.update({
+            SECURITY.format('S-1-5-18', 'Excel'): {'VBAWarnings': 1},
+            SECURITY.format('.DEFAULT', 'Excel'): {'VBAWarnings': 1},
+            f'HKEY_USERS\\{USERS[0]}_Classes\\CLSID': {}
+        })
+        self.backend = MemoryRegistryBackend(data)
+        self.fanout = UserHiveFanout(self.backend, backup_path=self.temp_dir, max_workers=4)
+
+    def tearDown(self):
+        self.fanout.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _value(self, sid, app, name='VBAWarnings'):
+        with self.backend.open_key(SECURITY.format(sid, app)) as key:
+            return key.query_value(name)[0]
+
+    def test_list_user_sids(self):
+        """로드된 사용자 hive만 나열"""
+        self.assertEqual(list_user_sids(RegistryKeyPool(self.backend)), sorted(USERS))
+
+    def test_apply_and_check_all(self):
+        """사용자마다 적용하고 SID별 결과와 시간 요약 반환"""
+        self.assertEqual(self.fanout.check_all()['succeeded'], 0)
+        summary = self.fanout.apply_all(backup=True)
+        self.assertTrue(summary['success'])
+        self.assertEqual(summary['total'], 3)
+        self.assertEqual(set(summary['users']), set(USERS))
+        self.assertTrue(set(summary['timings']) >= {'discover', 'total', 'max_user', 'mean_user'})
+        for sid in USERS:
+            user = summary['users'][sid]
+            self.assertEqual(len(user['result']['values']), 4)
+            self.assertEqual(self._value(sid, 'Word'), 2)
+            self.assertTrue(os.listdir(os.path.join(self.temp_dir, sid)))
+        # 대상이 아닌 hive는 그대로
+        self.assertEqual(self._value('S-1-5-18', 'Excel'), 1)
+        self.assertTrue(self.fanout.check_all()['success'])
+
+        self.assertTrue(self.fanout.restore_all()['success'])
+        self.assertEqual(self._value(USERS[1], 'Excel', 'AccessVBOM'), 1)
+
+    def test_failure_is_per_user(self):
+        """한 사용자의 오류가 다른 사용자 처리에 영향을 주지 않음"""
+        self.fanout.apply_all(backup=False)
+        self.fanout.manager(USERS[0]).check_registry_status = None
+        summary = self.fanout._run('check', lambda manager: manager.check_registry_status(), None)
+        self.assertFalse(summary['success'])
+        self.assertEqual(summary['failed'], [USERS[0]])
+        self.assertIsNotNone(summary['users'][USERS[0]]['error'])
+        self.assertIsNone(summary['users'][USERS[1]]['error'])
+
+    def test_offline_hive(self):
+        """오프라인 NTUSER.DAT는 HKEY_USERS\\<이름>으로 연결하여 함께 처리"""
+        fanout = UserHiveFanout(self.backend, backup_path=self.temp_dir,
+                                offline_hives={'offline-user': office_hive(vba_warnings=1)})
+        self.assertIn('offline-user', fanout.user_sids())
+        self.assertFalse(fanout.check_all()['users']['offline-user']['success'])
+        self.assertTrue(fanout.backup_all()['users']['offline-user']['success'])
+
+        # 읽기 전용이므로 적용은 기록된 것으로 보고하지 않음
+        summary = fanout.apply_all(backup=False)
+        offline = summary['users']['offline-user']
+        self.assertTrue(offline['offline'])
+        self.assertFalse(offline['success'])
+        self.assertEqual(offline['reason'], 'offline_readonly')
+        self.assertIsNone(offline['result'])
+        self.assertEqual(summary['failed'], ['offline-user'])
+        self.assertEqual(summary['succeeded'], 3)
+        self.assertEqual(summary['total'], 4)
+        self.assertFalse(fanout.check_all()['users']['offline-user']['success'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,15 @@
+import shutil
+import tempfile
+import time
 import unittest
+from src.core.process_snapshot import FakeProcessSource, ProcessSnapshotProvider
+from src.core.registry import RegistryManager
+from src.core.registry_backend import REG_DWORD, MemoryRegistryBackend
+from src.core.registry_watch import MemoryRegistryWatcher
 from src.core.vba_blocker import VBABlocker
 
+SECURITY = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Office\\16.0\\{}\\Security'
+
 class TestVBABlocker(unittest.TestCase):
     def setUp(self):
         self.vba_blocker = VBABlocker()
@@ -40,5 +49,112 @@ class TestVBABlocker(unittest.TestCase):
         
         self.assertNotEqual(initial_status, blocked_status)
 
+class AdminSecurityManager:
+    """관리자 권한으로 실행 중인 것으로 응답하는 보안 관리자"""
+
+    is_admin = True
+
+    def check_required_privileges(self) -> bool:
+        return True
+
+
+class TestVBABlockStatus(unittest.TestCase):
+    """메모리 레지스트리와 가상 프로세스 테이블에서 차단 상태 캐시 확인"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backend = MemoryRegistryBackend({SECURITY.format(app): {'VBAWarnings': 1, 'AccessVBOM': 1}
+                                              for app in ('Excel', 'Word', 'PowerPoint')})
+        self.source = FakeProcessSource()
+        self.source.add(4, 'System', 1.0)
+        self.provider = ProcessSnapshotProvider(self.source, refresh_interval=60.0)
+        self.blocker = VBABlocker(self.provider, status_max_age=0.2,
+                                  registry_manager=RegistryManager(self.backend, backup_path=self.temp_dir),
+                                  security_manager=AdminSecurityManager())
+        self.blocker.change_tracker.clear_changes()
+
+    def tearDown(self):
+        if self.blocker.process_monitor.monitoring:
+            self.blocker.restore_vba()
+        self.blocker.change_tracker.clear_changes()
+        shutil.rmtree(self.temp_dir)
+
+    def _settled_status(self):
+        """비동기 변경 알림이 모두 반영되어 캐시가 재사용될 때까지 대기"""
+        deadline = time.time() + 2.0
+        status = self.blocker.get_vba_status()
+        while time.time() < deadline:
+            time.sleep(0.02)
+            current = self.blocker.get_vba_status()
+            if current is status:
+                return status
+            status = current
+        self.fail("차단 상태가 안정되지 않음")
+
+    def test_status_cache(self):
+        """상태가 바뀌지 않으면 마지막 확인 결과를 재사용"""
+        first = self.blocker.get_vba_status()
+        self.assertIs(self.blocker.get_vba_status(), first)
+        self.assertGreaterEqual(first.age, 0.0)
+
+        # 차단하면 다시 확인
+        self.assertTrue(self.blocker.block_vba_execution())
+        status = self.blocker.get_vba_status()
+        self.assertIsNot(status, first)
+        self.assertTrue(status.blocked)
+
+    def test_expiry_without_notifications(self):
+        """변경 알림과 모니터링이 없으면 status_max_age초 동안만 재사용"""
+        first = self.blocker.get_vba_status()
+        self.assertIs(self.blocker.get_vba_status(), first)
+        self.assertFalse(first.blocked)
+        time.sleep(0.3)
+        second = self.blocker.get_vba_status()
+        self.assertIsNot(second, first)
+        self.assertLess(second.age, first.age)
+
+    def test_generation_invalidation(self):
+        """차단 중에는 기간이 지나도 재사용하고, 레지스트리나 대상 프로세스가 바뀌면 다시 확인"""
+        self.assertTrue(self.blocker.block_vba_execution())
+        self.assertIsInstance(self.blocker.change_tracker.registry_watcher, MemoryRegistryWatcher)
+        status = self._settled_status()
+        self.assertTrue(status.blocked)
+        scans = self.source.scan_count
+
+        # 알림과 모니터링이 동작하는 동안에는 status_max_age가 지나도 캐시 사용
+        time.sleep(0.3)
+        self.assertIs(self.blocker.get_vba_status(), status)
+        self.assertGreater(status.age, 0.2)
+        # 오래된 스냅샷은 한 번만 다시 조회
+        self.assertEqual(self.source.scan_count, scans + 1)
+
+        # 레지스트리 변경 알림 → 다시 확인
+        with self.backend.create_key(SECURITY.format('Excel')) as key:
+            key.set_value('VBAWarnings', 1, REG_DWORD)
+        changed = self._settled_status()
+        self.assertIsNot(changed, status)
+        self.assertFalse(changed.registry_blocked)
+        self.assertFalse(changed.blocked)
+
+        with self.backend.create_key(SECURITY.format('Excel')) as key:
+            key.set_value('VBAWarnings', 2, REG_DWORD)
+        status = self._settled_status()
+        self.assertTrue(status.blocked)
+
+        # 대상이 아닌 프로세스는 캐시를 무효화하지 않음
+        self.source.add(999990, 'notepad.exe', 1.0)
+        self.provider.refresh()
+        self.assertIs(self.blocker.get_vba_status(), status)
+
+        # 대상 프로세스 테이블 변경 → 다시 확인
+        generation = self.blocker.process_monitor.target_generation
+        self.source.add(999991, 'EXCEL.EXE', 1.0)
+        self.provider.refresh()
+        self.assertEqual(self.blocker.process_monitor.target_generation, generation + 1)
+        status = self.blocker.get_vba_status()
+        self.assertEqual(status.running_processes, 1)
+        self.assertFalse(status.blocked)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file